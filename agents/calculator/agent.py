@@ -1,6 +1,6 @@
 import asyncio
 import re
-import uvicorn
+from typing import List
 from common.types import (
     AgentCapabilities,
     AgentCard,
@@ -11,7 +11,9 @@ from common.types import (
     Message,
     TextPart
 )
-from common.server import A2AServer
+from common.executor import HandlerExecutor
+from common.server import A2AServer, run_agent
+from agents.calculator.evaluator import evaluate
 
 
 # Define the agent's capabilities
@@ -25,30 +27,42 @@ calculator_card = AgentCard(
     ),
     version="1.0.0",
     capabilities=AgentCapabilities(
-        streaming=False,
-        pushNotifications=False,
+        streaming=True,
+        pushNotifications=True,
         stateTransitionHistory=False
     ),
     skills=[
         AgentSkill(
             id="add",
             name="Addition",
-            description="Adds two numbers"
+            description="Adds two numbers",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=3600
         ),
         AgentSkill(
             id="subtract",
             name="Subtraction",
-            description="Subtracts two numbers"
+            description="Subtracts two numbers",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=3600
         ),
         AgentSkill(
             id="multiply", 
             name="Multiplication",
-            description="Multiplies two numbers"
+            description="Multiplies two numbers",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=3600
         ),
         AgentSkill(
             id="divide",
             name="Division",
-            description="Divides two numbers"
+            description="Divides two numbers",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=3600
         )
     ]
 )
@@ -60,8 +74,8 @@ def calculate(expression):
     cleaned_expr = re.sub(r'[^0-9+\-*/().\s]', '', expression)
     
     try:
-        # Using eval for simplicity, but in a real application you should use a safer method
-        result = eval(cleaned_expr)
+        # Parsed and budget-checked; repeated expressions reuse the cached parse
+        result = evaluate(cleaned_expr)
         return f"Result: {result}"
     except Exception as e:
         return f"Error calculating: {str(e)}"
@@ -103,8 +117,33 @@ async def handle_task(task: Task) -> Task:
     return task
 
 
+# Define the batch handler for tasks/sendBatch
+async def handle_batch(tasks: List[Task]) -> List[Task]:
+    """Evaluate a whole batch in one executor call instead of one call per task."""
+    return [await handle_task(task) for task in tasks]
+
+# Define the skill classifier used for per-skill metrics
+OPERATOR_SKILLS = {"+": "add", "-": "subtract", "*": "multiply", "/": "divide"}
+
+def skill_of(task: Task) -> str:
+    """Name the skill after the first operator of the expression."""
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text") if task.messages else ""
+    for char in query.lstrip(" +-("):
+        if char in OPERATOR_SKILLS:
+            return OPERATOR_SKILLS[char]
+    return "other"
+
 # Create and run the server
-server = A2AServer(calculator_card, handle_task)
+# Evaluation is CPU-bound, so keep it off the event loop that serves tasks/get
+server = A2AServer(
+    calculator_card,
+    handle_task,
+    executor=HandlerExecutor("thread", max_workers=4, max_queue=64),
+    batch_handler=handle_batch,
+    skill_of=skill_of
+)
+
+app = server.app
 
 if __name__ == "__main__":
-    uvicorn.run(server.app, host="0.0.0.0", port=8001)
+    run_agent(server, "agents.calculator.agent:app", port=8001)
@@ -0,0 +1,99 @@
+import ast
+import operator
+from functools import lru_cache
+from typing import Callable, Union
+
+Number = Union[int, float]
+
+# Budgets that keep a single request from monopolising the event loop
+MAX_EXPRESSION_LENGTH = 1000
+MAX_OPERATIONS = 200
+MAX_EXPONENT = 1000
+MAX_INT_BITS = 4096
+MAX_FLOAT_MAGNITUDE = 1e300
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class EvaluationError(ValueError):
+    """Raised for expressions that are malformed or exceed an evaluation budget."""
+
+
+def _check_magnitude(value: Number) -> Number:
+    if isinstance(value, int):
+        if value.bit_length() > MAX_INT_BITS:
+            raise EvaluationError(f"result exceeds {MAX_INT_BITS} bits")
+    elif abs(value) > MAX_FLOAT_MAGNITUDE:
+        raise EvaluationError("result is too large")
+    return value
+
+
+def _power(base: Number, exponent: Number) -> Number:
+    if abs(exponent) > MAX_EXPONENT:
+        raise EvaluationError(f"exponent {exponent} exceeds the limit of {MAX_EXPONENT}")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        # Check the result size before computing it, not after
+        if max(base.bit_length() - 1, 0) * exponent > MAX_INT_BITS:
+            raise EvaluationError(f"result exceeds {MAX_INT_BITS} bits")
+    return base ** exponent
+
+
+def _compile(node: ast.AST, budget: list) -> Callable[[], Number]:
+    """Turn a validated AST node into a closure that evaluates it."""
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise EvaluationError(f"expression has more than {MAX_OPERATIONS} operations")
+
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, budget)
+
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = _check_magnitude(node.value)
+        return lambda: value
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        unary = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile(node.operand, budget)
+        return lambda: unary(operand())
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left = _compile(node.left, budget)
+        right = _compile(node.right, budget)
+        if isinstance(node.op, ast.Pow):
+            return lambda: _check_magnitude(_power(left(), right()))
+        binary = _BINARY_OPERATORS[type(node.op)]
+        return lambda: _check_magnitude(binary(left(), right()))
+
+    raise EvaluationError(f"unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> Callable[[], Number]:
+    """Parse and validate an arithmetic expression once; cached per expression text."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise EvaluationError(f"expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise EvaluationError(f"invalid syntax: {e.msg}")
+    return _compile(tree, [MAX_OPERATIONS])
+
+
+def evaluate(expression: str) -> Number:
+    """Safely evaluate an arithmetic expression of numbers, + - * / // ** and parentheses."""
+    try:
+        return compile_expression(expression)()
+    except OverflowError:
+        raise EvaluationError("result is too large")
@@ -1,6 +1,4 @@
 import asyncio
-import uvicorn
-import re
 from typing import Dict
 from common.types import (
     AgentCapabilities,
@@ -12,8 +10,12 @@ from common.types import (
     Message,
     TextPart
 )
-from common.server import A2AServer
-from common.client import A2AClient, get_agent_card
+from common.server import A2AServer, run_agent
+from common.client import A2AClient
+from common.discovery import AgentCardCache
+from common.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, deadline
+from agents.coordinator.cache import ResponseCache, normalize_query
+from agents.coordinator.router import DEFAULT_ROUTES, Router
 
 # Define the agent's capabilities
 coordinator_card = AgentCard(
@@ -26,8 +28,8 @@ coordinator_card = AgentCard(
     ),
     version="1.0.0",
     capabilities=AgentCapabilities(
-        streaming=False,
-        pushNotifications=False,
+        streaming=True,
+        pushNotifications=True,
         stateTransitionHistory=False
     ),
     skills=[
@@ -52,6 +54,30 @@ AGENT_URLS = {
     "timer": "http://localhost:8004"
 }
 
+# Routing table compiled once at startup; pass a different table to Router to extend it
+ROUTER = Router(DEFAULT_ROUTES)
+
+# Agent cards for 'help', revalidated in the background instead of per request
+CARD_CACHE = AgentCardCache(ttl=60.0)
+
+# Answers of cacheable skills, reused until the TTL their agent sent with them
+RESPONSE_CACHE = ResponseCache(max_bytes=16 * 1024 * 1024)
+
+# Separator for compound queries and the deadline shared by their sub-requests
+SUBQUERY_SEPARATOR = ";"
+FANOUT_TIMEOUT = 10.0
+
+# Time budget for one forwarded request, sent to the agent as its deadline
+FORWARD_TIMEOUT = 5.0
+
+# One client per agent; all of them share the process-wide connection pool.
+# Only the last message is read, so responses skip full validation. Each agent
+# gets a circuit breaker so a failing agent is skipped instead of waited on.
+AGENT_CLIENTS = {
+    name: A2AClient(url=url, validate=False, breaker=CircuitBreaker(url, failure_threshold=5, reset_timeout=10.0))
+    for name, url in AGENT_URLS.items()
+}
+
 # Define the task handler
 async def handle_task(task: Task) -> Task:
     if not task.messages:
@@ -75,26 +101,13 @@ async def handle_task(task: Task) -> Task:
     # Process the query
     query = query.strip().lower()
     
-    if query == "help":
-        # Generate help message with available agents and commands
-        result = await get_help()
+    # Compound queries ("weather tokyo; calc 2+2") fan out to several agents at once
+    sub_queries = split_query(query)
+    if len(sub_queries) > 1:
+        result = await fan_out(sub_queries)
     else:
-        # Identify which agent should handle this request
-        target_agent, cleaned_query = identify_agent(query)
-        
-        if target_agent:
-            # Forward the request to the target agent
-            result = await forward_request(target_agent, cleaned_query)
-        else:
-            result = (
-                "I'm not sure which agent can help with that. "
-                "Please try one of these formats:\n"
-                "- calculate: [expression]\n"
-                "- translate en-es: [text]\n"
-                "- weather [city]\n"
-                "- timer [duration]\n"
-                "Or type 'help' for more information."
-            )
+        # A lone query still loses stray separators; nothing left gets the unknown-query reply
+        result = await route_query(sub_queries[0] if sub_queries else "")
     
     # Create a response message
     response = Message(
@@ -108,50 +121,121 @@ async def handle_task(task: Task) -> Task:
     
     return task
 
-def identify_agent(query):
-    """Identify which agent should handle the query."""
-    query = query.lower()
-    
-    # Calculator patterns
-    calc_patterns = [r'^\s*calculate\s*:', r'^\s*calc\s*:', r'^\s*[\d\(\)\+\-\*/\s\.]+$']
-    for pattern in calc_patterns:
-        if re.match(pattern, query):
-            cleaned = query.split(':', 1)[-1].strip() if ':' in query else query
-            return "calculator", cleaned
-    
-    # Translator patterns
-    if re.match(r'^\s*translate\s+[a-z]{2}-[a-z]{2}\s*:', query):
-        return "translator", query
-    
-    # Weather patterns
-    if query.startswith("weather ") or query == "list-cities":
-        return "weather", query
-    
-    # Timer patterns
-    timer_patterns = [
-        r'^\s*what\s+time\s+is\s+it\s*$',
-        r'^\s*time\s*$',
-        r'^\s*now\s*$',
-        r'^\s*(set\s+)?timer\s+.*$',
-        r'^\s*countdown\s+\d+\s*$'
-    ]
-    for pattern in timer_patterns:
-        if re.match(pattern, query):
-            return "timer", query
+def split_query(query):
+    """Split a compound query on ';' into its non-empty sub-queries.
+    
+    A ';' only starts a new sub-query when the text after it (up to the next
+    ';') is a query of its own, i.e. 'help' or anything ROUTER recognizes.
+    Any other ';' is part of the current sub-query's text, so
+    'translate en-es: yes; no' is forwarded whole.
+    """
+    sub_queries = []
+    for part in query.split(SUBQUERY_SEPARATOR):
+        if sub_queries and not is_query(part):
+            sub_queries[-1] += SUBQUERY_SEPARATOR + part
+        else:
+            sub_queries.append(part)
+    # Doubled or trailing separators are not part of the text
+    sub_queries = [sub_query.strip().strip(SUBQUERY_SEPARATOR).strip() for sub_query in sub_queries]
+    return [sub_query for sub_query in sub_queries if sub_query]
+
+def is_query(text):
+    """Whether ``text`` can be answered on its own."""
+    text = text.strip()
+    return text == "help" or identify_agent(text)[0] is not None
+
+async def route_query(query):
+    """Answer a single query, forwarding it to the agent that handles it."""
+    if query == "help":
+        # Generate help message with available agents and commands
+        return await get_help()
+    
+    # Identify which agent should handle this request
+    target_agent, cleaned_query = identify_agent(query)
+    
+    if target_agent:
+        # Forward the request to the target agent
+        return await forward_request(target_agent, cleaned_query)
     
-    # No match found
-    return None, query
+    return (
+        "I'm not sure which agent can help with that. "
+        "Please try one of these formats:\n"
+        "- calculate: [expression]\n"
+        "- translate en-es: [text]\n"
+        "- weather [city]\n"
+        "- timer [duration]\n"
+        "Or type 'help' for more information."
+    )
+
+async def fan_out(sub_queries, timeout=FANOUT_TIMEOUT):
+    """Route sub-queries concurrently and merge the answers in input order.
+    
+    All hops share one deadline, so the total latency is that of the slowest
+    hop rather than the sum. A hop that misses the deadline reports a timeout
+    without affecting the others.
+    """
+    async def run(sub_query):
+        try:
+            with deadline(timeout):
+                return await asyncio.wait_for(route_query(sub_query), timeout)
+        except asyncio.TimeoutError:
+            return f"Error: no response within {timeout:g} seconds."
+    
+    results = await asyncio.gather(*(run(sub_query) for sub_query in sub_queries))
+    return "\n\n".join(
+        f"**{sub_query}**\n{result}" for sub_query, result in zip(sub_queries, results)
+    )
+
+def identify_agent(query):
+    """Identify which agent should handle the (lower-cased) query."""
+    return ROUTER.route(query)
+
+def is_idempotent(agent_name):
+    """Whether every skill on the agent's (cached) card is safe to send twice."""
+    card = CARD_CACHE.peek(AGENT_URLS[agent_name])
+    return card is not None and bool(card.skills) and all(skill.idempotent for skill in card.skills)
+
+def has_cacheable_skills(agent_name):
+    """Whether the agent's (cached) card marks any skill as cacheable."""
+    card = CARD_CACHE.peek(AGENT_URLS[agent_name])
+    return card is not None and any(skill.cacheable for skill in card.skills)
 
 async def forward_request(agent_name, query):
-    """Forward the request to the specified agent."""
+    """Forward the request to the specified agent, or answer it from the cache.
+    
+    Agents with cacheable skills go through RESPONSE_CACHE, keyed on the
+    agent and the normalized query: a repeat within the TTL costs no
+    downstream call, and concurrent identical queries share one call.
+    """
+    if not has_cacheable_skills(agent_name):
+        text, _ = await call_agent(agent_name, query)
+        return text
+    return await RESPONSE_CACHE.get_or_load(
+        (agent_name, normalize_query(query)), lambda: call_agent(agent_name, query)
+    )
+
+async def call_agent(agent_name, query):
+    """Send the query to the agent; return its answer and how long it may be cached.
+    
+    The call gets at most FORWARD_TIMEOUT seconds (less if our own caller's
+    deadline is sooner). Agents whose skills are all idempotent get a hedged
+    second request if the first one is slow.
+    """
     try:
-        client = A2AClient(url=AGENT_URLS[agent_name])
-        response = await client.send_task({
+        client = AGENT_CLIENTS[agent_name]
+        payload = {
             "message": {
                 "role": "user",
                 "parts": [{"type": "text", "text": query}]
-            }
-        })
+            },
+            # Only the agent's reply is needed, not our own message echoed back
+            "historyFrom": 1
+        }
+        with deadline(FORWARD_TIMEOUT):
+            if is_idempotent(agent_name):
+                response = await client.send_task_hedged(payload)
+            else:
+                response = await client.send_task(payload)
         
         # Extract the response from the agent
         if response.result and "task" in response.result:
@@ -159,30 +243,37 @@ async def forward_request(agent_name, query):
             if task.get("messages", []) and len(task["messages"]) > 0:
                 agent_message = task["messages"][-1]
                 if agent_message.get("role") == "agent" and agent_message.get("parts", []):
-                    return agent_message["parts"][0]["text"]
+                    return agent_message["parts"][0]["text"], response.result.get("cacheTtl")
         
-        return f"Error: Received malformed response from {agent_name} agent."
+        if response.error:
+            return f"Error communicating with {agent_name} agent: {response.error.get('message')}", None
+        return f"Error: Received malformed response from {agent_name} agent.", None
+    except CircuitOpenError:
+        return f"Error communicating with {agent_name} agent: it is failing and temporarily skipped.", None
+    except DeadlineExceeded:
+        return f"Error communicating with {agent_name} agent: no response within the deadline.", None
     except Exception as e:
-        return f"Error communicating with {agent_name} agent: {str(e)}"
+        return f"Error communicating with {agent_name} agent: {str(e)}", None
 
 async def get_help():
     """Generate a help message listing all available agents and their capabilities."""
     help_text = "# Available Agents\n\n"
     
-    for agent_name, url in AGENT_URLS.items():
-        try:
-            card = await get_agent_card(url)
-            help_text += f"## {card.name}\n"
-            if card.description:
-                help_text += f"{card.description}\n\n"
-                
-            help_text += "### Skills:\n"
-            for skill in card.skills:
-                help_text += f"- **{skill.name}**: {skill.description or 'No description'}\n"
+    cards = await CARD_CACHE.get_many(AGENT_URLS.values())
+    for agent_name, card in zip(AGENT_URLS, cards):
+        if isinstance(card, Exception):
+            help_text += f"## {agent_name.title()} Agent\nError fetching agent information: {str(card)}\n\n"
+            continue
+        
+        help_text += f"## {card.name}\n"
+        if card.description:
+            help_text += f"{card.description}\n\n"
             
-            help_text += "\n"
-        except Exception as e:
-            help_text += f"## {agent_name.title()} Agent\nError fetching agent information: {str(e)}\n\n"
+        help_text += "### Skills:\n"
+        for skill in card.skills:
+            help_text += f"- **{skill.name}**: {skill.description or 'No description'}\n"
+        
+        help_text += "\n"
     
     help_text += (
         "# Usage Examples\n\n"
@@ -190,12 +281,28 @@ async def get_help():
         "- Translator: `translate en-es: hello`\n"
         "- Weather: `weather london` or `list-cities`\n"
         "- Timer: `time`, `timer 5m`, or `countdown 10`\n"
+        "- Several at once: `weather tokyo; calculate: 2+2`\n"
     )
     
     return help_text
 
+# Define the skill classifier used for per-skill metrics
+def skill_of(task: Task) -> str:
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text") if task.messages else ""
+    return "help" if query.strip().lower() == "help" else "route"
+
 # Create and run the server
-server = A2AServer(coordinator_card, handle_task)
+server = A2AServer(coordinator_card, handle_task, skill_of=skill_of)
+
+@server.app.on_event("startup")
+async def start_card_refresh():
+    CARD_CACHE.start(AGENT_URLS.values())
+
+@server.app.on_event("shutdown")
+async def stop_card_refresh():
+    await CARD_CACHE.stop()
+
+app = server.app
 
 if __name__ == "__main__":
-    uvicorn.run(server.app, host="0.0.0.0", port=8000)
+    run_agent(server, "agents.coordinator.agent:app", port=8000)
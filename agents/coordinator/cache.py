@@ -0,0 +1,137 @@
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from common.metrics import REGISTRY
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "a2a_response_cache_requests_total",
+    "Coordinator response cache lookups by result (hit, miss, collapsed).",
+    ("result",),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "a2a_response_cache_evictions_total",
+    "Entries dropped from the coordinator response cache by reason.",
+    ("reason",),
+)
+CACHE_ENTRIES = REGISTRY.gauge("a2a_response_cache_entries", "Answers held by coordinator response caches.")
+CACHE_BYTES = REGISTRY.gauge("a2a_response_cache_bytes", "Approximate size of coordinator response caches.")
+# Every live cache; the gauges report their total rather than whichever was created last
+_CACHES: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+CACHE_ENTRIES.labels().set_function(lambda: sum(len(cache._entries) for cache in list(_CACHES)))
+CACHE_BYTES.labels().set_function(lambda: sum(cache._bytes for cache in list(_CACHES)))
+
+# A loader returns the answer and how long it may be cached (None: not cacheable)
+Loader = Callable[[], Awaitable[Tuple[str, Optional[float]]]]
+
+
+class _Entry(NamedTuple):
+    value: str
+    expires: float
+    size: int
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: lower-cased with runs of whitespace collapsed."""
+    return " ".join(query.lower().split())
+
+
+def entry_size(key: Hashable, value: str) -> int:
+    """Cheap approximation of an entry's memory footprint in bytes."""
+    return 128 + len(repr(key)) + len(value)
+
+
+class ResponseCache:
+    """LRU cache of agent answers with per-entry TTLs and a byte budget.
+
+    ``get_or_load`` serves fresh entries from memory. Concurrent misses for the
+    same key share one call to the loader, and the loader decides through its
+    returned TTL whether the answer may be kept. When ``max_bytes`` or
+    ``max_entries`` is exceeded the least recently used entries are dropped.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_entries: int = 50_000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._bytes = 0
+        self._hits = CACHE_REQUESTS.labels("hit")
+        self._misses = CACHE_REQUESTS.labels("miss")
+        self._collapsed = CACHE_REQUESTS.labels("collapsed")
+        _CACHES.add(self)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            CACHE_EVICTIONS.labels("expired").inc()
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, key: Hashable, value: str, ttl: float) -> None:
+        size = entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            CACHE_EVICTIONS.labels("size").inc()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+            self._bytes = 0
+        elif key in self._entries:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    async def get_or_load(self, key: Hashable, load: Loader) -> str:
+        """Return the cached answer for ``key``, or load it (once per key at a time)."""
+        value = self.get(key)
+        if value is not None:
+            self._hits.inc()
+            return value
+
+        leader = self._inflight.get(key)
+        if leader is not None:
+            self._collapsed.inc()
+            value, ttl = await asyncio.shield(leader)
+            if ttl is not None:
+                return value
+            # The leader failed or its answer may not be shared; ask for our own
+            value, _ = await load()
+            return value
+
+        self._misses.inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        value, ttl = None, None
+        try:
+            value, ttl = await load()
+        finally:
+            del self._inflight[key]
+            future.set_result((value, ttl))
+        if ttl:
+            self.put(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self._hits.value,
+            "misses": self._misses.value,
+            "collapsed": self._collapsed.value,
+        }
@@ -0,0 +1,68 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class Route(NamedTuple):
+    """A routing rule: queries matching ``pattern`` go to ``agent``.
+
+    The pattern is matched at the start of the (lower-cased) query. If it
+    contains a ``(?P<payload>...)`` group, the stripped payload is what gets
+    forwarded; otherwise the whole query is.
+    """
+    agent: str
+    pattern: str
+
+
+DEFAULT_ROUTES: List[Route] = [
+    # Calculator
+    Route("calculator", r"\s*calc(?:ulate)?\s*:(?P<payload>(?s:.*))$"),
+    Route("calculator", r"\s*calc(?:ulate)?\s+(?P<payload>[\d\(\)\+\-\*/\s\.]+)$"),
+    Route("calculator", r"\s*[\d\(\)\+\-\*/\s\.]+$"),
+    # Translator
+    Route("translator", r"\s*translate\s+[a-z]{2}-[a-z]{2}\s*:"),
+    # Weather
+    Route("weather", r"weather "),
+    Route("weather", r"list-cities$"),
+    # Timer
+    Route("timer", r"\s*what\s+time\s+is\s+it\s*$"),
+    Route("timer", r"\s*time\s*$"),
+    Route("timer", r"\s*now\s*$"),
+    Route("timer", r"\s*(?:set\s+)?timer\s+.*$"),
+    Route("timer", r"\s*countdown\s+\d+\s*$"),
+]
+
+
+class Router:
+    """Dispatches queries to agents with one precompiled, anchored regex.
+
+    Every route becomes a named alternative of a single pattern, so a query is
+    classified in one ``match`` call. Routes are tried in table order, and the
+    first one that matches wins.
+    """
+
+    def __init__(self, routes: Sequence[Route] = DEFAULT_ROUTES):
+        self.routes = list(routes)
+        self._agents: Dict[str, str] = {}
+        self._payloads: Dict[str, str] = {}
+        alternatives = []
+        for index, route in enumerate(self.routes):
+            name = f"r{index}"
+            pattern = route.pattern
+            if "(?P<payload>" in pattern:
+                self._payloads[name] = f"{name}_payload"
+                pattern = pattern.replace("(?P<payload>", f"(?P<{name}_payload>")
+            self._agents[name] = route.agent
+            alternatives.append(f"(?P<{name}>{pattern})")
+        self._matcher = re.compile("|".join(alternatives))
+
+    def route(self, query: str) -> Tuple[Optional[str], str]:
+        """Return ``(agent, query to forward)``, or ``(None, query)`` if nothing matches."""
+        match = self._matcher.match(query)
+        if match is None:
+            return None, query
+        # The route group encloses any payload group, so it is the last to close
+        name = match.lastgroup
+        payload = self._payloads.get(name)
+        if payload is not None:
+            return self._agents[name], match.group(payload).strip()
+        return self._agents[name], query
@@ -1,7 +1,8 @@
 import asyncio
-import uvicorn
+import math
 import re
 from datetime import datetime, timedelta
+from typing import Dict, List, Set
 from common.types import (
     AgentCapabilities,
     AgentCard,
@@ -12,7 +13,8 @@ from common.types import (
     Message,
     TextPart
 )
-from common.server import A2AServer
+from common.scheduler import Timer, get_scheduler
+from common.server import A2AServer, run_agent
 
 # Define the agent's capabilities
 timer_card = AgentCard(
@@ -25,25 +27,26 @@ timer_card = AgentCard(
     ),
     version="1.0.0",
     capabilities=AgentCapabilities(
-        streaming=False,
-        pushNotifications=False,
+        streaming=True,
+        pushNotifications=True,
         stateTransitionHistory=False
     ),
     skills=[
         AgentSkill(
             id="time-now",
             name="Current Time",
-            description="Returns the current time"
+            description="Returns the current time",
+            idempotent=True
         ),
         AgentSkill(
             id="set-timer",
             name="Set Timer",
-            description="Sets a timer for a specified duration (simulated)"
+            description="Sets a timer for a specified duration; the task completes when it goes off"
         ),
         AgentSkill(
             id="countdown",
             name="Countdown",
-            description="Shows a countdown for a specified number of seconds (simulated)"
+            description="Counts down a specified number of seconds, one status update per second"
         )
     ]
 )
@@ -53,13 +56,18 @@ def get_current_time():
     now = datetime.now()
     return f"Current time: {now.strftime('%Y-%m-%d %H:%M:%S')}"
 
-def set_timer(duration_str):
+# Pending timers by task id, so tasks/cancel can stop them
+TIMERS: Dict[str, Timer] = {}
+# Completions in flight, kept referenced until they finish
+_completions: Set[asyncio.Task] = set()
+
+def parse_duration(duration_str):
     # Parse the duration string
     pattern = r'(\d+)\s*(m(?:in(?:ute)?s?)?|s(?:ec(?:ond)?s?)?|h(?:(?:ou)?rs?)?)'
     
     matches = re.findall(pattern, duration_str, re.IGNORECASE)
     if not matches:
-        return "Invalid duration format. Please use a format like '5m', '30s', or '1h'."
+        return None
     
     total_seconds = 0
     for value, unit in matches:
@@ -70,6 +78,12 @@ def set_timer(duration_str):
             total_seconds += value * 60
         elif unit.startswith('s'):
             total_seconds += value
+    return total_seconds
+
+def set_timer(task, duration_str):
+    total_seconds = parse_duration(duration_str)
+    if total_seconds is None:
+        return "Invalid duration format. Please use a format like '5m', '30s', or '1h'."
     
     if total_seconds <= 0:
         return "Duration must be greater than zero."
@@ -77,21 +91,135 @@ def set_timer(duration_str):
     now = datetime.now()
     end_time = now + timedelta(seconds=total_seconds)
     
-    # In a real implementation, you'd actually start a timer here
-    # For this demo, we'll just return when the timer would end
-    return f"Timer set for {format_duration(total_seconds)}. It would end at {end_time.strftime('%H:%M:%S')}."
+    # Start the timer; the task stays working until it goes off
+    previous = TIMERS.pop(task.id, None)
+    if previous is not None:
+        previous.cancel()
+    TIMERS[task.id] = get_scheduler().call_later(total_seconds, timer_fired, task.id, total_seconds)
+    return f"Timer set for {format_duration(total_seconds)}. It will end at {end_time.strftime('%H:%M:%S')}."
+
+def timer_fired(task_id, total_seconds):
+    TIMERS.pop(task_id, None)
+    completion = asyncio.get_running_loop().create_task(complete_timer(task_id, total_seconds))
+    _completions.add(completion)
+    completion.add_done_callback(_completions.discard)
+
+async def complete_timer(task_id, total_seconds):
+    task = await server.task_store.get(task_id)
+    # The task may have been canceled (e.g. on another worker) or evicted meanwhile
+    if task is None or task.state != TaskState.WORKING:
+        return
+    task.messages.append(Message(
+        role="agent",
+        parts=[TextPart(text=f"Time's up! Your {format_duration(total_seconds)} timer has finished.")]
+    ))
+    task.state = TaskState.COMPLETED
+    await server.update_task(task)
+
+async def cancel_timer(task: Task) -> None:
+    timer = TIMERS.pop(task.id, None)
+    if timer is not None:
+        timer.cancel()
+    COUNTDOWNS.cancel(task.id)
+
+class Countdowns:
+    """Running countdowns, advanced together on whole seconds of the loop clock.
+
+    Every countdown ticks on the same second boundaries, and all countdowns
+    due on a boundary share one scheduler timer and one update pass, so ten
+    thousand of them cost one wakeup per second rather than ten thousand.
+    Each tick appends the next number to the task and stores it with
+    update_task(), which streams it to tasks/sendSubscribe callers and
+    bumps the version seen by tasks/get. A pass runs its updates
+    concurrently, so the SQLite store writes them in one commit.
+    """
+
+    def __init__(self):
+        # Task ids due on each boundary (whole seconds of loop time), and its scheduler timer
+        self._due: Dict[int, Set[str]] = {}
+        self._timers: Dict[int, Timer] = {}
+        # Seconds left and next boundary for each running countdown, by task id
+        self._running: Dict[str, List[int]] = {}
+        # Update passes in flight, kept referenced until they finish
+        self._passes: Set[asyncio.Task] = set()
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._running
 
-def countdown(seconds_str):
+    def __len__(self) -> int:
+        return len(self._running)
+
+    def start(self, task_id: str, seconds: int) -> None:
+        self.cancel(task_id)
+        # The first tick is at least a second away, so no count is shorter than asked
+        boundary = math.ceil(asyncio.get_running_loop().time()) + 1
+        self._running[task_id] = [seconds, boundary]
+        self._add(task_id, boundary)
+
+    def cancel(self, task_id: str) -> None:
+        entry = self._running.pop(task_id, None)
+        if entry is None:
+            return
+        boundary = entry[1]
+        due = self._due.get(boundary)
+        if due is not None:
+            due.discard(task_id)
+            if not due:
+                del self._due[boundary]
+                self._timers.pop(boundary).cancel()
+
+    def _add(self, task_id: str, boundary: int) -> None:
+        due = self._due.get(boundary)
+        if due is None:
+            due = self._due[boundary] = set()
+            self._timers[boundary] = get_scheduler().call_at(boundary, self._tick, boundary)
+        due.add(task_id)
+
+    def _tick(self, boundary: int) -> None:
+        self._timers.pop(boundary, None)
+        due = self._due.pop(boundary, ())
+        ticks = []
+        for task_id in due:
+            entry = self._running[task_id]
+            entry[0] -= 1
+            if entry[0] > 0:
+                entry[1] = boundary + 1
+                self._add(task_id, boundary + 1)
+            else:
+                del self._running[task_id]
+            ticks.append((task_id, entry[0]))
+        update = asyncio.get_running_loop().create_task(self._update(ticks))
+        self._passes.add(update)
+        update.add_done_callback(self._passes.discard)
+
+    async def _update(self, ticks) -> None:
+        # Saves issued together share one group commit in the SQLite store
+        await asyncio.gather(*(self._update_one(task_id, left) for task_id, left in ticks))
+
+    async def _update_one(self, task_id: str, left: int) -> None:
+        task = await server.task_store.get(task_id)
+        # The task may have been canceled (e.g. on another worker) or evicted meanwhile
+        if task is None or task.state != TaskState.WORKING:
+            self.cancel(task_id)
+            return
+        task.messages.append(Message(role="agent", parts=[TextPart(text=f"{left}" if left else "0!")]))
+        if not left:
+            task.state = TaskState.COMPLETED
+        await server.update_task(task)
+
+COUNTDOWNS = Countdowns()
+
+def countdown(task, seconds_str):
     try:
         seconds = int(seconds_str)
-        if seconds <= 0 or seconds > 60:
-            return "Please provide a positive number of seconds (max 60)."
-        
-        # In a real implementation, you'd actually perform a countdown
-        # For this demo, we'll just simulate it
-        return f"Countdown from {seconds}: {', '.join(str(i) for i in range(seconds, 0, -1))}, 0!"
     except ValueError:
         return "Invalid number of seconds. Please provide a number."
+    if seconds <= 0:
+        return "Please provide a positive number of seconds."
+    
+    # Count down in the background; the task stays working until it reaches zero
+    COUNTDOWNS.start(task.id, seconds)
+    return f"Counting down from {seconds}: {seconds}"
 
 def format_duration(seconds):
     hours, remainder = divmod(seconds, 3600)
@@ -137,10 +265,10 @@ async def handle_task(task: Task) -> Task:
             duration = query.replace("set timer ", "", 1).strip()
         else:
             duration = query.replace("timer ", "", 1).strip()
-        result = set_timer(duration)
+        result = set_timer(task, duration)
     elif query.startswith("countdown "):
         seconds = query.replace("countdown ", "", 1).strip()
-        result = countdown(seconds)
+        result = countdown(task, seconds)
     else:
         result = "Invalid command. Available commands: 'time', 'timer [duration]', 'countdown [seconds]'."
     
@@ -150,14 +278,26 @@ async def handle_task(task: Task) -> Task:
         parts=[TextPart(text=result)]
     )
     
-    # Add the response to the task
+    # Add the response to the task; a running timer or countdown keeps it working
     task.messages.append(response)
-    task.state = TaskState.COMPLETED
+    task.state = TaskState.WORKING if task.id in TIMERS or task.id in COUNTDOWNS else TaskState.COMPLETED
     
     return task
 
+# Define the skill classifier used for per-skill metrics
+def skill_of(task: Task) -> str:
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text") if task.messages else ""
+    query = query.strip().lower()
+    if query.startswith("countdown "):
+        return "countdown"
+    if query.startswith("timer ") or query.startswith("set timer "):
+        return "set-timer"
+    return "time-now"
+
 # Create and run the server
-server = A2AServer(timer_card, handle_task)
+server = A2AServer(timer_card, handle_task, skill_of=skill_of, cancel_handler=cancel_timer)
+
+app = server.app
 
 if __name__ == "__main__":
-    uvicorn.run(server.app, host="0.0.0.0", port=8004)
+    run_agent(server, "agents.timer.agent:app", port=8004)
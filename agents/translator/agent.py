@@ -1,5 +1,6 @@
 import asyncio
-import uvicorn
+import os
+from typing import Dict, List, Optional, Tuple
 from common.types import (
     AgentCapabilities,
     AgentCard,
@@ -10,34 +11,24 @@ from common.types import (
     Message,
     TextPart
 )
-from common.server import A2AServer
+from agents.translator.phrase_table import PhraseTable
+from common.server import A2AServer, run_agent
 
-# Simple translation dictionary for demo purposes
-translations = {
-    "en-es": {
-        "hello": "hola",
-        "goodbye": "adiós",
-        "thank you": "gracias",
-        "please": "por favor",
-        "yes": "sí",
-        "no": "no",
-        "how are you": "cómo estás",
-        "good morning": "buenos días",
-        "good afternoon": "buenas tardes",
-        "good night": "buenas noches"
-    },
-    "en-fr": {
-        "hello": "bonjour",
-        "goodbye": "au revoir",
-        "thank you": "merci",
-        "please": "s'il vous plaît",
-        "yes": "oui",
-        "no": "non",
-        "how are you": "comment allez-vous",
-        "good morning": "bonjour",
-        "good afternoon": "bon après-midi",
-        "good night": "bonne nuit"
-    }
+# Load the phrase tables: the bundled one, then any listed in A2A_PHRASE_TABLES (separated by os.pathsep)
+PHRASE_TABLE_FILES = [os.path.join(os.path.dirname(__file__), "phrases.tsv")] + [
+    path for path in os.environ.get("A2A_PHRASE_TABLES", "").split(os.pathsep) if path
+]
+phrases = PhraseTable()
+for path in PHRASE_TABLE_FILES:
+    phrases.load(path)
+
+LANGUAGE_NAMES = {
+    "de": "German",
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "it": "Italian",
+    "pt": "Portuguese",
 }
 
 # Define the agent's capabilities
@@ -51,41 +42,37 @@ translator_card = AgentCard(
     ),
     version="1.0.0",
     capabilities=AgentCapabilities(
-        streaming=False,
-        pushNotifications=False,
+        streaming=True,
+        pushNotifications=True,
         stateTransitionHistory=False
     ),
+    # One skill per language pair the phrase tables cover
     skills=[
         AgentSkill(
-            id="translate-en-es",
-            name="English to Spanish",
-            description="Translates English to Spanish"
-        ),
-        AgentSkill(
-            id="translate-en-fr",
-            name="English to French",
-            description="Translates English to French"
+            id=f"translate-{source}-{target}",
+            name=f"{LANGUAGE_NAMES.get(source, source)} to {LANGUAGE_NAMES.get(target, target)}",
+            description=f"Translates {LANGUAGE_NAMES.get(source, source)} to {LANGUAGE_NAMES.get(target, target)}",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=3600
         )
+        for source, target in phrases.pairs()
     ]
 )
 
 # Define the translation function
 def translate(text, source_lang, target_lang):
+    source_lang, target_lang = source_lang.lower(), target_lang.lower()
     lang_pair = f"{source_lang}-{target_lang}"
     
-    if lang_pair not in translations:
+    if not phrases.supports(source_lang, target_lang):
         return f"Translation for {lang_pair} is not supported"
     
-    # Convert to lowercase for lookup
-    text_lower = text.lower()
-    
-    # Check if the phrase is in our dictionary
-    if text_lower in translations[lang_pair]:
-        return translations[lang_pair][text_lower]
-    
-    # For words that aren't in our dictionary, we'll just return the original
-    # In a real implementation, you would use a proper translation service
-    return f"No translation available for '{text}'"
+    # Translate phrase by phrase, keeping words the tables do not know
+    result, matched = phrases.translate(text, source_lang, target_lang)
+    if not matched:
+        return f"No translation available for '{text}'"
+    return result
 
 # Define the task handler
 async def handle_task(task: Task) -> Task:
@@ -109,25 +96,32 @@ async def handle_task(task: Task) -> Task:
     
     # Parse the command to get language pair and text
     try:
-        # Expected format: "translate [source]-[target]: [text]"
-        # e.g., "translate en-es: hello"
-        command_parts = query.split(":", 1)
-        
-        if len(command_parts) < 2:
-            raise ValueError("Invalid format. Expected 'translate [source]-[target]: [text]'")
-        
-        command = command_parts[0].strip()
-        text_to_translate = command_parts[1].strip()
-        
-        # Extract language pair
-        lang_pair = command.replace("translate", "").strip()
-        source_lang, target_lang = lang_pair.split("-")
+        source_lang, target_lang, text_to_translate = parse_command(query)
         
         # Translate the text
         result = translate(text_to_translate, source_lang, target_lang)
     except Exception as e:
         result = f"Error: {str(e)}\nExpected format: 'translate [source]-[target]: [text]'"
     
+    return complete(task, result)
+
+def parse_command(query):
+    """Split 'translate [source]-[target]: [text]' (e.g. 'translate en-es: hello') into its parts."""
+    command_parts = query.split(":", 1)
+    
+    if len(command_parts) < 2:
+        raise ValueError("Invalid format. Expected 'translate [source]-[target]: [text]'")
+    
+    command = command_parts[0].strip()
+    text_to_translate = command_parts[1].strip()
+    
+    # Extract language pair
+    lang_pair = command.replace("translate", "").strip()
+    source_lang, target_lang = lang_pair.split("-")
+    return source_lang.lower(), target_lang.lower(), text_to_translate
+
+def complete(task, result):
+    """Answer the task with ``result``."""
     # Create a response message
     response = Message(
         role="agent",
@@ -140,8 +134,55 @@ async def handle_task(task: Task) -> Task:
     
     return task
 
+# Define the batch handler for tasks/sendBatch
+async def handle_batch(tasks: List[Task]) -> List[Task]:
+    """Translate a batch with one phrase-table pass per language pair.
+    
+    Tasks are grouped by language pair and each distinct text is translated
+    once. Tasks that are malformed or ask for an unsupported pair get the
+    same answers handle_task() gives them.
+    """
+    # Tasks by text, by language pair
+    groups: Dict[Tuple[str, str], Dict[str, List[Task]]] = {}
+    for task in tasks:
+        command = batch_command(task)
+        if command is None:
+            await handle_task(task)
+            continue
+        source_lang, target_lang, text = command
+        groups.setdefault((source_lang, target_lang), {}).setdefault(text, []).append(task)
+    
+    for (source_lang, target_lang), by_text in groups.items():
+        texts = list(by_text)
+        for text, (result, matched) in zip(texts, phrases.translate_many(texts, source_lang, target_lang)):
+            if not matched:
+                result = f"No translation available for '{text}'"
+            for task in by_text[text]:
+                complete(task, result)
+    return tasks
+
+def batch_command(task: Task) -> Optional[Tuple[str, str, str]]:
+    """The (source, target, text) of a well-formed task for a supported pair, else None."""
+    if not task.messages or task.messages[-1].role != "user":
+        return None
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text")
+    try:
+        source_lang, target_lang, text = parse_command(query)
+    except ValueError:
+        return None
+    return (source_lang, target_lang, text) if phrases.supports(source_lang, target_lang) else None
+
+# Define the skill classifier used for per-skill metrics
+def skill_of(task: Task) -> str:
+    """Name the skill after the language pair, e.g. 'translate-en-es'."""
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text") if task.messages else ""
+    lang_pair = query.split(":", 1)[0].replace("translate", "").strip().lower()
+    return f"translate-{lang_pair}"
+
 # Create and run the server
-server = A2AServer(translator_card, handle_task)
+server = A2AServer(translator_card, handle_task, batch_handler=handle_batch, skill_of=skill_of)
+
+app = server.app
 
 if __name__ == "__main__":
-    uvicorn.run(server.app, host="0.0.0.0", port=8002)
+    run_agent(server, "agents.translator.agent:app", port=8002)
@@ -0,0 +1,302 @@
+import re
+from array import array
+from bisect import bisect_left
+from itertools import compress, count
+from operator import not_
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words (with inner apostrophes or hyphens, e.g. "s'il", "allez-vous") or single punctuation marks
+TOKEN = re.compile(r"[^\W_]+(?:['’-][^\W_]+)*|\S")
+# Punctuation written without a space before / after it
+CLOSING = set(",.!?;:%)]}»")
+OPENING = set("¿¡([{«")
+# Anything but word characters and whitespace
+PUNCTUATION = re.compile(r"[^\w\s]|_")
+# Token (id 0) marking the end of each row while loading; it never occurs in text
+ROW_END = "\0"
+# Token id that is never in a trie, for words the table has never seen
+UNKNOWN = 0xFFFFFFFF
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text)
+
+
+def detokenize(tokens: Iterable[str]) -> str:
+    out: List[str] = []
+    for token in tokens:
+        if out and token not in CLOSING and out[-1] not in OPENING:
+            out.append(" ")
+        out.append(token)
+    return "".join(out)
+
+
+class _Vocabulary(dict):
+    """Token ids by word, handing out the next id to words not seen before.
+
+    Words keep their case; ``folded[token]`` is the id of the word in lower
+    case, which is what phrases are matched on.
+    """
+
+    def __init__(self):
+        super().__init__({ROW_END: 0})
+        self.words = [ROW_END]
+        self.folded = array("I", [0])
+
+    def __missing__(self, word: str) -> int:
+        lower = word.lower()
+        fold = self[lower] if lower != word else None
+        token = self[word] = len(self.words)
+        self.words.append(word)
+        self.folded.append(token if fold is None else fold)
+        return token
+
+
+class _Trie:
+    """Static token trie for one source language, in flat arrays.
+
+    Nodes are numbered level by level with each node's children in token
+    order, so the children of node ``n`` are the nodes ``first[n]`` to
+    ``first[n + 1] - 1`` and are found by bisecting their ``labels``
+    (tokens). The root's children are also indexed by token in ``root``.
+    ``rows`` holds the phrase row ending at each node, or -1.
+    """
+    __slots__ = ("root", "labels", "first", "rows")
+
+    def __init__(self, root: array, labels: array, first: array, rows: array):
+        self.root = root
+        self.labels = labels
+        self.first = first
+        self.rows = rows
+
+
+class PhraseTable:
+    """Phrase translations between any of the languages of the loaded tables.
+
+    A table file is tab-separated text. Its header names one language per
+    column (e.g. ``en  es  fr``) and every following line holds the same
+    phrase in each language; a cell may be empty. Lines starting with ``#``
+    are comments. Each row is stored once, as token ids in one array per
+    language, so adding a language costs one column rather than a copy of the
+    data for every pair. Lookups are case-insensitive; when two rows share a
+    source phrase, the one loaded last wins.
+
+    ``translate()`` segments the input by greedy longest match in one
+    left-to-right pass over a per-source-language trie, which is built on
+    first use and rebuilt after further loads. ``translate_many()`` does the
+    same for a list of texts in a single pass.
+    """
+
+    def __init__(self):
+        self._ids = _Vocabulary()
+        self._words = self._ids.words
+        self._rows = 0
+        # Token ids of every row's phrase in each language, with row offsets into them
+        self._tokens: Dict[str, array] = {}
+        self._offsets: Dict[str, array] = {}
+        self._tries: Dict[str, _Trie] = {}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self._tokens)
+
+    def supports(self, source: str, target: str) -> bool:
+        return source != target and source in self._tokens and target in self._tokens
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        return [(source, target) for source in self._tokens for target in self._tokens if source != target]
+
+    def load(self, path: str, chunk_rows: int = 65536) -> int:
+        """Add the rows of a table file; returns how many were added."""
+        added = 0
+        with open(path, encoding="utf-8") as f:
+            languages: Optional[List[str]] = None
+            chunk: List[List[str]] = []
+            for line in f:
+                line = line.rstrip("\r\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                cells = line.split("\t")
+                if languages is None:
+                    languages = [cell.strip().lower() for cell in cells]
+                    continue
+                if len(cells) < len(languages):
+                    cells += [""] * (len(languages) - len(cells))
+                chunk.append(cells)
+                if len(chunk) == chunk_rows:
+                    added += self._extend(languages, chunk)
+                    chunk = []
+            if languages is not None and chunk:
+                added += self._extend(languages, chunk)
+        return added
+
+    def add(self, phrases: Dict[str, str]) -> None:
+        """Add one row: the same phrase in several languages."""
+        languages = list(phrases)
+        self._extend(languages, [[phrases[language] for language in languages]])
+
+    def _extend(self, languages: List[str], rows: List[List[str]]) -> int:
+        """Append rows given as one cell per language, a column at a time."""
+        for language in languages:
+            self._add_language(language)
+        columns = dict(zip(languages, zip(*rows)))
+        for language, tokens in self._tokens.items():
+            offsets = self._offsets[language]
+            column = columns.get(language)
+            if column is None:
+                offsets.extend(array("Q", [len(tokens)]) * len(rows))
+                continue
+            # Tokenize the whole column at once, with a ROW_END token closing each row
+            text = "\n".join(column) + "\n"
+            if PUNCTUATION.search(text):
+                found = TOKEN.findall(text.replace("\n", f" {ROW_END} "))
+            else:
+                # Plain words split on whitespace just as TOKEN would, only faster
+                found = text.replace("\n", f" {ROW_END} ").split()
+            ids = array("I", map(self._ids.__getitem__, found))
+            base = len(tokens)
+            ends = compress(count(), map(not_, ids))
+            offsets.extend(array("Q", (base + end - row for row, end in enumerate(ends))))
+            tokens.extend(array("I", filter(None, ids)))
+        self._rows += len(rows)
+        self._tries.clear()
+        return len(rows)
+
+    def _add_language(self, language: str) -> None:
+        if language not in self._tokens:
+            self._tokens[language] = array("I")
+            # Rows loaded before this language have no phrase in it
+            self._offsets[language] = array("Q", [0]) * (self._rows + 1)
+
+    def _phrase(self, language: str, row: int) -> array:
+        offsets = self._offsets[language]
+        return self._tokens[language][offsets[row]:offsets[row + 1]]
+
+    def _trie(self, language: str) -> _Trie:
+        trie = self._tries.get(language)
+        if trie is None:
+            trie = self._tries[language] = self._build(language)
+        return trie
+
+    def _build(self, language: str) -> _Trie:
+        # Phrases are matched case-insensitively, on the lower-case form of each token
+        tokens = array("I", map(self._ids.folded.__getitem__, self._tokens[language]))
+        offsets = self._offsets[language]
+        # Big-endian bytes compare like the token sequences themselves, and sort fast
+        swapped = array("I", tokens)
+        swapped.byteswap()
+        blob = swapped.tobytes()
+        del swapped
+        keys = [blob[4 * offsets[row]:4 * offsets[row + 1]] for row in range(self._rows)]
+        del blob
+        # Equal phrases keep row order, so the last row loaded wins below
+        active = [row for row in sorted(range(self._rows), key=keys.__getitem__) if keys[row]]
+        del keys
+        labels = array("I", [0])
+        rows = array("i", [-1])
+        first = array("I")
+        # Node of each phrase's prefix so far; sorted phrases give each level's nodes in order
+        nodes = array("I", [0]) * self._rows
+        depth = 0
+        while active:
+            still_longer = []
+            last_parent, last_token, node = -1, -1, 0
+            for row in active:
+                start = offsets[row]
+                parent, token = nodes[row], tokens[start + depth]
+                if parent != last_parent or token != last_token:
+                    node = len(labels)
+                    labels.append(token)
+                    rows.append(-1)
+                    # Parents only grow, so every node up to this one now knows its first child
+                    while len(first) <= parent:
+                        first.append(node)
+                    last_parent, last_token = parent, token
+                nodes[row] = node
+                if offsets[row + 1] - start == depth + 1:
+                    rows[node] = row
+                else:
+                    still_longer.append(row)
+            active = still_longer
+            depth += 1
+        while len(first) <= len(labels):
+            first.append(len(labels))
+        root = array("I", [0]) * len(self._words)
+        for node in range(1, first[1]):
+            root[labels[node]] = node
+        return _Trie(root, labels, first, rows)
+
+    def segment(self, words: List[str], source: str, target: str) -> List[Tuple[int, int, Optional[int]]]:
+        """Split ``words`` into (start, end, row) segments by greedy longest match.
+
+        Each segment is the longest run of words from its start that is a
+        source phrase with a ``target`` translation; words with no match come
+        back one at a time with row None.
+        """
+        trie = self._trie(source)
+        root, labels, first, rows = trie.root, trie.labels, trie.first, trie.rows
+        target_offsets = self._offsets[target]
+        ids = self._ids
+        vocabulary = len(root)
+        tokens = [ids.get(word.lower(), UNKNOWN) for word in words]
+        segments = []
+        start = 0
+        count = len(tokens)
+        while start < count:
+            end, match = start + 1, None
+            token = tokens[start]
+            node = root[token] if token < vocabulary else 0
+            position = start + 1
+            while node:
+                row = rows[node]
+                if row >= 0 and target_offsets[row] != target_offsets[row + 1]:
+                    end, match = position, row
+                low, high = first[node], first[node + 1]
+                if low == high or position == count:
+                    break
+                token = tokens[position]
+                index = bisect_left(labels, token, low, high)
+                node = index if index < high and labels[index] == token else 0
+                position += 1
+            segments.append((start, end, match))
+            start = end
+        return segments
+
+    def translate(self, text: str, source: str, target: str) -> Tuple[str, int]:
+        """Translate ``text`` phrase by phrase; returns the text and how many phrases matched.
+
+        Words without a translation are kept as they are.
+        """
+        return self.translate_many([text], source, target)[0]
+
+    def translate_many(self, texts: List[str], source: str, target: str) -> List[Tuple[str, int]]:
+        """Translate several texts with one segmentation pass; one (text, matches) per input.
+
+        The texts are joined with ROW_END tokens, which no phrase contains, so
+        no match runs from one text into the next.
+        """
+        words: List[str] = []
+        for text in texts:
+            # A ROW_END inside a text would end it early
+            words.extend(tokenize(text.replace(ROW_END, "")))
+            words.append(ROW_END)
+        results: List[Tuple[str, int]] = []
+        out: List[str] = []
+        matched = 0
+        for start, end, row in self.segment(words, source, target):
+            if row is None:
+                if words[start] == ROW_END:
+                    results.append((detokenize(out), matched))
+                    out, matched = [], 0
+                else:
+                    out.append(words[start])
+                continue
+            matched += 1
+            phrase = [self._words[token] for token in self._phrase(target, row)]
+            if words[start][:1].isupper() and phrase:
+                phrase[0] = phrase[0][:1].upper() + phrase[0][1:]
+            out.extend(phrase)
+        return results
@@ -1,5 +1,4 @@
 import asyncio
-import uvicorn
 from datetime import datetime
 import random
 from common.types import (
@@ -12,7 +11,7 @@ from common.types import (
     Message,
     TextPart
 )
-from common.server import A2AServer
+from common.server import A2AServer, run_agent
 
 # Mock weather data for demo purposes
 weather_data = {
@@ -39,20 +38,24 @@ weather_card = AgentCard(
     ),
     version="1.0.0",
     capabilities=AgentCapabilities(
-        streaming=False,
-        pushNotifications=False,
+        streaming=True,
+        pushNotifications=True,
         stateTransitionHistory=False
     ),
     skills=[
         AgentSkill(
             id="get-weather",
             name="Get Weather",
-            description="Gets the current weather for a specified city"
+            description="Gets the current weather for a specified city",
+            idempotent=True
         ),
         AgentSkill(
             id="list-cities",
             name="List Cities",
-            description="Lists the cities available in the weather service"
+            description="Lists the cities available in the weather service",
+            idempotent=True,
+            cacheable=True,
+            cacheTtl=300
         )
     ]
 )
@@ -115,8 +118,15 @@ async def handle_task(task: Task) -> Task:
     
     return task
 
+# Define the skill classifier used for per-skill metrics
+def skill_of(task: Task) -> str:
+    query = "".join(part.text for part in task.messages[-1].parts if part.type == "text") if task.messages else ""
+    return "list-cities" if query.strip().lower() == "list-cities" else "get-weather"
+
 # Create and run the server
-server = A2AServer(weather_card, handle_task)
+server = A2AServer(weather_card, handle_task, skill_of=skill_of)
+
+app = server.app
 
 if __name__ == "__main__":
-    uvicorn.run(server.app, host="0.0.0.0", port=8003)
+    run_agent(server, "agents.weather.agent:app", port=8003)
@@ -0,0 +1,71 @@
+"""Items per second through tasks/send one at a time vs tasks/sendBatch.
+
+Usage: python -m bench.batch [--items 5000] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from agents.calculator.agent import server as calculator_server
+from agents.translator.agent import server as translator_server
+from bench.harness import free_port, serve
+from common.client import A2AClient
+from common.transport import close_http_client
+
+
+def payload(text: str):
+    return {"message": {"role": "user", "parts": [{"type": "text", "text": text}]}}
+
+
+async def per_task(client: A2AClient, payloads, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with semaphore:
+            await client.send_task(item)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(item) for item in payloads))
+    return len(payloads) / (time.perf_counter() - start)
+
+
+async def batched(client: A2AClient, payloads) -> float:
+    start = time.perf_counter()
+    await client.send_tasks(payloads)
+    return len(payloads) / (time.perf_counter() - start)
+
+
+async def compare(app, payloads, concurrency: int):
+    async with serve(app, free_port()) as url:
+        client = A2AClient(url=url)
+        per_task_rate = await per_task(client, payloads, concurrency)
+        batch_rate = await batched(client, payloads)
+        await close_http_client()
+    return {
+        "per_task_items_per_s": round(per_task_rate),
+        "batch_items_per_s": round(batch_rate),
+        "speedup": round(batch_rate / per_task_rate, 1),
+    }
+
+
+async def main(items: int, concurrency: int):
+    rng = random.Random(3)
+    phrases = ["hello", "thank you", "good night", "please", "goodbye"]
+    translations = [payload(f"translate en-{rng.choice(['es', 'fr'])}: {rng.choice(phrases)}") for _ in range(items)]
+    expressions = [payload(f"{rng.randint(1, 999)} * {rng.randint(1, 99)} + 7") for _ in range(items)]
+    results = {
+        "items": items,
+        "translator": await compare(translator_server.app, translations, concurrency),
+        "calculator": await compare(calculator_server.app, expressions, concurrency),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.concurrency))
@@ -0,0 +1,60 @@
+"""Calculator evaluation cost: legacy eval() vs the AST evaluator, cold and cached.
+
+Usage: python -m bench.calculator [--expressions 200000] [--distinct 500]
+"""
+import argparse
+import json
+import random
+import time
+
+from agents.calculator import evaluator
+
+
+def synthetic_expressions(count: int, distinct: int, seed: int = 11):
+    rng = random.Random(seed)
+    templates = [
+        "{a} + {b} * {c}",
+        "({a} + {b}) / {c}",
+        "{a} * {b} - {c} / ({a} + 1)",
+        "(({a} - {b}) * ({c} + {a})) / 7",
+        "{a} ** 2 + {b} ** 2",
+    ]
+    pool = [
+        rng.choice(templates).format(a=rng.randint(1, 999), b=rng.randint(1, 999), c=rng.randint(1, 99))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def measure(fn, expressions):
+    start = time.perf_counter()
+    for expression in expressions:
+        fn(expression)
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "evals_per_s": round(len(expressions) / elapsed)}
+
+
+def evaluate_uncached(expression):
+    return evaluator.compile_expression.__wrapped__(expression)()
+
+
+def main(count: int, distinct: int):
+    expressions = synthetic_expressions(count, distinct)
+    evaluator.compile_expression.cache_clear()
+    results = {
+        "expressions": count,
+        "distinct": distinct,
+        "legacy_eval": measure(eval, expressions),
+        "ast_uncached": measure(evaluate_uncached, expressions),
+        "ast_cached": measure(evaluator.evaluate, expressions),
+        "cache": evaluator.compile_expression.cache_info()._asdict(),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expressions", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+    main(args.expressions, args.distinct)
@@ -0,0 +1,120 @@
+"""Concurrent countdowns: the timer agent's shared ticker vs one asyncio.sleep loop each.
+
+``--countdowns`` "countdown N" tasks are sent to the timer agent over the
+in-process transport. They run either on the agent's Countdowns ticker, where
+every countdown ticks on the same whole-second boundaries through the shared
+TimingWheel, or on a stand-in that runs one ``asyncio.sleep(1)`` loop per
+countdown. Both store one update per tick with update_task(). Reported per
+mode: tick updates stored, event-loop iterations that stored at least one
+tick (wakeups), total loop iterations, and CPU per tick.
+
+Usage: python -m bench.countdowns [--countdowns N] [--seconds S]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict
+
+from agents.timer import agent as timer_agent
+from common.types import JSONRPCRequest, Message, TaskState, TextPart
+
+server = timer_agent.server
+
+
+class SleepLoops:
+    """The naive alternative: a task per countdown, each sleeping a second between ticks."""
+
+    def __init__(self):
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._running
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    def start(self, task_id: str, seconds: int) -> None:
+        self._running[task_id] = asyncio.get_running_loop().create_task(self._run(task_id, seconds))
+
+    def cancel(self, task_id: str) -> None:
+        runner = self._running.pop(task_id, None)
+        if runner is not None:
+            runner.cancel()
+
+    async def _run(self, task_id: str, seconds: int) -> None:
+        for left in range(seconds - 1, -1, -1):
+            await asyncio.sleep(1)
+            task = await server.task_store.get(task_id)
+            task.messages.append(Message(role="agent", parts=[TextPart(text=f"{left}" if left else "0!")]))
+            if not left:
+                task.state = TaskState.COMPLETED
+            await server.update_task(task)
+        del self._running[task_id]
+
+
+async def run_mode(countdowns, count: int, seconds: int) -> Dict[str, float]:
+    loop = asyncio.get_running_loop()
+    timer_agent.COUNTDOWNS = countdowns
+    stored = 0
+    completed = 0
+    update_task = server.update_task
+
+    async def counting_update(task):
+        nonlocal stored, completed
+        stored += 1
+        completed += task.state == TaskState.COMPLETED
+        await update_task(task)
+
+    server.update_task = counting_update
+    iterations = 0
+    wakeups = 0
+    original = loop._run_once
+
+    def run_once():
+        nonlocal iterations, wakeups
+        before = stored
+        original()
+        iterations += 1
+        wakeups += stored != before
+
+    text = {"role": "user", "parts": [{"type": "text", "text": f"countdown {seconds}"}]}
+    for i in range(count):
+        await server.call_local(JSONRPCRequest(id=i, method="tasks/send", params={"message": text}))
+    # Measure from here, once every countdown is running
+    loop._run_once = run_once
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    try:
+        while completed < count and time.perf_counter() - wall < seconds + 30:
+            await asyncio.sleep(0.05)
+    finally:
+        del loop._run_once
+        del server.update_task
+    cpu = time.process_time() - cpu
+    return {
+        "countdowns": count,
+        "completed": completed,
+        "ticks_stored": stored,
+        "wakeups": wakeups,
+        "loop_iterations": iterations,
+        "seconds": round(time.perf_counter() - wall, 2),
+        "cpu_us_per_tick": round(cpu / max(stored, 1) * 1e6, 1),
+    }
+
+
+async def main(count: int, seconds: int):
+    results = {
+        "shared_ticker": await run_mode(timer_agent.Countdowns(), count, seconds),
+        "sleep_per_countdown": await run_mode(SleepLoops(), count, seconds),
+        "config": {"countdowns": count, "seconds": seconds},
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countdowns", type=int, default=10_000)
+    parser.add_argument("--seconds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.countdowns, args.seconds))
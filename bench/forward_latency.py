@@ -0,0 +1,56 @@
+"""Per-hop latency of coordinator forwarding, with and without the shared pool.
+
+Usage: python -m bench.forward_latency [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import json
+import httpx
+from typing import Any, Dict
+
+from agents.calculator.agent import server as calculator_server
+from agents.coordinator import agent as coordinator
+from bench.harness import free_port, serve, summarize, timed
+from common.client import A2AClient
+from common.transport import close_http_client
+
+
+class UnpooledClient(A2AClient):
+    """The pre-pool behaviour: a fresh AsyncClient for every request."""
+
+    async def _send_request(self, request) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(self.url, json=request.model_dump(), timeout=30)
+            response.raise_for_status()
+            return response.json()
+
+
+async def run_mode(client: A2AClient, requests: int, concurrency: int):
+    coordinator.AGENT_CLIENTS["calculator"] = client
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await timed(coordinator.forward_request("calculator", f"{i} + 1"))
+
+    # Warm up so both modes are measured in steady state
+    await asyncio.gather(*(one(i) for i in range(min(50, requests))))
+    return summarize(await asyncio.gather(*(one(i) for i in range(requests))))
+
+
+async def main(requests: int, concurrency: int):
+    async with serve(calculator_server.app, free_port()) as url:
+        results = {
+            "before_unpooled": await run_mode(UnpooledClient(url=url), requests, concurrency),
+            "after_pooled": await run_mode(A2AClient(url=url), requests, concurrency),
+        }
+        await close_http_client()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
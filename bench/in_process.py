@@ -0,0 +1,87 @@
+"""Per-hop latency over HTTP vs the in-process local transport.
+
+The coordinator and calculator run in this process either way. In "http" mode
+they are served by uvicorn and every hop goes through JSON and a loopback
+socket. In "local" mode the same URLs are registered with
+register_local_agent(), so A2AClient calls the target A2AServer directly.
+
+Usage: python -m bench.in_process [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict
+
+from agents.calculator.agent import server as calculator_server
+from agents.coordinator import agent as coordinator
+from bench.harness import free_port, serve, summarize, timed
+from common.client import A2AClient
+from common.transport import close_http_client, register_local_agent, unregister_local_agent
+
+
+async def measure(call, requests: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await timed(call(i))
+
+    # Warm up so both modes are measured in steady state
+    await asyncio.gather(*(one(i) for i in range(min(100, requests))))
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    samples = await asyncio.gather(*(one(i) for i in range(requests)))
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    summary = {key: round(value, 3) for key, value in summarize(samples).items()}
+    summary["throughput_rps"] = round(requests / wall, 1)
+    summary["cpu_us_per_request"] = round(cpu / requests * 1e6, 1)
+    return summary
+
+
+async def run_mode(coordinator_url: str, requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    entry = A2AClient(url=coordinator_url, validate=False)
+
+    def send(i):
+        return entry.send_task({"message": {"role": "user", "parts": [{"type": "text", "text": f"calculate: {i} + 1"}]}})
+
+    return {
+        # One hop: coordinator -> calculator
+        "hop": await measure(lambda i: coordinator.forward_request("calculator", f"{i} + 1"), requests, concurrency),
+        # Two hops: caller -> coordinator -> calculator
+        "end_to_end": await measure(send, requests, concurrency),
+    }
+
+
+async def main(requests: int, concurrency: int):
+    async with serve(calculator_server.app, free_port()) as calculator_url, \
+            serve(coordinator.server.app, free_port()) as coordinator_url:
+        coordinator.AGENT_CLIENTS["calculator"] = A2AClient(url=calculator_url, validate=False)
+        results = {"http": await run_mode(coordinator_url, requests, concurrency)}
+
+        register_local_agent(calculator_server, calculator_url)
+        register_local_agent(coordinator.server, coordinator_url)
+        try:
+            results["local"] = await run_mode(coordinator_url, requests, concurrency)
+        finally:
+            unregister_local_agent(calculator_url)
+            unregister_local_agent(coordinator_url)
+        await close_http_client()
+
+    for path in ("hop", "end_to_end"):
+        http, local = results["http"][path], results["local"][path]
+        results[f"{path}_speedup"] = {
+            "p50": round(http["p50_ms"] / local["p50_ms"], 1) if local["p50_ms"] else None,
+            "p99": round(http["p99_ms"] / local["p99_ms"], 1) if local["p99_ms"] else None,
+            "cpu": round(http["cpu_us_per_request"] / local["cpu_us_per_request"], 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,277 @@
+"""Open-loop load generator for the coordinator and each agent.
+
+Requests are issued on a fixed schedule at the target rate whether or not
+earlier ones have finished, and latency is measured from the scheduled send
+time, so a slow server shows up as latency instead of a lower request rate.
+Each target gets a weighted mix of realistic queries. Coordinator results are
+broken down per hop (the agent a query is routed to), next to that agent's
+direct latency.
+
+Against a running mesh (python run.py --agents-only):
+    python -m bench.load --rps 200 --duration 30 --output load.json
+Starting the agents as subprocesses first:
+    python -m bench.load --spawn
+Comparing with an earlier run:
+    python -m bench.load --baseline load.json --output load-new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from bench.harness import summarize
+from common.client import A2AClient
+from common.supervisor import Supervisor
+from common.transport import close_http_client, configure_transport
+
+TARGETS = {
+    "coordinator": ("agents.coordinator.agent", "http://localhost:8000"),
+    "calculator": ("agents.calculator.agent", "http://localhost:8001"),
+    "translator": ("agents.translator.agent", "http://localhost:8002"),
+    "weather": ("agents.weather.agent", "http://localhost:8003"),
+    "timer": ("agents.timer.agent", "http://localhost:8004"),
+}
+
+CITIES = ["london", "tokyo", "new york", "paris", "sydney", "berlin", "atlantis"]
+PHRASES = ["hello", "thank you", "good morning", "good night", "please", "how are you", "see you later"]
+
+
+def calculator_query(rng: random.Random) -> str:
+    a, b, c = rng.randint(1, 999), rng.randint(1, 99), rng.randint(1, 9)
+    return rng.choice([f"{a} + {b}", f"({a} - {b}) * {c}", f"{a} / {b}", f"{c} ** {rng.randint(2, 12)}"])
+
+
+def translator_query(rng: random.Random) -> str:
+    return f"translate en-{rng.choice(['es', 'fr'])}: {rng.choice(PHRASES)}"
+
+
+def weather_query(rng: random.Random) -> str:
+    return "list-cities" if rng.random() < 0.1 else f"weather {rng.choice(CITIES)}"
+
+
+def timer_query(rng: random.Random) -> str:
+    return rng.choice(["time", "what time is it", "timer 1s", "countdown 1"])
+
+
+# Weighted (hop, query factory) mixes; the hop labels coordinator results per downstream agent
+MIXES = {
+    "calculator": [(1, "calculator", calculator_query)],
+    "translator": [(1, "translator", translator_query)],
+    "weather": [(1, "weather", weather_query)],
+    "timer": [(1, "timer", timer_query)],
+    "coordinator": [
+        (35, "calculator", lambda rng: f"calculate: {calculator_query(rng)}"),
+        (25, "translator", translator_query),
+        (20, "weather", weather_query),
+        (10, "timer", timer_query),
+        (8, "fanout", lambda rng: f"{weather_query(rng)}; calculate: {calculator_query(rng)}"),
+        (2, "help", lambda rng: "help"),
+    ],
+}
+
+
+def pick(mix, rng: random.Random) -> Tuple[str, str]:
+    weights = [weight for weight, _, _ in mix]
+    _, hop, factory = rng.choices(mix, weights=weights)[0]
+    return hop, factory(rng)
+
+
+def outcome(response) -> str:
+    """Classify a tasks/send response as "ok" or an error kind."""
+    if response.error:
+        return f"rpc_{response.error.get('code')}"
+    task = (response.result or {}).get("task") or {}
+    state = task.get("state")
+    if state in ("failed", "canceled"):
+        return f"task_{state}"
+    text = ""
+    if task.get("messages"):
+        parts = task["messages"][-1].get("parts") or [{}]
+        text = parts[0].get("text", "")
+    # The coordinator reports downstream failures inside a completed reply
+    if text.startswith("Error communicating with") or text.startswith("Error: Received malformed"):
+        return "downstream"
+    return "ok"
+
+
+async def open_loop(url: str, mix, rps: float, duration: float, max_outstanding: int, seed: int):
+    """Send ``rps * duration`` requests on a fixed schedule and collect per-hop results."""
+    loop = asyncio.get_running_loop()
+    client = A2AClient(url=url, validate=False)
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    outcomes: Dict[str, Counter] = defaultdict(Counter)
+    pending = set()
+    dropped = 0
+
+    async def one(hop: str, query: str, scheduled: float):
+        try:
+            response = await client.send_task({"message": {"role": "user", "parts": [{"type": "text", "text": query}]}})
+            kind = outcome(response)
+        except Exception as e:
+            kind = type(e).__name__
+        latencies[hop].append(loop.time() - scheduled)
+        outcomes[hop][kind] += 1
+
+    total = int(rps * duration)
+    start = loop.time() + 0.05
+    for i in range(total):
+        scheduled = start + i / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(pending) >= max_outstanding:
+            # Keep the schedule instead of blocking; count what could not be sent
+            dropped += 1
+            continue
+        hop, query = pick(mix, rng)
+        task = asyncio.create_task(one(hop, query, scheduled))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    send_window = loop.time() - start
+    if pending:
+        await asyncio.gather(*pending)
+    elapsed = loop.time() - start
+
+    samples = [sample for hop_samples in latencies.values() for sample in hop_samples]
+    errors = sum(count for counts in outcomes.values() for kind, count in counts.items() if kind != "ok")
+    completed = len(samples)
+    result = {
+        "target_rps": rps,
+        "offered_rps": round(total / send_window, 1) if send_window > 0 else 0.0,
+        "throughput_rps": round((completed - errors) / elapsed, 1) if elapsed > 0 else 0.0,
+        "sent": completed,
+        "dropped": dropped,
+        "errors": errors,
+        "error_rate": round((errors + dropped) / total, 4) if total else 0.0,
+        "latency": rounded(summarize(samples)),
+    }
+    if len(latencies) > 1:
+        result["hops"] = {
+            hop: {
+                "latency": rounded(summarize(hop_samples)),
+                "outcomes": dict(outcomes[hop]),
+            }
+            for hop, hop_samples in sorted(latencies.items())
+        }
+    else:
+        result["outcomes"] = dict(next(iter(outcomes.values()), {}))
+    return result
+
+
+def rounded(summary: Dict[str, float]) -> Dict[str, float]:
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+def add_hop_overhead(results: Dict[str, dict]) -> None:
+    """Estimate the coordinator's own cost per hop as routed p50 minus the agent's direct p50."""
+    coordinator = results.get("coordinator", {})
+    for hop, stats in coordinator.get("hops", {}).items():
+        direct = results.get(hop)
+        if direct:
+            stats["direct_p50_ms"] = direct["latency"]["p50_ms"]
+            stats["overhead_p50_ms"] = round(stats["latency"]["p50_ms"] - direct["latency"]["p50_ms"], 3)
+
+
+def compare(baseline: dict, results: dict) -> Dict[str, dict]:
+    """Relative change of throughput and latency percentiles against a previous run."""
+    changes = {}
+    for name, current in results["targets"].items():
+        previous = baseline.get("targets", {}).get(name)
+        if not previous:
+            continue
+        change = {"throughput_rps": delta(previous["throughput_rps"], current["throughput_rps"])}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "p999_ms"):
+            change[key] = delta(previous["latency"][key], current["latency"][key])
+        change["error_rate"] = round(current["error_rate"] - previous["error_rate"], 4)
+        changes[name] = change
+    return changes
+
+
+def delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def spawn_agents() -> Supervisor:
+    supervisor = Supervisor(
+        [{"name": name, "module": module, "port": int(url.rsplit(":", 1)[1])} for name, (module, url) in TARGETS.items()],
+        stream=None,
+    )
+    supervisor.start()
+    try:
+        asyncio.run(supervisor.wait_ready())
+    except BaseException:
+        supervisor.stop()
+        raise
+    print(supervisor.report(), file=sys.stderr)
+    return supervisor
+
+
+async def run(targets: List[str], rps: float, duration: float, max_outstanding: int, seed: int):
+    configure_transport(max_connections=max_outstanding, max_keepalive_connections=max_outstanding)
+    results = {}
+    try:
+        for name in targets:
+            _, url = TARGETS[name]
+            results[name] = await open_loop(url, MIXES[name], rps, duration, max_outstanding, seed)
+            print(f"{name}: {results[name]['throughput_rps']} req/s, p99 {results[name]['latency']['p99_ms']} ms",
+                  file=sys.stderr)
+    finally:
+        await close_http_client()
+    add_hop_overhead(results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--rps", type=float, default=100.0, help="target requests per second per target")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per target")
+    parser.add_argument("--max-outstanding", type=int, default=1000, help="requests in flight before sends are dropped")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--spawn", action="store_true", help="start the agents as subprocesses first")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    supervisor = spawn_agents() if args.spawn else None
+    try:
+        targets = asyncio.run(run(args.targets, args.rps, args.duration, args.max_outstanding, args.seed))
+    finally:
+        if supervisor is not None:
+            supervisor.stop()
+
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "max_outstanding": args.max_outstanding,
+            "seed": args.seed,
+            "workers": int(os.environ.get("A2A_WORKERS", "1")),
+            "task_store": os.environ.get("A2A_TASK_STORE", "memory"),
+        },
+        "host": {"python": platform.python_version(), "cpu_count": os.cpu_count()},
+        "targets": targets,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["baseline"] = {"file": args.baseline, "changes": compare(json.load(f), report)}
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    print(encoded)
+
+
+if __name__ == "__main__":
+    main()
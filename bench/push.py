@@ -0,0 +1,124 @@
+"""Tracking long-running tasks: polling tasks/get vs push notifications.
+
+An agent whose tasks finish in the background 0.5-1.5 s after tasks/send
+returns gets ``--rate`` new tasks per second. Each is tracked until
+completion by polling tasks/get every
+``--poll-interval`` seconds, then by registering a webhook
+(NotificationReceiver) in the tasks/send payload. Reported per mode:
+requests the agent had to answer, webhook POSTs, and the lag between a task
+completing and the caller finding out.
+
+Usage: python -m bench.push [--tasks N] [--rate R] [--poll-interval S]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict
+
+from bench.harness import free_port, serve, summarize
+from common.client import A2AClient
+from common.push import NotificationReceiver
+from common.server import A2AServer
+from common.transport import close_http_client, configure_transport
+from common.types import AgentCapabilities, AgentCard, AgentSkill, Message, Task, TaskState, TextPart
+
+card = AgentCard(
+    name="Background Job Agent",
+    url="http://localhost",
+    version="1.0.0",
+    capabilities=AgentCapabilities(pushNotifications=True),
+    skills=[AgentSkill(id="job", name="Job")],
+)
+
+# perf_counter() at which each task completed on the agent
+completed_at: Dict[str, float] = {}
+rng = random.Random(1)
+
+
+async def handle_task(task: Task) -> Task:
+    """Accept the job and finish it later, outside the request."""
+    task.state = TaskState.WORKING
+    asyncio.get_running_loop().call_later(rng.uniform(0.5, 1.5), lambda: asyncio.ensure_future(finish(task)))
+    return task
+
+
+async def finish(task: Task) -> None:
+    task.messages.append(Message(role="agent", parts=[TextPart(text="done")]))
+    task.state = TaskState.COMPLETED
+    completed_at[task.id] = time.perf_counter()
+    await server.update_task(task)
+
+
+server = A2AServer(card, handle_task)
+
+
+def payload(extra: Dict = None) -> Dict:
+    message = {"message": {"role": "user", "parts": [{"type": "text", "text": "run job"}]}}
+    message.update(extra or {})
+    return message
+
+
+async def polling(url: str, tasks: int, rate: float, interval: float) -> Dict:
+    client = A2AClient(url=url, validate=False)
+    requests = 0
+    errors = []
+
+    async def track(i: int) -> float:
+        nonlocal requests
+        await asyncio.sleep(i / rate)
+        task_id = (await client.send_task(payload())).result["task"]["id"]
+        requests += 1
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                response = await client.get_task({"taskId": task_id, "sinceVersion": 0})
+            except Exception as e:
+                # An overloaded loop can hit keep-alive races; count them and poll again
+                errors.append(repr(e))
+                continue
+            requests += 1
+            if response.result["task"]["state"] == "completed":
+                return time.perf_counter() - completed_at[task_id]
+
+    lags = await asyncio.gather(*(track(i) for i in range(tasks)))
+    return {"agent_requests": requests, "errors": len(errors), "webhook_posts": 0, "lag": summarize(lags)}
+
+
+async def pushing(url: str, receiver: NotificationReceiver, receiver_url: str, tasks: int, rate: float) -> Dict:
+    client = A2AClient(url=url, validate=False)
+
+    async def track(i: int) -> float:
+        await asyncio.sleep(i / rate)
+        response = await client.send_task(payload({"pushNotification": {"url": receiver_url}}))
+        task_id = response.result["task"]["id"]
+        await receiver.wait_final(task_id, timeout=30)
+        return time.perf_counter() - completed_at[task_id]
+
+    lags = await asyncio.gather(*(track(i) for i in range(tasks)))
+    return {"agent_requests": tasks, "webhook_posts": receiver.requests, "lag": summarize(lags)}
+
+
+async def main(tasks: int, rate: float, poll_interval: float):
+    configure_transport(max_connections=200, max_keepalive_connections=200)
+    receiver = NotificationReceiver()
+    async with serve(server.app, free_port()) as url, serve(receiver.app, free_port()) as receiver_url:
+        results = {
+            "polling": await polling(url, tasks, rate, poll_interval),
+            "push": await pushing(url, receiver, receiver_url + "/", tasks, rate),
+        }
+        await close_http_client()
+    for result in results.values():
+        result["lag"] = {key: round(value, 3) for key, value in result["lag"].items()}
+    results["config"] = {"tasks": tasks, "rate": rate, "poll_interval": poll_interval}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=50.0, help="tasks started per second")
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.rate, args.poll_interval))
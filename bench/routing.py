@@ -0,0 +1,83 @@
+"""Routes per second of the coordinator's routing engine on synthetic queries.
+
+Usage: python -m bench.routing [--queries 1000000]
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from agents.coordinator.router import Router
+
+
+def legacy_identify_agent(query):
+    """The per-request, uncompiled matcher the Router replaced."""
+    query = query.lower()
+    calc_patterns = [r'^\s*calculate\s*:', r'^\s*calc\s*:', r'^\s*[\d\(\)\+\-\*/\s\.]+$']
+    for pattern in calc_patterns:
+        if re.match(pattern, query):
+            cleaned = query.split(':', 1)[-1].strip() if ':' in query else query
+            return "calculator", cleaned
+    if re.match(r'^\s*translate\s+[a-z]{2}-[a-z]{2}\s*:', query):
+        return "translator", query
+    if query.startswith("weather ") or query == "list-cities":
+        return "weather", query
+    timer_patterns = [
+        r'^\s*what\s+time\s+is\s+it\s*$',
+        r'^\s*time\s*$',
+        r'^\s*now\s*$',
+        r'^\s*(set\s+)?timer\s+.*$',
+        r'^\s*countdown\s+\d+\s*$'
+    ]
+    for pattern in timer_patterns:
+        if re.match(pattern, query):
+            return "timer", query
+    return None, query
+
+
+def synthetic_queries(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    cities = ["london", "tokyo", "paris", "new york", "rio de janeiro", "atlantis"]
+    phrases = ["hello", "thank you", "good night", "how are you"]
+    makers = [
+        lambda: f"calculate: {rng.randint(0, 999)} * {rng.randint(1, 99)}",
+        lambda: f"calc: ({rng.randint(0, 99)}+{rng.randint(0, 99)})/2",
+        lambda: f"{rng.randint(0, 999)} + {rng.randint(0, 999)}",
+        lambda: f"translate en-{rng.choice(['es', 'fr'])}: {rng.choice(phrases)}",
+        lambda: f"weather {rng.choice(cities)}",
+        lambda: "list-cities",
+        lambda: rng.choice(["time", "now", "what time is it"]),
+        lambda: f"timer {rng.randint(1, 59)}m",
+        lambda: f"countdown {rng.randint(1, 60)}",
+        lambda: rng.choice(["tell me a joke", "who are you", "translate this"]),
+    ]
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+def measure(route, queries):
+    start = time.perf_counter()
+    for query in queries:
+        route(query)
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "routes_per_s": round(len(queries) / elapsed)}
+
+
+def main(count: int):
+    queries = synthetic_queries(count)
+    router = Router()
+    mismatches = sum(1 for q in queries[:10_000] if router.route(q) != legacy_identify_agent(q))
+    results = {
+        "queries": count,
+        "mismatches_vs_legacy": mismatches,
+        "legacy": measure(legacy_identify_agent, queries),
+        "router": measure(router.route, queries),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.queries)
@@ -0,0 +1,90 @@
+"""Response encode/decode cost for large-history tasks, old path vs fast path.
+
+Usage: python -m bench.serialization [--messages 1000] [--iterations 200]
+"""
+import argparse
+import json
+import time
+
+from starlette.responses import JSONResponse
+
+from common.serialization import FastJSONResponse, loads
+from common.types import Message, SendTaskResponse, Task, TaskState, TextPart
+
+
+def large_task(messages: int) -> Task:
+    return Task(
+        id="bench-task",
+        state=TaskState.COMPLETED,
+        messages=[
+            Message(
+                role="user" if i % 2 == 0 else "agent",
+                parts=[TextPart(text=f"message {i}: " + "lorem ipsum dolor sit amet " * 4)],
+            )
+            for i in range(messages)
+        ],
+    )
+
+
+def measure(fn, iterations: int):
+    """Return (bytes per call, wall seconds per call, CPU seconds per call)."""
+    size = len(fn())
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        fn()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return size, wall / iterations, cpu / iterations
+
+
+def report(size: int, wall: float, cpu: float):
+    return {
+        "bytes": size,
+        "ms_per_request": round(wall * 1000, 3),
+        "cpu_ms_per_request": round(cpu * 1000, 3),
+        "mb_per_s": round(size / wall / 1e6, 1),
+    }
+
+
+def main(messages: int, iterations: int):
+    task = large_task(messages)
+    old_body = JSONResponse(
+        content={"jsonrpc": "2.0", "result": {"task": task.model_dump(exclude_none=True)}, "id": 1}
+    ).body
+
+    def encode_old():
+        return JSONResponse(
+            content={"jsonrpc": "2.0", "result": {"task": task.model_dump(exclude_none=True)}, "id": 1}
+        ).body
+
+    def encode_new():
+        return FastJSONResponse(content={"jsonrpc": "2.0", "result": {"task": task}, "id": 1}).body
+
+    def decode_old():
+        SendTaskResponse.model_validate(json.loads(old_body))
+        return old_body
+
+    def decode_new():
+        SendTaskResponse.model_construct(**loads(old_body))
+        return old_body
+
+    assert json.loads(encode_old()) == json.loads(encode_new())
+    results = {
+        "messages": messages,
+        "server_encode": {
+            "model_dump+JSONResponse": report(*measure(encode_old, iterations)),
+            "fast": report(*measure(encode_new, iterations)),
+        },
+        "client_decode": {
+            "json+model_validate": report(*measure(decode_old, iterations)),
+            "fast+no_validate": report(*measure(decode_new, iterations)),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    main(args.messages, args.iterations)
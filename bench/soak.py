@@ -0,0 +1,155 @@
+"""Soak test: push many requests through a supervised agent and check it never stalls.
+
+The calculator agent is started by common.supervisor.Supervisor, which drains
+its output into rotating log files, and then kept busy with ``--requests``
+tasks/send calls from ``--concurrency`` clients. Every request writes a uvicorn
+access log line, so an agent whose output pipe is not read blocks after a few
+hundred requests. The run fails if no request completes for ``--stall-timeout``
+seconds.
+
+    python -m bench.soak
+    python -m bench.soak --requests 20000 --undrained   # the old unread pipe, for comparison
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from bench.harness import free_port, summarize, wait_until_ready
+from common.client import A2AClient
+from common.supervisor import Supervisor
+from common.transport import close_http_client, configure_transport
+
+
+def start_undrained(port: int) -> subprocess.Popen:
+    """Start the agent the way run.py used to: output piped but never read."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "agents.calculator.agent"],
+        env=dict(os.environ, A2A_PORT=str(port)),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+async def drive(url: str, requests: int, concurrency: int, stall_timeout: float) -> Dict[str, object]:
+    """Send ``requests`` tasks/send calls from ``concurrency`` workers, watching for stalls."""
+    configure_transport(max_connections=concurrency, max_keepalive_connections=concurrency)
+    client = A2AClient(url=url, validate=False, timeout=stall_timeout)
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+    last_completion = time.monotonic()
+    longest_gap = 0.0
+
+    async def worker(index: int):
+        nonlocal issued, errors, last_completion, longest_gap
+        while issued < requests:
+            issued += 1
+            query = f"{issued % 997} + {index}"
+            start = time.monotonic()
+            try:
+                response = await client.send_task({"message": {"role": "user", "parts": [{"type": "text", "text": query}]}})
+            except Exception:
+                # Timeouts are not progress; only answered requests reset the stall clock
+                errors += 1
+                continue
+            if response.error:
+                errors += 1
+            now = time.monotonic()
+            latencies.append(now - start)
+            longest_gap = max(longest_gap, now - last_completion)
+            last_completion = now
+
+    async def watchdog():
+        while True:
+            await asyncio.sleep(0.5)
+            if time.monotonic() - last_completion > stall_timeout:
+                return
+
+    started = time.monotonic()
+    workers = asyncio.gather(*(worker(i) for i in range(concurrency)))
+    watcher = asyncio.create_task(watchdog())
+    try:
+        done, _ = await asyncio.wait({workers, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        stalled = watcher in done
+        if stalled:
+            workers.cancel()
+            try:
+                await workers
+            except asyncio.CancelledError:
+                pass
+    finally:
+        watcher.cancel()
+        await close_http_client()
+    elapsed = time.monotonic() - started
+    return {
+        "completed": len(latencies),
+        "errors": errors,
+        "stalled": stalled,
+        "elapsed_s": round(elapsed, 1),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "longest_gap_ms": round(longest_gap * 1000, 1),
+        "latency": {key: round(value, 3) for key, value in summarize(latencies).items()},
+    }
+
+
+def log_usage(log_dir: str) -> Dict[str, int]:
+    return {name: os.path.getsize(os.path.join(log_dir, name)) for name in sorted(os.listdir(log_dir))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--stall-timeout", type=float, default=10.0, help="seconds without a completion that count as a stall")
+    parser.add_argument("--max-log-bytes", type=int, default=1024 * 1024, help="log size at which files rotate")
+    parser.add_argument("--undrained", action="store_true", help="leave the agent's output pipe unread")
+    args = parser.parse_args()
+
+    port = free_port()
+    url = f"http://localhost:{port}"
+    log_dir = tempfile.mkdtemp(prefix="a2a-soak-")
+    supervisor = None
+    process = None
+    if args.undrained:
+        process = start_undrained(port)
+        wait_until_ready(url)
+    else:
+        supervisor = Supervisor(
+            [{"name": "Calculator Agent", "module": "agents.calculator.agent", "port": port}],
+            env=dict(os.environ, A2A_PORT=str(port)),
+            log_dir=log_dir,
+            max_bytes=args.max_log_bytes,
+            backup_count=2,
+        )
+        supervisor.start()
+        asyncio.run(supervisor.wait_ready())
+
+    try:
+        result = asyncio.run(drive(url, args.requests, args.concurrency, args.stall_timeout))
+    finally:
+        if supervisor is not None:
+            supervisor.stop()
+        if process is not None:
+            process.kill()
+            process.wait()
+
+    result["mode"] = "undrained" if args.undrained else "drained"
+    if supervisor is not None:
+        result["log_lines"] = supervisor.agents[0].drain.lines
+        result["log_files"] = log_usage(log_dir)
+    # ru_maxrss is in KiB on Linux; this is the supervisor (bench) process, drain threads included
+    result["supervisor_max_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(result, indent=2))
+    if result["stalled"] or result["completed"] < args.requests:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
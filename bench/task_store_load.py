@@ -0,0 +1,67 @@
+"""Write throughput and read latency of SQLiteTaskStore as it grows.
+
+Usage: python -m bench.task_store_load [--sizes 10000 100000 1000000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from bench.harness import summarize, timed
+from common.task_store import SQLiteTaskStore
+from common.types import Message, Task, TaskState, TextPart
+
+
+def make_task(i: int) -> Task:
+    return Task(
+        id=f"task-{i}",
+        state=TaskState.COMPLETED,
+        messages=[
+            Message(role="user", parts=[TextPart(text=f"calculate: {i} + {i}")]),
+            Message(role="agent", parts=[TextPart(text=f"Result: {2 * i}")]),
+        ],
+    )
+
+
+async def fill(store: SQLiteTaskStore, start: int, stop: int, concurrency: int) -> float:
+    """Save tasks start..stop from ``concurrency`` writers; return tasks/second."""
+    counter = iter(range(start, stop))
+
+    async def writer():
+        for i in counter:
+            await store.save(make_task(i))
+
+    began = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(concurrency)))
+    return (stop - start) / (time.perf_counter() - began)
+
+
+async def main(sizes, concurrency: int, reads: int):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteTaskStore(os.path.join(directory, "tasks.db"))
+        stored = 0
+        for size in sorted(sizes):
+            writes_per_s = await fill(store, stored, size, concurrency)
+            stored = size
+            samples = [await timed(store.get(f"task-{random.randrange(size)}")) for _ in range(reads)]
+            results.append({
+                "stored_tasks": size,
+                "writes_per_s": round(writes_per_s),
+                "read_latency": summarize(samples),
+                "store": store.stats(),
+            })
+        await store.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.concurrency, args.reads))
@@ -0,0 +1,178 @@
+"""Timer throughput and memory: the shared TimingWheel vs one loop.call_later per timer.
+
+For each scheduler, ``--timers`` timers with random delays of 1 s to 1 h are
+inserted, then half of them are cancelled. Reported: inserts and cancels per
+second, and traced memory per pending timer before and after the cancels
+(asyncio keeps cancelled handles in its heap until they surface). Then
+``--timers`` timers due within ``--spread`` seconds are fired, reporting fires
+per second of CPU, loop wakeups and how late the callbacks ran.
+
+The last section drives the timer agent itself: ``--agent-timers`` set-timer
+tasks over the in-process transport, all due within a couple of seconds.
+
+Usage: python -m bench.timers [--timers N] [--spread S] [--agent-timers N]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from bench.harness import summarize
+from common.scheduler import TimingWheel
+
+
+class CallLater:
+    """asyncio's own timer heap behind the same call_later() interface."""
+
+    def call_later(self, delay, callback, *args):
+        return asyncio.get_running_loop().call_later(delay, callback, *args)
+
+
+def per_second(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds else float("inf")
+
+
+def schedule(scheduler, delays: List[float]) -> list:
+    noop = lambda: None
+    return [scheduler.call_later(delay, noop) for delay in delays]
+
+
+async def insert_and_cancel(factory, timers: int) -> Dict[str, float]:
+    rng = random.Random(1)
+    delays = [rng.uniform(1, 3600) for _ in range(timers)]
+    gc.collect()
+    started = time.perf_counter()
+    handles = schedule(factory(), delays)
+    insert = time.perf_counter() - started
+    started = time.perf_counter()
+    for handle in handles[::2]:
+        handle.cancel()
+    cancel = time.perf_counter() - started
+    for handle in handles[1::2]:
+        handle.cancel()
+    del handles
+
+    # Memory is traced in a second pass, since tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    handles = schedule(factory(), delays)
+    # The list of handles belongs to the caller, not the scheduler
+    pending = tracemalloc.get_traced_memory()[0] - base - sys.getsizeof(handles)
+    for handle in handles[::2]:
+        handle.cancel()
+    survivors = handles[1::2]
+    del handles
+    gc.collect()
+    after_cancel = tracemalloc.get_traced_memory()[0] - base - sys.getsizeof(survivors)
+    tracemalloc.stop()
+    for handle in survivors:
+        handle.cancel()
+    return {
+        "inserts_per_s": per_second(timers, insert),
+        "cancels_per_s": per_second(timers // 2, cancel),
+        "bytes_per_timer": round(pending / timers, 1),
+        "bytes_per_live_timer_after_cancelling_half": round(after_cancel / len(survivors), 1),
+        "insert_seconds": insert,
+    }
+
+
+async def fire(scheduler, timers: int, spread: float, lead: float) -> Dict[str, float]:
+    loop = asyncio.get_running_loop()
+    rng = random.Random(2)
+    lateness: List[float] = []
+    done = loop.create_future()
+
+    def fired(when):
+        lateness.append(loop.time() - when)
+        if len(lateness) == timers and not done.done():
+            done.set_result(None)
+
+    # Count loop iterations that ran at least one timer callback
+    wakeups = 0
+    original = loop._run_once
+
+    def run_once():
+        nonlocal wakeups
+        before = len(lateness)
+        original()
+        if len(lateness) != before:
+            wakeups += 1
+
+    loop._run_once = run_once
+    try:
+        now = loop.time()
+        for _ in range(timers):
+            # Nothing is due before every timer is in, so lateness is not insertion time
+            when = now + lead + rng.uniform(0, spread)
+            scheduler.call_later(when - loop.time(), fired, when)
+        cpu = time.process_time()
+        await done
+        cpu = time.process_time() - cpu
+    finally:
+        del loop._run_once
+    summary = {key: round(value, 2) for key, value in summarize(lateness).items()}
+    summary["fires_per_cpu_s"] = per_second(timers, cpu)
+    summary["wakeups"] = wakeups
+    return summary
+
+
+async def agent_timers(timers: int) -> Dict[str, float]:
+    from agents.timer import agent as timer_agent
+    from common.types import JSONRPCRequest
+
+    server = timer_agent.server
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    task_ids = []
+    for i in range(timers):
+        request = JSONRPCRequest(id=i, method="tasks/send", params={
+            "message": {"role": "user", "parts": [{"type": "text", "text": f"timer {1 + i % 2}s"}]}
+        })
+        task_ids.append((await server.call_local(request))["result"]["task"]["id"])
+    send = time.perf_counter() - started
+    working = len(timer_agent.TIMERS)
+    deadline = loop.time() + 30
+    while (timer_agent.TIMERS or timer_agent._completions) and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+    states: Dict[str, int] = {}
+    for task_id in task_ids:
+        task = await server.task_store.get(task_id)
+        # The in-memory store may already have evicted finished tasks
+        state = task.state.value if task is not None else "evicted"
+        states[state] = states.get(state, 0) + 1
+    return {
+        "timers": timers,
+        "sends_per_s": per_second(timers, send),
+        "working_after_send": working,
+        "final_states": states,
+    }
+
+
+async def main(timers: int, spread: float, agents: int):
+    results = {}
+    for name, factory in (("timing_wheel", TimingWheel), ("call_later", CallLater)):
+        insert_cancel = await insert_and_cancel(factory, timers)
+        lead = 2 * insert_cancel.pop("insert_seconds") + 0.2
+        results[name] = {
+            "insert_cancel": insert_cancel,
+            "fire": await fire(factory(), timers, spread, lead),
+        }
+    if agents:
+        results["timer_agent"] = await agent_timers(agents)
+    results["config"] = {"timers": timers, "spread_s": spread}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=200_000)
+    parser.add_argument("--spread", type=float, default=2.0, help="seconds over which fired timers are due")
+    parser.add_argument("--agent-timers", type=int, default=20_000, help="set-timer tasks sent to the timer agent")
+    args = parser.parse_args()
+    asyncio.run(main(args.timers, args.spread, args.agent_timers))
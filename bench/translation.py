@@ -0,0 +1,176 @@
+"""Phrase translation at scale: the translator's PhraseTable vs per-pair phrase dicts.
+
+A synthetic table of ``--entries`` rows (en, es, fr; 1-4 words per phrase
+drawn from a ``--vocabulary``-word lexicon per language) is written to a
+temporary file. It is loaded into a PhraseTable, and into the obvious
+alternative: one ``{source phrase: target phrase}`` dict per language pair,
+segmented by trying the longest phrase length first at every word. Reported
+per engine: load time (file to first translation, including the trie
+build), traced memory, and words per second translating ``--words`` words of
+running text (table phrases mixed with unknown words and punctuation) from
+English into Spanish and French. Both engines must produce the same output.
+
+Usage: python -m bench.translation [--entries N] [--vocabulary V] [--words W]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from agents.translator.phrase_table import PhraseTable, detokenize, tokenize
+
+LANGUAGES = ("en", "es", "fr")
+TARGETS = ("es", "fr")
+
+
+class PairDicts:
+    """One phrase dict per language pair out of English, probed longest phrase first."""
+
+    def __init__(self):
+        self.pairs: Dict[str, Dict[str, str]] = {target: {} for target in TARGETS}
+        self.longest = 0
+
+    def load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            languages = f.readline().rstrip("\n").split("\t")
+            for line in f:
+                row = dict(zip(languages, line.rstrip("\n").split("\t")))
+                source = " ".join(tokenize(row["en"].lower()))
+                self.longest = max(self.longest, source.count(" ") + 1)
+                for target in TARGETS:
+                    self.pairs[target][source] = row[target]
+
+    def translate(self, text: str, target: str) -> str:
+        pair = self.pairs[target]
+        words = tokenize(text)
+        lowered = [word.lower() for word in words]
+        out: List[str] = []
+        start = 0
+        while start < len(words):
+            for length in range(min(self.longest, len(words) - start), 0, -1):
+                phrase = pair.get(" ".join(lowered[start:start + length]))
+                if phrase is not None:
+                    out.extend(tokenize(phrase))
+                    start += length
+                    break
+            else:
+                out.append(words[start])
+                start += 1
+        return detokenize(out)
+
+
+def write_table(path: str, entries: int, vocabulary: int, rng: random.Random) -> List[str]:
+    lexicons = {
+        language: [f"{language}{word:x}" for word in rng.sample(range(16 ** 5), vocabulary)]
+        for language in LANGUAGES
+    }
+    english = []
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\t".join(LANGUAGES) + "\n")
+        for _ in range(entries):
+            length = rng.choice((1, 2, 2, 3, 3, 4))
+            row = [" ".join(rng.choices(lexicons[language], k=length)) for language in LANGUAGES]
+            english.append(row[0])
+            f.write("\t".join(row) + "\n")
+    return english
+
+
+def running_text(english: List[str], words: int, rng: random.Random) -> List[str]:
+    """Sentences of table phrases, unknown words and punctuation, about ``words`` words in all."""
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = []
+        while len(sentence) < 20:
+            pick = rng.random()
+            if pick < 0.1:
+                sentence.append("unknownword")
+            elif pick < 0.15:
+                sentence.append(",")
+            else:
+                sentence.extend(rng.choice(english).split())
+        sentences.append(detokenize(sentence + ["."]))
+        count += len(sentence)
+    return sentences
+
+
+def measure(engine: str, path: str, sentences: List[str], words: int) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+    def load():
+        if engine == "phrase_table":
+            table = PhraseTable()
+            table.load(path)
+            table.translate("warm", "en", "es")
+            return table
+        dicts = PairDicts()
+        dicts.load(path)
+        return dicts
+
+    gc.collect()
+    started = time.perf_counter()
+    loaded = load()
+    load_seconds = time.perf_counter() - started
+
+    outputs = {}
+    speeds = {}
+    for target in TARGETS:
+        started = time.perf_counter()
+        if engine == "phrase_table":
+            outputs[target] = [loaded.translate(sentence, "en", target)[0] for sentence in sentences]
+        else:
+            outputs[target] = [loaded.translate(sentence, target) for sentence in sentences]
+        speeds[target] = round(words / (time.perf_counter() - started))
+    del loaded
+
+    # Memory is traced in a second load, since tracing slows loading down
+    gc.collect()
+    tracemalloc.start()
+    loaded = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return {
+        "load_seconds": round(load_seconds, 2),
+        "memory_mb": round(current / 2 ** 20, 1),
+        "peak_load_memory_mb": round(peak / 2 ** 20, 1),
+        "words_per_s_en_es": speeds["es"],
+        "words_per_s_en_fr": speeds["fr"],
+    }, outputs
+
+
+def main(entries: int, vocabulary: int, words: int):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "phrases.tsv")
+        english = write_table(path, entries, vocabulary, rng)
+        sentences = running_text(english, words, rng)
+        del english
+        table, table_out = measure("phrase_table", path, sentences, words)
+        dicts, dicts_out = measure("pair_dicts", path, sentences, words)
+        results = {
+            "phrase_table": table,
+            "pair_dicts": dicts,
+            "same_output": table_out == dicts_out,
+            "config": {
+                "entries": entries,
+                "languages": len(LANGUAGES),
+                "vocabulary_per_language": vocabulary,
+                "words": words,
+                "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+            },
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.entries, args.vocabulary, args.words)
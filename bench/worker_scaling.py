@@ -0,0 +1,112 @@
+"""Throughput of one agent served by 1..N uvicorn workers sharing a SQLite task store.
+
+Each request is a tasks/send followed by a tasks/get of the same task, which
+may land on a different worker; "get_misses" counts tasks that were not found.
+
+Usage: python -m bench.worker_scaling [--workers 1 2 4 8] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from bench.harness import free_port, wait_until_ready
+
+
+async def drive(url: str, duration: float, concurrency: int):
+    completed = misses = errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal completed, misses, errors
+            while time.monotonic() < deadline:
+                task_id = str(uuid.uuid4())
+                try:
+                    await client.post(url, json={
+                        "jsonrpc": "2.0", "method": "tasks/send", "id": 1,
+                        "params": {"taskId": task_id, "message": {
+                            "role": "user", "parts": [{"type": "text", "text": "(17 * 23) + 4"}]}},
+                    })
+                    response = await client.post(url, json={
+                        "jsonrpc": "2.0", "method": "tasks/get", "id": 2, "params": {"taskId": task_id},
+                    })
+                    if "error" in response.json():
+                        misses += 1
+                    completed += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return completed, misses, errors
+
+
+def client_process(url: str, duration: float, concurrency: int, results) -> None:
+    results.put(asyncio.run(drive(url, duration, concurrency)))
+
+
+def run_level(workers: int, duration: float, clients: int, concurrency: int, directory: str):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        A2A_WORKERS=str(workers),
+        A2A_PORT=str(port),
+        A2A_TASK_STORE="sqlite",
+        A2A_TASK_STORE_DIR=os.path.join(directory, f"workers-{workers}"),
+    )
+    agent = subprocess.Popen(
+        [sys.executable, "-m", "agents.calculator.agent"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(url)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=client_process, args=(url, duration, concurrency, results))
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        agent.terminate()
+        agent.wait()
+
+    completed = sum(t[0] for t in totals)
+    return {
+        "workers": workers,
+        "requests_per_s": round(completed / duration),
+        "get_misses": sum(t[1] for t in totals),
+        "errors": sum(t[2] for t in totals),
+    }
+
+
+def main(levels, duration: float, clients: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run_level(n, duration, clients, concurrency, directory) for n in levels]
+    baseline = results[0]["requests_per_s"] or 1
+    for result in results:
+        result["speedup"] = round(result["requests_per_s"] / baseline, 2)
+    print(json.dumps({"cpu_count": os.cpu_count(), "levels": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="load-generating processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="in-flight requests per client")
+    args = parser.parse_args()
+    main(args.workers, args.duration, args.clients, args.concurrency)
@@ -2,6 +2,7 @@ import asyncio
 import argparse
 import uuid
 from common.client import A2AClient, get_agent_card
+from common.transport import close_http_client
 from common.types import TextPart
 
 COORDINATOR_URL = "http://localhost:8000"
@@ -70,6 +71,15 @@ async def interactive_mode():
             break
         except Exception as e:
             print(f"\nError: {str(e)}\n")
+    
+    await close_http_client()
+
+async def send_single_message(message):
+    """Send one message and release the connection pool before exiting."""
+    try:
+        await send_message(message)
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="A2A Demo Client")
@@ -79,7 +89,7 @@ if __name__ == "__main__":
     
     if args.message:
         # Single message mode
-        asyncio.run(send_message(args.message))
+        asyncio.run(send_single_message(args.message))
     else:
         # Interactive mode
         asyncio.run(interactive_mode())
@@ -1,5 +1,8 @@
+import asyncio
+import time
 import httpx
-from typing import Any, Dict, Optional
+from httpx_sse import aconnect_sse
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, TypeVar
 import json
 from common.types import (
     AgentCard, 
@@ -7,57 +10,318 @@ from common.types import (
     GetTaskResponse, 
     SendTaskRequest, 
     SendTaskResponse, 
+    SendTaskBatchRequest,
+    SendTaskBatchResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
     CancelTaskRequest, 
     CancelTaskResponse, 
+    GetTaskPushNotificationRequest,
+    GetTaskPushNotificationResponse,
+    SetTaskPushNotificationRequest,
+    SetTaskPushNotificationResponse,
     JSONRPCRequest, 
     JSONRPCResponse
 )
+from common.metrics import CLIENT_ERRORS, CLIENT_HEDGES, CLIENT_REQUEST_DURATION
+from common.resilience import (
+    DEADLINE_EXCEEDED_CODE,
+    DEADLINE_HEADER,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    LatencyTracker,
+    deadline_header_value,
+    remaining,
+)
+from common.serialization import loads
+from common.tracing import current_traceparent, span
+from common.transport import get_http_client, get_local_agent, get_transport_config
+
+R = TypeVar("R", bound=JSONRPCResponse)
+
+# JSON-RPC errors that say the agent is unhealthy (busy, internal error, out of
+# time) and count against its circuit breaker, unlike bad-request errors
+BREAKER_ERROR_CODES = (-32000, -32603, DEADLINE_EXCEEDED_CODE)
 
 
 class A2AClient:
-    def __init__(self, agent_card: Optional[AgentCard] = None, url: Optional[str] = None):
+    def __init__(
+        self,
+        agent_card: Optional[AgentCard] = None,
+        url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        validate: bool = True,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # None means use the timeout configured on the shared transport
+        self.timeout = timeout
+        # validate=False skips pydantic validation of responses on hot paths
+        self.validate = validate
         if agent_card:
             self.url = agent_card.url
         elif url:
             self.url = url
         else:
             raise ValueError("Must provide either agent_card or url")
+        # Optional breaker that fails calls fast while the agent keeps failing
+        self.breaker = breaker
+        # Latency histogram per method, labelled with this client's target URL
+        self._latency = {}
+        self._recent = LatencyTracker()
     
     async def send_task(self, payload: Dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
-        return SendTaskResponse.model_validate(await self._send_request(request))
+        return self._parse(SendTaskResponse, await self._send_request(request))
+    
+    async def send_task_hedged(self, payload: Dict[str, Any], delay: Optional[float] = None) -> SendTaskResponse:
+        """Send a task, and a second copy if the first has not answered after ``delay``.
+        
+        The first answer wins and the other request is cancelled. ``delay``
+        defaults to the 95th percentile of this client's recent latencies. Only
+        use this for idempotent skills: the agent may run the task twice. The
+        payload must not carry a ``taskId``, so the copies become separate tasks.
+        """
+        if "taskId" in payload:
+            raise ValueError("Hedged tasks must not set taskId")
+        if delay is None:
+            delay = self._recent.percentile(95, default=0.05)
+        
+        first = asyncio.ensure_future(self.send_task(payload))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        if self.breaker is not None and self.breaker.state != CircuitBreaker.CLOSED:
+            # Don't spend a half-open probe slot on a duplicate
+            return await first
+        
+        CLIENT_HEDGES.labels(self.url, "sent").inc()
+        second = asyncio.ensure_future(self.send_task(payload))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is second:
+                            CLIENT_HEDGES.labels(self.url, "won").inc()
+                        return attempt.result()
+            # Both attempts failed; report the original request's error
+            return first.result()
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+    
+    async def send_task_batch(self, payloads: List[Dict[str, Any]]) -> SendTaskBatchResponse:
+        request = SendTaskBatchRequest(params={"tasks": payloads})
+        return self._parse(SendTaskBatchResponse, await self._send_request(request))
+    
+    async def send_tasks(
+        self, payloads: List[Dict[str, Any]], chunk_size: int = 200, concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Send many tasks through tasks/sendBatch and return the resulting tasks in order.
+        
+        Inputs are split into chunks of ``chunk_size`` (the server accepts at
+        most 1000 per call) with up to ``concurrency`` chunks in flight.
+        """
+        chunks = [payloads[i:i + chunk_size] for i in range(0, len(payloads), chunk_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                response = await self.send_task_batch(chunk)
+            if response.error:
+                raise Exception(f"Batch error: {response.error.get('message')}")
+            return response.result["tasks"]
+        
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        return [task for chunk_tasks in results for task in chunk_tasks]
+    
+    async def send_task_subscribe(self, payload: Dict[str, Any]) -> AsyncIterator[SendTaskStreamingResponse]:
+        """Send a task and yield each status/artifact update as the agent streams it."""
+        request = SendTaskStreamingRequest(params=payload)
+        local = get_local_agent(self.url)
+        if local is not None:
+            # Hosted in this process: relay the events without SSE or JSON
+            with span("a2a.client tasks/sendSubscribe", target=self.url, transport="local"):
+                async for data in local.stream_local(request):
+                    response = self._parse(SendTaskStreamingResponse, data)
+                    yield response
+                    if response.error or (response.result and response.result.get("final")):
+                        return
+            return
+        client = get_http_client()
+        try:
+            async with aconnect_sse(
+                client,
+                "POST",
+                self.url,
+                content=request.model_dump_json(),
+                headers=self._headers(),
+                timeout=self.timeout if self.timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            ) as event_source:
+                event_source.response.raise_for_status()
+                if not event_source.response.headers.get("content-type", "").startswith("text/event-stream"):
+                    # The server answered with a plain JSON-RPC error instead of a stream
+                    await event_source.response.aread()
+                    yield self._parse(SendTaskStreamingResponse, loads(event_source.response.content))
+                    return
+                async for sse in event_source.aiter_sse():
+                    response = self._parse(SendTaskStreamingResponse, loads(sse.data))
+                    yield response
+                    if response.error or (response.result and response.result.get("final")):
+                        return
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"HTTP error: {e.response.status_code} - {e}")
     
     async def get_task(self, payload: Dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
-        return GetTaskResponse.model_validate(await self._send_request(request))
+        return self._parse(GetTaskResponse, await self._send_request(request))
+    
+    async def refresh_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Bring a previously fetched task up to date, transferring only what changed.
+        
+        ``task`` is a task dict as returned in a ``result``; a new dict with any
+        new messages and artifacts appended is returned.
+        """
+        response = await self.get_task({
+            "taskId": task["id"],
+            "historyFrom": len(task.get("messages", [])),
+            "artifactsFrom": len(task.get("artifacts", [])),
+            "sinceVersion": task.get("version", 0)
+        })
+        if response.error:
+            raise Exception(f"Failed to refresh task: {response.error.get('message')}")
+        
+        update = response.result["task"]
+        delta = response.result.get("delta") or {"messagesFrom": 0, "artifactsFrom": 0}
+        merged = dict(update)
+        merged["messages"] = task.get("messages", [])[:delta["messagesFrom"]] + update.get("messages", [])
+        merged["artifacts"] = task.get("artifacts", [])[:delta["artifactsFrom"]] + update.get("artifacts", [])
+        return merged
     
     async def cancel_task(self, payload: Dict[str, Any]) -> CancelTaskResponse:
         request = CancelTaskRequest(params=payload)
-        return CancelTaskResponse.model_validate(await self._send_request(request))
+        return self._parse(CancelTaskResponse, await self._send_request(request))
+    
+    async def set_push_notification(
+        self, task_id: str, url: str, token: Optional[str] = None
+    ) -> SetTaskPushNotificationResponse:
+        """Have the agent POST the task's state changes to ``url`` instead of being polled.
+        
+        To subscribe before the task starts, put the same config in the
+        ``pushNotification`` field of the tasks/send payload instead.
+        """
+        config = {"url": url}
+        if token is not None:
+            config["token"] = token
+        request = SetTaskPushNotificationRequest(params={"taskId": task_id, "pushNotificationConfig": config})
+        return self._parse(SetTaskPushNotificationResponse, await self._send_request(request))
+    
+    async def get_push_notification(self, task_id: str) -> GetTaskPushNotificationResponse:
+        request = GetTaskPushNotificationRequest(params={"taskId": task_id})
+        return self._parse(GetTaskPushNotificationResponse, await self._send_request(request))
+    
+    def _parse(self, response_type: Type[R], data: Dict[str, Any]) -> R:
+        if self.validate:
+            return response_type.model_validate(data)
+        return response_type.model_construct(**data)
+    
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        # Continue the caller's trace, if any, on the receiving agent
+        traceparent = current_traceparent()
+        if traceparent is not None:
+            headers["traceparent"] = traceparent
+        # Tell the agent how long the caller will wait
+        budget = deadline_header_value()
+        if budget is not None:
+            headers[DEADLINE_HEADER] = budget
+        return headers
     
     async def _send_request(self, request: JSONRPCRequest) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=30
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"HTTP error: {e.response.status_code} - {e}")
-            except json.JSONDecodeError as e:
-                raise Exception(f"JSON parse error: {e}")
+        latency = self._latency.get(request.method)
+        if latency is None:
+            latency = self._latency[request.method] = CLIENT_REQUEST_DURATION.labels(self.url, request.method)
+        
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            CLIENT_ERRORS.labels(self.url, request.method).inc()
+            raise CircuitOpenError(f"Circuit open for {self.url}; not sending {request.method}")
+        
+        # Never wait longer than the caller's remaining budget
+        timeout = self.timeout if self.timeout is not None else get_transport_config().timeout
+        budget = remaining()
+        if budget is not None:
+            if budget <= 0:
+                if breaker is not None:
+                    breaker.record(None)
+                CLIENT_ERRORS.labels(self.url, request.method).inc()
+                raise DeadlineExceeded(f"Deadline passed before calling {self.url}")
+            timeout = min(timeout, budget)
+        
+        local = get_local_agent(self.url)
+        started = time.perf_counter()
+        # None while undecided, e.g. if the call is cancelled
+        success = None
+        try:
+            if local is not None:
+                # Hosted in this process: hand the request over without HTTP or JSON
+                with span(f"a2a.client {request.method}", target=self.url, transport="local"):
+                    data = await asyncio.wait_for(local.call_local(request), timeout)
+            else:
+                with span(f"a2a.client {request.method}", target=self.url):
+                    response = await get_http_client().post(
+                        self.url,
+                        content=request.model_dump_json(),
+                        headers=self._headers(),
+                        timeout=timeout,
+                    )
+                    response.raise_for_status()
+                    data = loads(response.content)
+            error = data.get("error") if isinstance(data, dict) else None
+            success = error is None or error.get("code") not in BREAKER_ERROR_CODES
+            if error is None:
+                self._recent.add(time.perf_counter() - started)
+            else:
+                CLIENT_ERRORS.labels(self.url, request.method).inc()
+            return data
+        except (httpx.TimeoutException, asyncio.TimeoutError) as e:
+            success = False
+            CLIENT_ERRORS.labels(self.url, request.method).inc()
+            if budget is not None and timeout == budget:
+                raise DeadlineExceeded(f"No response from {self.url} within the deadline") from e
+            raise
+        except httpx.HTTPStatusError as e:
+            success = e.response.status_code < 500
+            CLIENT_ERRORS.labels(self.url, request.method).inc()
+            raise Exception(f"HTTP error: {e.response.status_code} - {e}")
+        except json.JSONDecodeError as e:
+            success = False
+            CLIENT_ERRORS.labels(self.url, request.method).inc()
+            raise Exception(f"JSON parse error: {e}")
+        except Exception:
+            success = False
+            CLIENT_ERRORS.labels(self.url, request.method).inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+            if breaker is not None:
+                breaker.record(success)
 
 
 async def get_agent_card(url: str) -> AgentCard:
     """Fetch an agent card from the well-known URL."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{url}/.well-known/agent.json")
-            response.raise_for_status()
-            data = response.json()
-            return AgentCard.model_validate(data)
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"Failed to get agent card: {e.response.status_code} - {e}")
-        except json.JSONDecodeError as e:
-            raise Exception(f"Failed to parse agent card: {e}")
+    local = get_local_agent(url)
+    if local is not None:
+        return local.agent_card
+    client = get_http_client()
+    try:
+        response = await client.get(f"{url}/.well-known/agent.json")
+        response.raise_for_status()
+        data = response.json()
+        return AgentCard.model_validate(data)
+    except httpx.HTTPStatusError as e:
+        raise Exception(f"Failed to get agent card: {e.response.status_code} - {e}")
+    except json.JSONDecodeError as e:
+        raise Exception(f"Failed to parse agent card: {e}")
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+from common.transport import get_http_client, get_local_agent
+from common.types import AgentCard
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+@dataclass
+class _CacheEntry:
+    card: Optional[AgentCard]
+    etag: Optional[str]
+    expires: float
+    error: Optional[str] = None
+
+
+class AgentCardCache:
+    """In-memory cache of agent cards keyed by agent base URL.
+
+    Fresh cards are served from memory. Once a card is older than ``ttl`` it is
+    still served, and a conditional GET (``If-None-Match``) revalidates it in
+    the background. Failed lookups are remembered for ``error_ttl`` seconds;
+    a failed revalidation keeps the cached card and retries after that long.
+    Concurrent lookups of the same URL share a single request. ``start()``
+    keeps the known agents refreshed periodically so that a restarted agent is
+    picked up without any request having to wait for it.
+    """
+
+    def __init__(self, ttl: float = 60.0, error_ttl: float = 5.0, refresh_interval: Optional[float] = None):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.refresh_interval = refresh_interval if refresh_interval is not None else ttl / 2
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    async def get(self, url: str) -> AgentCard:
+        """Return the card for ``url``, fetching it only if nothing usable is cached."""
+        entry = self._entries.get(url)
+        now = time.monotonic()
+        if entry is not None and entry.card is not None:
+            self.hits += 1
+            if entry.expires <= now:
+                self._fetch(url)
+            return entry.card
+        if entry is not None and entry.error is not None and entry.expires > now:
+            self.hits += 1
+            raise Exception(entry.error)
+        self.misses += 1
+        return await asyncio.shield(self._fetch(url))
+
+    def peek(self, url: str) -> Optional[AgentCard]:
+        """Return the cached card for ``url``, even if stale, without fetching it."""
+        entry = self._entries.get(url)
+        return entry.card if entry is not None else None
+
+    async def get_many(self, urls: Iterable[str]) -> List[Union[AgentCard, Exception]]:
+        """Look up several agents concurrently; failures are returned, not raised."""
+        return await asyncio.gather(*(self.get(url) for url in urls), return_exceptions=True)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+    def start(self, urls: Iterable[str]) -> None:
+        """Begin refreshing ``urls`` in the background every ``refresh_interval`` seconds."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_forever(list(urls)))
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def _refresh_forever(self, urls: List[str]) -> None:
+        while True:
+            await asyncio.gather(*(self._fetch(url) for url in urls), return_exceptions=True)
+            await asyncio.sleep(self.refresh_interval)
+
+    def _fetch(self, url: str) -> asyncio.Task:
+        """Start (or join) the single in-flight request for ``url``."""
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._load(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+            # Background revalidations may finish with nobody awaiting them
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _load(self, url: str) -> AgentCard:
+        local = get_local_agent(url)
+        if local is not None:
+            # Hosted in this process: its card is already in memory
+            self._entries[url] = _CacheEntry(local.agent_card, None, time.monotonic() + self.ttl)
+            return local.agent_card
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is not None and entry.card is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        try:
+            response = await get_http_client().get(f"{url}{AGENT_CARD_PATH}", headers=headers)
+            if response.status_code == 304 and entry is not None and entry.card is not None:
+                self.revalidated += 1
+                entry.expires = time.monotonic() + self.ttl
+                return entry.card
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except Exception as e:
+            message = f"Failed to get agent card: {str(e) or type(e).__name__}"
+            entry = self._entries.get(url)
+            if entry is not None and entry.card is not None:
+                # Keep serving the last good card (e.g. while the agent restarts) and retry later
+                entry.expires = time.monotonic() + self.error_ttl
+            else:
+                self._entries[url] = _CacheEntry(None, None, time.monotonic() + self.error_ttl, message)
+            raise Exception(message)
+        self._entries[url] = _CacheEntry(card, response.headers.get("etag"), time.monotonic() + self.ttl)
+        return card
@@ -0,0 +1,176 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from common.metrics import EXECUTOR_IN_FLIGHT, EXECUTOR_QUEUE_WAIT, EXECUTOR_REJECTED, EXECUTOR_RUN_TIME
+
+# Each worker thread/process keeps one event loop for running async handlers
+_worker_state = threading.local()
+_worker_loops: List[Tuple[threading.Thread, asyncio.AbstractEventLoop]] = []
+
+
+def _run_handler(
+    handler: Callable[[Any], Awaitable[Any]], payload: Any, submitted: float
+) -> Tuple[Any, float, float]:
+    """Worker entry point: run one handler and report (result, queue wait, run time)."""
+    started = time.monotonic()
+    loop = getattr(_worker_state, "loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _worker_state.loop = loop
+        _worker_loops.append((threading.current_thread(), loop))
+    result = loop.run_until_complete(handler(payload))
+    return result, started - submitted, time.monotonic() - started
+
+
+class ExecutorBusy(Exception):
+    """Raised when the executor's queue is full; the caller should retry later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server busy, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class _HandlerStats:
+    __slots__ = (
+        "calls", "rejected", "queue_wait_total", "queue_wait_max", "run_time_total", "run_time_max",
+        "queue_wait_series", "run_time_series", "rejected_series",
+    )
+
+    def __init__(self, agent: str, handler: str):
+        self.calls = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+        self.run_time_max = 0.0
+        # The same measurements for /metrics
+        self.queue_wait_series = EXECUTOR_QUEUE_WAIT.labels(agent, handler)
+        self.run_time_series = EXECUTOR_RUN_TIME.labels(agent, handler)
+        self.rejected_series = EXECUTOR_REJECTED.labels(agent, handler)
+
+    def record(self, queue_wait: float, run_time: float) -> None:
+        self.calls += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.run_time_total += run_time
+        self.run_time_max = max(self.run_time_max, run_time)
+        self.queue_wait_series.observe(queue_wait)
+        self.run_time_series.observe(run_time)
+
+    def reject(self) -> None:
+        self.rejected += 1
+        self.rejected_series.inc()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "queue_wait_avg": self.queue_wait_total / self.calls if self.calls else 0.0,
+            "queue_wait_max": self.queue_wait_max,
+            "run_time_avg": self.run_time_total / self.calls if self.calls else 0.0,
+            "run_time_max": self.run_time_max,
+        }
+
+
+class HandlerExecutor:
+    """Runs task handlers on a thread or process pool instead of the event loop.
+
+    At most ``max_workers`` handlers run at once and at most ``max_queue`` more
+    wait for a worker; beyond that ``run`` raises ExecutorBusy straight away so
+    the server can shed load. Handlers must not depend on the server's event
+    loop (e.g. the shared HTTP client), since they run on a worker's own loop.
+    In ``process`` mode the handler and task must be picklable, so the
+    handler has to be a module-level function.
+
+    Queue wait, run time, rejections and calls in flight are exported to
+    ``common.metrics.REGISTRY`` under the agent name given to ``bind()``,
+    which A2AServer calls with its card's name.
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None, max_queue: int = 64):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.max_queue = max_queue
+        self._pool: Optional[Executor] = None
+        self._in_flight = 0
+        self._stats: Dict[str, _HandlerStats] = {}
+        self.agent = ""
+
+    def bind(self, agent: str) -> None:
+        """Label this executor's metrics with ``agent``."""
+        self.agent = agent
+        EXECUTOR_IN_FLIGHT.labels(agent).set_function(lambda: self._in_flight)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="a2a-handler")
+        return self._pool
+
+    @property
+    def full(self) -> bool:
+        return self._in_flight >= self.max_workers + self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up, at least one."""
+        run_time = sum(s.run_time_total for s in self._stats.values())
+        calls = sum(s.calls for s in self._stats.values())
+        average = run_time / calls if calls else 1.0
+        return max(1, math.ceil(average * self._in_flight / self.max_workers))
+
+    async def run(self, handler: Callable[[Any], Awaitable[Any]], payload: Any) -> Any:
+        """Run ``handler(payload)`` on the pool, e.g. a task or a list of tasks."""
+        name = getattr(handler, "__qualname__", repr(handler))
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _HandlerStats(self.agent, name)
+        if self.full:
+            stats.reject()
+            raise ExecutorBusy(self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        future = self._get_pool().submit(_run_handler, handler, payload, time.monotonic())
+        self._in_flight += 1
+        # A caller that gives up (e.g. on a deadline) does not stop the worker, so the
+        # slot is only freed, and the call recorded, once the worker is really done
+        def done(future: Future) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._finished, stats, future)
+
+        future.add_done_callback(done)
+        result, _, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finished(self, stats: _HandlerStats, future: Future) -> None:
+        self._in_flight -= 1
+        if not future.cancelled() and future.exception() is None:
+            _, queue_wait, run_time = future.result()
+            stats.record(queue_wait, run_time)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "handlers": {name: s.as_dict() for name, s in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        # Close the loops of worker threads that have exited
+        for thread, loop in list(_worker_loops):
+            if not thread.is_alive():
+                _worker_loops.remove((thread, loop))
+                loop.close()
@@ -0,0 +1,83 @@
+"""Serve several agents from one process and one event loop.
+
+Usage: python -m common.host [agent module ...]
+
+Each agent still listens on the port in its card URL, so remote callers and
+the web UI work as before. Calls between the hosted agents (such as the
+coordinator's hops) go straight to the target A2AServer through
+register_local_agent() instead of over HTTP.
+"""
+import asyncio
+import importlib
+import signal
+import sys
+from contextlib import contextmanager
+from typing import List, Sequence
+from urllib.parse import urlparse
+
+import uvicorn
+
+from common.server import A2AServer
+from common.transport import register_local_agent, unregister_local_agent
+
+# Modules of the demo agents; each defines a module-level ``server``
+DEFAULT_AGENTS = (
+    "agents.calculator.agent",
+    "agents.translator.agent",
+    "agents.weather.agent",
+    "agents.timer.agent",
+    "agents.coordinator.agent",
+)
+
+
+class _HostedServer(uvicorn.Server):
+    """A uvicorn server that leaves signal handling to serve_agents()."""
+
+    def install_signal_handlers(self) -> None:
+        pass
+
+    @contextmanager
+    def capture_signals(self):
+        yield
+
+
+def load_servers(modules: Sequence[str] = DEFAULT_AGENTS) -> List[A2AServer]:
+    """Import agent modules and return their A2AServer instances."""
+    return [importlib.import_module(module).server for module in modules]
+
+
+async def serve_agents(servers: Sequence[A2AServer], host: str = "0.0.0.0") -> None:
+    """Serve ``servers`` on their card ports until SIGINT/SIGTERM, routing calls between them in-process."""
+    uvicorn_servers = []
+    for server in servers:
+        register_local_agent(server)
+        port = urlparse(server.agent_card.url).port
+        config = uvicorn.Config(server.app, host=host, port=port, lifespan="on")
+        uvicorn_servers.append(_HostedServer(config))
+
+    def stop() -> None:
+        for uvicorn_server in uvicorn_servers:
+            uvicorn_server.should_exit = True
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop)
+        except NotImplementedError:
+            # Windows: Ctrl+C still raises KeyboardInterrupt
+            pass
+    try:
+        await asyncio.gather(*(uvicorn_server.serve() for uvicorn_server in uvicorn_servers))
+    finally:
+        for server in servers:
+            unregister_local_agent(server.agent_card.url)
+
+
+def main(argv: List[str]) -> None:
+    servers = load_servers(argv or DEFAULT_AGENTS)
+    print(f"Hosting {len(servers)} agents in one process: " + ", ".join(s.agent_card.name for s in servers))
+    asyncio.run(serve_agents(servers))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
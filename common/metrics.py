@@ -0,0 +1,344 @@
+import bisect
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond handlers to slow outbound calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value when metrics are scraped instead of on every change."""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per upper bound plus a final +Inf slot; made cumulative at render time
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    """A named metric family whose children are keyed by label values."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child for these label values, creating it on first use.
+
+        Hot paths should look children up once and keep them, so that recording
+        a sample is a plain attribute update.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        self._children.pop(values, None)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ] + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            try:
+                value = child.get()
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """A set of metric families rendered together in the Prometheus text format.
+
+    Recording is lock-free: samples are plain attribute updates made from the
+    event loop, and rendering only reads them.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; every A2AServer's /metrics endpoint renders it
+REGISTRY = MetricsRegistry()
+
+# Outbound A2AClient calls, shared by all clients in the process
+CLIENT_REQUEST_DURATION = REGISTRY.histogram(
+    "a2a_client_request_duration_seconds",
+    "Latency of outbound A2A JSON-RPC calls by target agent and method.",
+    ("target", "method"),
+)
+CLIENT_ERRORS = REGISTRY.counter(
+    "a2a_client_errors_total",
+    "Outbound A2A calls that failed at the transport level or returned a JSON-RPC error.",
+    ("target", "method"),
+)
+
+# JSON-RPC methods with their own series; anything else is recorded as "other"
+RPC_METHODS = (
+    "tasks/get", "tasks/send", "tasks/sendBatch", "tasks/cancel", "tasks/sendSubscribe",
+    "tasks/pushNotification/set", "tasks/pushNotification/get",
+)
+
+# Encoding a response is usually far below a millisecond
+SERIALIZATION_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+
+
+class ServerMetrics:
+    """The metric series of one A2AServer, labelled with its agent name.
+
+    Children are bound up front so the request path records samples without
+    building label tuples. Skill labels are limited to the card's skill ids
+    plus ``default`` (no classifier), ``other`` and ``batch``.
+    """
+
+    def __init__(self, agent: str, skills: Sequence[str] = (), registry: MetricsRegistry = REGISTRY):
+        self.agent = agent
+        request_duration = registry.histogram(
+            "a2a_request_duration_seconds",
+            "Time to answer a JSON-RPC request by method, excluding the body of streamed responses.",
+            ("agent", "method"),
+        )
+        self._request_duration = {method: request_duration.labels(agent, method) for method in RPC_METHODS + ("other",)}
+        self._errors = registry.counter(
+            "a2a_rpc_errors_total",
+            "JSON-RPC error responses by method and error code.",
+            ("agent", "method", "code"),
+        )
+        handler_duration = registry.histogram(
+            "a2a_handler_duration_seconds",
+            "Time spent in the agent's task handler by skill.",
+            ("agent", "skill"),
+        )
+        self._handler_duration = {
+            skill: handler_duration.labels(agent, skill) for skill in tuple(skills) + ("default", "other", "batch")
+        }
+        serialization = registry.histogram(
+            "a2a_serialization_duration_seconds",
+            "Time spent decoding requests and encoding responses.",
+            ("agent", "phase"),
+            buckets=SERIALIZATION_BUCKETS,
+        )
+        self.decode = serialization.labels(agent, "decode")
+        self.encode = serialization.labels(agent, "encode")
+        self.in_flight = registry.gauge(
+            "a2a_requests_in_flight", "JSON-RPC requests currently being handled.", ("agent",)
+        ).labels(agent)
+        self.store_entries = registry.gauge(
+            "a2a_task_store_entries", "Tasks held by the agent's task store.", ("agent",)
+        ).labels(agent)
+        self.store_bytes = registry.gauge(
+            "a2a_task_store_bytes", "Approximate size of the agent's task store in bytes.", ("agent",)
+        ).labels(agent)
+
+    def method_label(self, method) -> str:
+        return method if method in self._request_duration else "other"
+
+    def observe_request(self, method, duration: float, error_code=None) -> None:
+        label = self.method_label(method)
+        self._request_duration[label].observe(duration)
+        if error_code is not None:
+            self._errors.labels(self.agent, label, str(error_code)).inc()
+
+    def count_error(self, method, error_code) -> None:
+        self._errors.labels(self.agent, self.method_label(method), str(error_code)).inc()
+
+    def handler_duration(self, skill: str) -> _HistogramChild:
+        return self._handler_duration.get(skill) or self._handler_duration["other"]
+
+# Per-target circuit breakers and hedged requests (common/resilience.py)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "a2a_circuit_state",
+    "Circuit breaker state by target agent: 0 closed, 1 half-open, 2 open.",
+    ("target",),
+)
+CIRCUIT_REJECTED = REGISTRY.counter(
+    "a2a_circuit_rejected_total",
+    "Outbound calls failed fast because the target's circuit was open.",
+    ("target",),
+)
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    "a2a_circuit_transitions_total",
+    "Circuit breaker state changes by target agent and new state.",
+    ("target", "state"),
+)
+CLIENT_HEDGES = REGISTRY.counter(
+    "a2a_client_hedges_total",
+    "Hedged second requests sent, and how many of them answered first.",
+    ("target", "outcome"),
+)
+
+# Worker pools running task handlers off the event loop (common/executor.py)
+EXECUTOR_QUEUE_WAIT = REGISTRY.histogram(
+    "a2a_executor_queue_wait_seconds",
+    "Time handler calls waited for a free executor worker, by agent and handler.",
+    ("agent", "handler"),
+)
+EXECUTOR_RUN_TIME = REGISTRY.histogram(
+    "a2a_executor_run_seconds",
+    "Time handler calls ran on an executor worker, by agent and handler.",
+    ("agent", "handler"),
+)
+EXECUTOR_REJECTED = REGISTRY.counter(
+    "a2a_executor_rejected_total",
+    "Handler calls turned away because the executor's queue was full.",
+    ("agent", "handler"),
+)
+EXECUTOR_IN_FLIGHT = REGISTRY.gauge(
+    "a2a_executor_in_flight",
+    "Handler calls running or queued on the agent's executor, including ones their caller gave up on.",
+    ("agent",),
+)
@@ -0,0 +1,231 @@
+import asyncio
+import sys
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+from common.metrics import REGISTRY
+from common.serialization import dumps, loads
+from common.transport import get_http_client
+from common.types import PushNotificationConfig
+
+# Header carrying the token the subscriber registered, if any
+TOKEN_HEADER = "X-A2A-Notification-Token"
+
+PUSH_NOTIFICATIONS = REGISTRY.counter(
+    "a2a_push_notifications_total",
+    "Push notifications by outcome (delivered, retried, failed, dropped).",
+    ("outcome",),
+)
+PUSH_REQUESTS = REGISTRY.counter(
+    "a2a_push_requests_total",
+    "Webhook POSTs made to deliver push notifications, by HTTP status class or error.",
+    ("status",),
+)
+PUSH_PENDING = REGISTRY.gauge(
+    "a2a_push_pending", "Push notifications accepted but not yet delivered or given up on, across all agents."
+)
+# Every live notifier (one per agent in an in-process host); the gauge reports their total
+_NOTIFIERS: "weakref.WeakSet[PushNotifier]" = weakref.WeakSet()
+PUSH_PENDING.labels().set_function(lambda: sum(notifier._pending for notifier in list(_NOTIFIERS)))
+
+
+class _Endpoint:
+    """Delivery state of one callback URL (and token)."""
+    __slots__ = ("url", "token", "pending", "flusher", "semaphore", "active")
+
+    def __init__(self, url: str, token: Optional[str], max_concurrency: int):
+        self.url = url
+        self.token = token
+        self.pending: List[Dict[str, Any]] = []
+        self.flusher: Optional[asyncio.Task] = None
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+
+
+class PushNotifier:
+    """Delivers task notifications to webhook URLs in the background.
+
+    ``notify()`` never waits. It buffers the event for its endpoint and
+    returns False (counting a drop) once ``max_pending`` notifications are
+    outstanding across all endpoints. Events for the same endpoint that arrive
+    within ``linger`` seconds are POSTed together as one JSON array of up to
+    ``batch_size`` events, with at most ``max_concurrency`` POSTs in flight per
+    endpoint. Failed POSTs (network errors, 429 and 5xx) are retried up to
+    ``max_retries`` times with exponential backoff; other 4xx answers are not.
+    Batches to one endpoint may arrive out of order, so every event carries
+    the task ``version``.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 10_000,
+        batch_size: int = 50,
+        linger: float = 0.01,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        timeout: float = 5.0,
+    ):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self._endpoints: Dict[tuple, _Endpoint] = {}
+        self._deliveries: Set[asyncio.Task] = set()
+        self._pending = 0
+        self._delivered = PUSH_NOTIFICATIONS.labels("delivered")
+        self._retried = PUSH_NOTIFICATIONS.labels("retried")
+        self._failed = PUSH_NOTIFICATIONS.labels("failed")
+        self._dropped = PUSH_NOTIFICATIONS.labels("dropped")
+        _NOTIFIERS.add(self)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def notify(self, config: PushNotificationConfig, event: Dict[str, Any]) -> bool:
+        """Queue ``event`` for delivery to ``config.url``; False if it had to be dropped."""
+        if self._pending >= self.max_pending:
+            self._dropped.inc()
+            return False
+        key = (config.url, config.token)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = _Endpoint(config.url, config.token, self.max_concurrency)
+        endpoint.pending.append(event)
+        self._pending += 1
+        if endpoint.flusher is None:
+            endpoint.flusher = asyncio.get_running_loop().create_task(self._flush(key, endpoint))
+        return True
+
+    async def _flush(self, key: tuple, endpoint: _Endpoint) -> None:
+        try:
+            # Let events that arrive together go out together
+            await asyncio.sleep(self.linger)
+            while endpoint.pending:
+                await endpoint.semaphore.acquire()
+                batch = endpoint.pending[:self.batch_size]
+                del endpoint.pending[:self.batch_size]
+                endpoint.active += 1
+                delivery = asyncio.get_running_loop().create_task(self._deliver(key, endpoint, batch))
+                self._deliveries.add(delivery)
+                delivery.add_done_callback(self._deliveries.discard)
+        finally:
+            endpoint.flusher = None
+            self._forget_if_idle(key, endpoint)
+
+    async def _deliver(self, key: tuple, endpoint: _Endpoint, batch: List[Dict[str, Any]]) -> None:
+        headers = {"Content-Type": "application/json"}
+        if endpoint.token:
+            headers[TOKEN_HEADER] = endpoint.token
+        body = dumps(batch)
+        try:
+            for attempt in range(self.max_retries + 1):
+                retry = True
+                try:
+                    response = await get_http_client().post(
+                        endpoint.url, content=body, headers=headers, timeout=self.timeout
+                    )
+                    PUSH_REQUESTS.labels(f"{response.status_code // 100}xx").inc()
+                    if response.status_code < 300:
+                        self._delivered.inc(len(batch))
+                        return
+                    retry = response.status_code >= 500 or response.status_code == 429
+                except httpx.HTTPError as e:
+                    PUSH_REQUESTS.labels(type(e).__name__).inc()
+                if not retry or attempt == self.max_retries:
+                    break
+                self._retried.inc(len(batch))
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+            self._failed.inc(len(batch))
+        finally:
+            self._pending -= len(batch)
+            endpoint.active -= 1
+            endpoint.semaphore.release()
+            self._forget_if_idle(key, endpoint)
+
+    def _forget_if_idle(self, key: tuple, endpoint: _Endpoint) -> None:
+        # Endpoints are only kept while they have work, so unique URLs cannot pile up
+        if not endpoint.pending and endpoint.flusher is None and endpoint.active == 0:
+            if self._endpoints.get(key) is endpoint:
+                del self._endpoints[key]
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Wait up to ``timeout`` seconds for outstanding deliveries, then cancel the rest."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # Flushers start new deliveries while we wait, so look again each round
+            work = [endpoint.flusher for endpoint in self._endpoints.values() if endpoint.flusher is not None]
+            work += list(self._deliveries)
+            if not work:
+                return
+            left = deadline - loop.time()
+            if left <= 0:
+                break
+            await asyncio.wait(work, timeout=left)
+        for task in work:
+            task.cancel()
+        await asyncio.gather(*work, return_exceptions=True)
+
+
+class NotificationReceiver:
+    """A stand-in webhook endpoint that records the notifications POSTed to it.
+
+    Serve ``receiver.app`` (e.g. ``python -m common.push 9000``) and register
+    its URL with tasks/pushNotification/set. ``wait_final(task_id)`` resolves
+    with the first final event for a task.
+    """
+
+    def __init__(self, token: Optional[str] = None, verbose: bool = False):
+        self.token = token
+        self.verbose = verbose
+        self.events: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.requests = 0
+        self._final: Dict[str, asyncio.Future] = {}
+        self.app = FastAPI()
+
+        @self.app.post("/")
+        async def receive(request: Request):
+            if self.token is not None and request.headers.get(TOKEN_HEADER) != self.token:
+                return Response(status_code=401)
+            self.requests += 1
+            body = loads(await request.body())
+            for event in body if isinstance(body, list) else [body]:
+                self.record(event)
+            return Response(status_code=204)
+
+    def record(self, event: Dict[str, Any]) -> None:
+        task_id = event.get("id")
+        self.events[task_id].append(event)
+        if self.verbose:
+            print(f"{task_id} v{event.get('version')} {event.get('state')}" + (" (final)" if event.get("final") else ""))
+        if event.get("final"):
+            future = self._final_future(task_id)
+            if not future.done():
+                future.set_result(event)
+
+    def _final_future(self, task_id: str) -> asyncio.Future:
+        future = self._final.get(task_id)
+        if future is None:
+            future = self._final[task_id] = asyncio.get_running_loop().create_future()
+        return future
+
+    async def wait_final(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await asyncio.wait_for(asyncio.shield(self._final_future(task_id)), timeout)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 9000
+    print(f"Receiving push notifications at http://localhost:{port}/")
+    uvicorn.run(NotificationReceiver(verbose=True).app, host="0.0.0.0", port=port, log_level="warning")
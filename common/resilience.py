@@ -0,0 +1,168 @@
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Optional
+
+from common.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+
+# Request header carrying the caller's remaining time budget in milliseconds
+DEADLINE_HEADER = "A2A-Timeout-Ms"
+
+# JSON-RPC error code for work abandoned because its deadline passed
+DEADLINE_EXCEEDED_CODE = -32004
+
+# Absolute deadline (time.monotonic()) of the work in progress, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("a2a_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of the current request has run out."""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an agent whose circuit breaker is open."""
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class _DeadlineScope:
+    __slots__ = ("timeout", "_token")
+
+    def __init__(self, timeout: Optional[float]):
+        self.timeout = timeout
+        self._token = None
+
+    def __enter__(self) -> Optional[float]:
+        current = _deadline.get()
+        deadline = current
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+            if current is not None:
+                deadline = min(deadline, current)
+        self._token = _deadline.set(deadline)
+        return deadline
+
+    def __exit__(self, *exc_info) -> bool:
+        try:
+            _deadline.reset(self._token)
+        except ValueError:
+            # Exited from another context, e.g. an async generator closed by the loop
+            pass
+        return False
+
+
+def deadline(timeout: Optional[float]) -> _DeadlineScope:
+    """Context manager limiting the enclosed work to ``timeout`` seconds.
+
+    An enclosing deadline that expires sooner still wins, so budgets only ever
+    shrink along a chain of calls. ``None`` keeps the current deadline.
+    """
+    return _DeadlineScope(timeout)
+
+
+def parse_deadline_header(value: Optional[str]) -> Optional[float]:
+    """Convert a DEADLINE_HEADER value to seconds; malformed values are ignored."""
+    if not value:
+        return None
+    try:
+        milliseconds = int(value)
+    except ValueError:
+        return None
+    return max(0, milliseconds) / 1000.0
+
+
+def deadline_header_value() -> Optional[str]:
+    """The DEADLINE_HEADER value for an outbound request, or None without a deadline."""
+    left = remaining()
+    if left is None:
+        return None
+    return str(max(0, int(left * 1000)))
+
+
+class CircuitBreaker:
+    """Stops calling an agent that keeps failing, then probes it to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. It then turns half-open and
+    lets up to ``half_open_probes`` calls through: a success closes it again,
+    a failure reopens it for another ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self, target: str, failure_threshold: int = 5, reset_timeout: float = 10.0, half_open_probes: int = 1
+    ):
+        self.target = target
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._state_gauge = CIRCUIT_STATE.labels(target)
+        self._state_gauge.set(0)
+        self._rejected = CIRCUIT_REJECTED.labels(target)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._state_gauge.set(self._STATE_VALUES[state])
+        CIRCUIT_TRANSITIONS.labels(self.target, state).inc()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; each allowed call must be settled with record()."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self._rejected.inc()
+                return False
+            self._transition(self.HALF_OPEN)
+            self._probes = 0
+        if self.state == self.HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self._rejected.inc()
+                return False
+            self._probes += 1
+        return True
+
+    def record(self, success: Optional[bool]) -> None:
+        """Settle an allowed call; ``None`` means it was abandoned (e.g. a cancelled hedge)."""
+        if self.state == self.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+        if success is None:
+            return
+        if success:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+            return
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+
+class LatencyTracker:
+    """Recent successful call latencies, used to pick a hedging delay."""
+
+    def __init__(self, window: int = 256):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float, default: float) -> float:
+        """The ``pct`` percentile of the window, or ``default`` until there are 20 samples."""
+        if len(self._samples) < 20:
+            return default
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
@@ -0,0 +1,245 @@
+import asyncio
+import math
+from itertools import chain
+from typing import Any, Callable, List, Optional, Set
+
+
+class Timer:
+    """A callback scheduled on a TimingWheel; cancel() it to stop it from firing."""
+    __slots__ = ("tick", "callback", "args", "_wheel", "_slot")
+
+    def __init__(self, wheel: "TimingWheel", tick: int, callback: Callable[..., Any], args: tuple):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self._wheel = wheel
+        self._slot: Optional[Set["Timer"]] = None
+
+    @property
+    def when(self) -> float:
+        """Loop time at which the timer is due."""
+        return self._wheel.time_of(self.tick)
+
+    @property
+    def pending(self) -> bool:
+        return self._slot is not None
+
+    def cancel(self) -> bool:
+        """Stop the timer; False if it already fired or was cancelled."""
+        return self._wheel.cancel(self)
+
+
+class TimingWheel:
+    """Hierarchical timing wheel running callbacks on an asyncio event loop.
+
+    Time is cut into ticks of ``resolution`` seconds. Level 0 has one slot per
+    tick for the next ``slots`` ticks, and each higher level has slots
+    ``slots`` times wider. A timer goes into the lowest level that covers its
+    deadline and moves down a level whenever the wheel below wraps around.
+    Insert and cancel are O(1) set operations, however many timers are
+    pending. The whole wheel needs a single ``loop.call_at`` handle, armed
+    for the next tick that has work, so timers due on the same tick cost one
+    wakeup between them.
+
+    Timers fire no earlier than their deadline and at most about one tick
+    after it, load permitting. Four levels of 256 slots at 10 ms cover about
+    16 months; longer delays are parked at the top level and re-placed.
+    """
+
+    def __init__(self, resolution: float = 0.01, slots: int = 256, levels: int = 4):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels: List[List[Set[Timer]]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._origin = 0.0
+        # Next tick to process; every earlier tick has been handled
+        self._current = 0
+        self._count = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._wake_tick: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._count:
+                raise RuntimeError("TimingWheel is already in use on another event loop")
+            self._loop = loop
+            self._origin = loop.time()
+            self._current = 0
+        return loop
+
+    def time_of(self, tick: int) -> float:
+        return self._origin + tick * self.resolution
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        """Run ``callback(*args)`` on the loop after ``delay`` seconds."""
+        loop = self._bind()
+        return self.call_at(loop.time() + delay, callback, *args)
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        """Run ``callback(*args)`` on the loop once ``loop.time()`` reaches ``when``."""
+        self._bind()
+        tick = max(self._current, math.ceil((when - self._origin) / self.resolution - 1e-9))
+        timer = Timer(self, tick, callback, args)
+        self._count += 1
+        self._arm(self._place(timer))
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        slot = timer._slot
+        if slot is None:
+            return False
+        slot.discard(timer)
+        timer._slot = None
+        self._count -= 1
+        if not self._count and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._wake_tick = None
+        return True
+
+    def _level_of(self, tick: int) -> int:
+        """The lowest level above which ``tick`` and the current tick agree."""
+        level = 0
+        while level < self.levels - 1 and (tick >> (self._bits * (level + 1))) != (
+            self._current >> (self._bits * (level + 1))
+        ):
+            level += 1
+        return level
+
+    def _place(self, timer: Timer) -> int:
+        """Put ``timer`` in its slot and return the tick at which the wheel must look at that slot."""
+        tick = max(timer.tick, self._current)
+        level = self._level_of(tick)
+        span = self._bits * level
+        index = (tick >> span) & self._mask
+        rotation = tick >> (span + self._bits)
+        current_rotation = self._current >> (span + self._bits)
+        if level == self.levels - 1 and rotation != current_rotation:
+            base = (self._current >> span) & self._mask
+            if rotation != current_rotation + 1 or index >= base:
+                # Beyond the top level's range: park it in a slot reached before it is due and re-place it from there
+                index = (base - 1) & self._mask
+        slot = self._wheels[level][index]
+        slot.add(timer)
+        timer._slot = slot
+        return self._slot_tick(level, index)
+
+    def _slot_tick(self, level: int, index: int) -> int:
+        # Level-0 slots fire at their tick; higher ones move down when the wheel below wraps into them
+        span = self._bits * level
+        rotation = (self._current >> (span + self._bits)) << (span + self._bits)
+        if index < (self._current >> span) & self._mask:
+            rotation += 1 << (span + self._bits)
+        return max(self._current, rotation + (index << span))
+
+    def _next_tick(self) -> Optional[int]:
+        """The next tick at which some slot needs processing, or None if the wheel is empty."""
+        earliest: Optional[int] = None
+        for level, wheel in enumerate(self._wheels):
+            span = self._bits * level
+            base = (self._current >> span) & self._mask
+            # A level's current slot is only filled while its cascade at the current tick is
+            # pending; its other slots come due no sooner than the level's next boundary
+            if earliest is not None and not wheel[base] and earliest <= ((self._current >> span) + 1) << span:
+                continue
+            for index in chain(range(base, self.slots), range(base)):
+                if wheel[index]:
+                    tick = self._slot_tick(level, index)
+                    if earliest is None or tick < earliest:
+                        earliest = tick
+                    break
+        return earliest
+
+    def _arm(self, tick: int) -> None:
+        if self._wake_tick is not None and self._wake_tick <= tick:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._wake_tick = tick
+        self._handle = self._loop.call_at(self.time_of(tick), self._on_wake)
+
+    def _on_wake(self) -> None:
+        self._handle = None
+        wake_tick = self._wake_tick
+        self._wake_tick = None
+        now = int((self._loop.time() - self._origin) / self.resolution + 1e-9)
+        self._advance(max(now, wake_tick))
+        tick = self._next_tick()
+        if tick is not None:
+            self._arm(tick)
+
+    def _advance(self, until: int) -> None:
+        """Process every tick up to and including ``until`` that has work, skipping the rest."""
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > until:
+                break
+            self._current = tick
+            self._cascade(tick)
+            index = tick & self._mask
+            slot = self._wheels[0][index]
+            # Timers added by the callbacks below land on later ticks
+            self._current = tick + 1
+            if not slot:
+                continue
+            self._wheels[0][index] = set()
+            # A callback may cancel timers of this slot that have not run yet
+            for timer in list(slot):
+                if timer._slot is not slot:
+                    continue
+                timer._slot = None
+                self._count -= 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    self._loop.call_exception_handler({
+                        "message": "Exception in TimingWheel callback",
+                        "exception": e,
+                        "timer": timer,
+                    })
+        self._current = max(self._current, until + 1)
+
+    def _cascade(self, tick: int) -> None:
+        # When the wheel below wraps, the matching slot of each level above moves down
+        for level in range(self.levels - 1, 0, -1):
+            span = self._bits * level
+            if tick & ((1 << span) - 1):
+                continue
+            index = (tick >> span) & self._mask
+            slot = self._wheels[level][index]
+            if not slot:
+                continue
+            self._wheels[level][index] = set()
+            if level == 1 and self.levels > 2:
+                # Below the top level nothing is parked, so a level-1 slot drops straight into level 0
+                level0, mask = self._wheels[0], self._mask
+                for timer in slot:
+                    target = level0[timer.tick & mask]
+                    target.add(timer)
+                    timer._slot = target
+                continue
+            for timer in slot:
+                self._place(timer)
+
+
+_scheduler: Optional[TimingWheel] = None
+_scheduler_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_scheduler() -> TimingWheel:
+    """Return the process-wide TimingWheel for the running loop, creating it on first use."""
+    global _scheduler, _scheduler_loop
+    loop = asyncio.get_running_loop()
+    if _scheduler is None or _scheduler_loop is not loop:
+        _scheduler = TimingWheel()
+        _scheduler_loop = loop
+    return _scheduler
@@ -0,0 +1,77 @@
+import json
+import secrets
+from typing import Any, List
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the standard library
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` to JSON bytes.
+
+    Pydantic models anywhere in ``content`` are written with
+    ``model_dump_json(exclude_none=True)`` and spliced into the output, so a
+    Task is serialized straight to bytes instead of going through an
+    intermediate dict and a second encoder. The placeholder each model is
+    encoded as first carries a random per-call token, so no string in
+    ``content`` (say a request id) can pass for one.
+    """
+    fragments: List[bytes] = []
+    token = secrets.token_hex(16)
+    placeholder = f"\x00{token}\x00"
+
+    def default(value: Any) -> str:
+        if isinstance(value, BaseModel):
+            fragments.append(value.model_dump_json(exclude_none=True).encode())
+            return placeholder
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    if orjson is not None:
+        encoded = orjson.dumps(content, default=default)
+    else:
+        encoded = json.dumps(content, default=default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    if not fragments:
+        return encoded
+    # Placeholders come out in the order the encoder asked for them
+    pieces = encoded.split(f'"\\u0000{token}\\u0000"'.encode())
+    if len(pieces) != len(fragments) + 1:
+        raise ValueError("JSON encoder output does not match the models it was given")
+    out = [pieces[0]]
+    for fragment, piece in zip(fragments, pieces[1:]):
+        out.append(fragment)
+        out.append(piece)
+    return b"".join(out)
+
+
+def to_plain(content: Any) -> Any:
+    """Copy ``content`` with pydantic models turned into the dicts dumps() would write.
+
+    Used for in-process calls, so callers see the same shapes as over HTTP
+    (and never share the agent's own Task objects) without encoding JSON.
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump(mode="json", exclude_none=True)
+    if isinstance(content, dict):
+        return {key: to_plain(value) for key, value in content.items()}
+    if isinstance(content, list):
+        return [to_plain(value) for value in content]
+    return content
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str; raises json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with dumps(), accepting pydantic models in its content."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
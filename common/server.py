@@ -1,8 +1,17 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Any, Dict, Optional, Callable, Awaitable, List
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
+from typing import Any, AsyncIterator, Dict, Optional, Callable, Awaitable, List, Union
+from collections import OrderedDict
+import asyncio
+import hashlib
 import json
+import os
+import time
 import uuid
+import uvicorn
+import warnings
 from common.types import (
     AgentCard,
     Task,
@@ -13,8 +22,55 @@ from common.types import (
     JSONRPCResponse,
     GetTaskRequest,
     SendTaskRequest,
-    CancelTaskRequest
+    SendTaskBatchRequest,
+    SendTaskStreamingRequest,
+    CancelTaskRequest,
+    GetTaskPushNotificationRequest,
+    PushNotificationConfig,
+    SetTaskPushNotificationRequest,
+    TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent
 )
+from common.executor import ExecutorBusy, HandlerExecutor
+from common.metrics import CONTENT_TYPE, REGISTRY, ServerMetrics
+from common.push import PushNotifier
+from common.resilience import (
+    DEADLINE_EXCEEDED_CODE,
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    deadline,
+    parse_deadline_header,
+    remaining,
+)
+from common.serialization import FastJSONResponse, dumps, loads, to_plain
+from common.task_store import TERMINAL_STATES, InMemoryTaskStore, TaskStore, task_store_from_env
+from common.tracing import InMemoryCollector, attach, current_context, get_exporter, server_span, span
+from common.transport import close_http_client
+
+
+class HistoryParamsError(ValueError):
+    """Raised for malformed historyFrom / artifactsFrom / sinceVersion params."""
+
+
+class PushNotSupported(Exception):
+    """Raised for push notification requests to an agent without the capability."""
+
+
+class PushConfigError(ValueError):
+    """Raised for a malformed push notification config."""
+
+
+# JSON-RPC error codes answered with HTTP 400 rather than 200
+INVALID_REQUEST_CODES = (-32700, -32600, -32601)
+
+# Upper bound on requests in one JSON-RPC batch array, and on tasks in one tasks/sendBatch call
+MAX_BATCH_SIZE = 1000
+
+# JSON-RPC error code for push notification calls to an agent without the capability
+PUSH_NOT_SUPPORTED_CODE = -32003
+
+# Tasks with a registered push notification URL; the oldest are forgotten beyond this
+MAX_PUSH_SUBSCRIPTIONS = 100_000
 
 
 class A2AServer:
@@ -22,185 +78,872 @@ class A2AServer:
         self,
         agent_card: AgentCard,
         task_handler: Callable[[Task], Awaitable[Task]],
+        task_store: Optional[TaskStore] = None,
+        stream_handler: Optional[Callable[[Task], AsyncIterator[Task]]] = None,
+        executor: Optional[HandlerExecutor] = None,
+        batch_handler: Optional[Callable[[List[Task]], Awaitable[List[Task]]]] = None,
+        skill_of: Optional[Callable[[Task], str]] = None,
+        push_notifier: Optional[PushNotifier] = None,
+        cancel_handler: Optional[Callable[[Task], Awaitable[None]]] = None,
     ):
         self.agent_card = agent_card
         self.task_handler = task_handler
-        self.tasks: Dict[str, Task] = {}
+        # Optional async generator that yields the task after each partial update
+        self.stream_handler = stream_handler
+        # Optional worker pool for CPU-bound handlers; None runs them on the event loop
+        self.executor = executor
+        if executor is not None:
+            executor.bind(agent_card.name)
+        # Optional handler that processes a whole tasks/sendBatch call in one pass
+        self.batch_handler = batch_handler
+        self.task_store = task_store if task_store is not None else task_store_from_env(agent_card.name)
+        # Optional function naming the card skill a task exercises, for per-skill metrics
+        self.skill_of = skill_of
+        # Optional hook run when tasks/cancel cancels a task, to stop its background work
+        self.cancel_handler = cancel_handler
+        # Skills whose completed answers callers may cache, and for how long
+        self.cache_ttls = {
+            skill.id: skill.cacheTtl for skill in agent_card.skills if skill.cacheable and skill.cacheTtl
+        }
+        # Webhook delivery for tasks/pushNotification/set, if the card advertises it
+        if push_notifier is None and agent_card.capabilities.pushNotifications:
+            push_notifier = PushNotifier()
+        self.push_notifier = push_notifier
+        # Push config and last notified state per subscribed task, dropped once it is final
+        self._push_subscriptions: "OrderedDict[str, List[Any]]" = OrderedDict()
+        # Update queues of open streams, by task id, fed by every save of that task
+        self._followers: Dict[str, List[asyncio.Queue]] = {}
+        self.metrics = ServerMetrics(agent_card.name, [skill.id for skill in agent_card.skills])
+        self.metrics.store_entries.set_function(lambda: self.task_store.stats()["entries"])
+        self.metrics.store_bytes.set_function(lambda: self.task_store.stats()["bytes"])
         self.app = FastAPI()
+        # Set once startup hooks have run, cleared when shutdown begins
+        self.ready = False
+        self.started_at: Optional[float] = None
+        
+        @self.app.on_event("startup")
+        async def startup():
+            self.started_at = time.time()
+            self.ready = True
+        
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            self.ready = False
+            # Deliver outstanding notifications, then release pooled connections and flush the store
+            if self.push_notifier is not None:
+                await self.push_notifier.close()
+            await close_http_client()
+            await self.task_store.close()
+            if self.executor is not None:
+                self.executor.shutdown()
         
         @self.app.get("/.well-known/agent.json")
-        async def get_agent_card():
-            return self.agent_card.model_dump(exclude_none=True)
+        async def get_agent_card(request: Request):
+            body = self.agent_card.model_dump_json(exclude_none=True)
+            etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+        
+        @self.app.get("/healthz")
+        async def get_health():
+            # Readiness probe: 200 once the agent accepts tasks, 503 while shutting down
+            content = {
+                "status": "ok" if self.ready else "unavailable",
+                "agent": self.agent_card.name,
+                "uptime": round(time.time() - self.started_at, 3) if self.started_at else 0.0
+            }
+            return FastJSONResponse(status_code=200 if self.ready else 503, content=content)
+        
+        @self.app.get("/metrics")
+        async def get_metrics():
+            return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+        
+        @self.app.get("/traces")
+        async def get_traces(traceId: Optional[str] = None):
+            # Spans recorded by this process when A2A_TRACE=memory
+            collector = get_exporter()
+            if not isinstance(collector, InMemoryCollector):
+                return FastJSONResponse(status_code=404, content={"error": "In-memory tracing is not enabled"})
+            spans = collector.get_trace(traceId) if traceId else list(collector.spans)
+            return FastJSONResponse(content={"spans": [s.to_dict() for s in spans]})
         
         @self.app.post("/")
         async def handle_request(request: Request):
+            self.metrics.in_flight.inc()
             try:
-                body = await request.json()
-                
-                # Parse JSON-RPC request
-                if "method" not in body:
-                    return JSONResponse(
-                        status_code=400,
-                        content={"jsonrpc": "2.0", "error": {"code": -32600, "message": "Invalid Request"}, "id": None}
-                    )
-                
-                method = body["method"]
-                
-                if method == "tasks/get":
-                    return await self._handle_get_task(body)
-                elif method == "tasks/send":
-                    return await self._handle_send_task(body)
-                elif method == "tasks/cancel":
-                    return await self._handle_cancel_task(body)
-                else:
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "jsonrpc": "2.0",
-                            "error": {"code": -32601, "message": f"Method '{method}' not found"},
-                            "id": body.get("id")
-                        }
-                    )
-            except json.JSONDecodeError:
-                return JSONResponse(
-                    status_code=400,
-                    content={"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}, "id": None}
-                )
-            except Exception as e:
-                return JSONResponse(
-                    status_code=500,
-                    content={
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-                        "id": body.get("id", None)
-                    }
-                )
+                # Honor the caller's remaining time budget, if it sent one
+                budget = parse_deadline_header(request.headers.get(DEADLINE_HEADER))
+                with server_span("a2a.server", request.headers.get("traceparent"), agent=self.agent_card.name), \
+                        deadline(budget):
+                    return await self._handle_request(request)
+            finally:
+                self.metrics.in_flight.dec()
     
-    async def _handle_get_task(self, request_data: Dict[str, Any]) -> JSONResponse:
+    async def call_local(self, request: JSONRPCRequest) -> Dict[str, Any]:
+        """Answer a request from an A2AClient in this process, without HTTP or JSON.
+        
+        The request model is dispatched as-is and the response comes back in
+        the shape it has on the wire. The caller's trace and deadline are
+        already current, since the call runs in the caller's own task.
+        """
+        self.metrics.in_flight.inc()
         try:
-            request = GetTaskRequest.model_validate(request_data)
-            task_id = request.params.get("taskId")
-            
-            if not task_id or task_id not in self.tasks:
-                return JSONResponse(
-                    content={
+            with span("a2a.server", agent=self.agent_card.name, transport="local"):
+                body = {"jsonrpc": request.jsonrpc, "method": request.method, "params": request.params, "id": request.id}
+                try:
+                    response = await self._dispatch(body)
+                except ExecutorBusy as e:
+                    response = self._busy_error(e.retry_after, request.id)
+                except Exception as e:
+                    response = {
                         "jsonrpc": "2.0",
-                        "error": {"code": -32001, "message": "Task not found"},
+                        "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
                         "id": request.id
                     }
-                )
+                return to_plain(response)
+        finally:
+            self.metrics.in_flight.dec()
+    
+    async def stream_local(self, request: JSONRPCRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Like call_local() for tasks/sendSubscribe: yield each update event as a response."""
+        started = time.perf_counter()
+        if self.stream_handler is None and self.executor is not None and self.executor.full:
+            self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started, -32000)
+            yield self._busy_error(self.executor.retry_after(), request.id)
+            return
+        try:
+            task = await self._prepare_task(request.params)
+        except Exception as e:
+            self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started, -32603)
+            yield {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request.id
+            }
+            return
+        self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started)
+        
+        with span("stream", agent=self.agent_card.name, transport="local"):
+            async for payload in self._stream_events(task):
+                yield {"jsonrpc": "2.0", "result": to_plain(payload), "id": request.id}
+        
+    async def _handle_request(self, request: Request):
+        raw = await request.body()
+        started = time.perf_counter()
+        try:
+            with span("parse", bytes=len(raw)):
+                body = loads(raw)
+        except json.JSONDecodeError:
+            self.metrics.count_error(None, -32700)
+            return self._json_response(
+                status_code=400,
+                content={"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}, "id": None}
+            )
+        self.metrics.decode.observe(time.perf_counter() - started)
+        
+        # JSON-RPC 2.0 batch: an array of requests answered with an array of responses
+        if isinstance(body, list):
+            return await self._handle_batch(body)
+        
+        try:
+            if isinstance(body, dict) and body.get("method") == "tasks/sendSubscribe":
+                return await self._handle_send_task_subscribe(body)
             
-            return JSONResponse(
+            response = await self._dispatch(body)
+            status_code = 400 if response.get("error", {}).get("code") in INVALID_REQUEST_CODES else 200
+            return self._json_response(status_code=status_code, content=response)
+        except ExecutorBusy as e:
+            return self._busy_response(e.retry_after, body.get("id"))
+        except Exception as e:
+            return self._json_response(
+                status_code=500,
                 content={
                     "jsonrpc": "2.0",
-                    "result": {"task": self.tasks[task_id].model_dump(exclude_none=True)},
-                    "id": request.id
+                    "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                    "id": body.get("id", None) if isinstance(body, dict) else None
                 }
             )
-        except Exception as e:
-            return JSONResponse(
-                content={
+    
+    def _json_response(self, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        """Build a FastJSONResponse, recording how long encoding took."""
+        started = time.perf_counter()
+        with span("serialize"):
+            response = FastJSONResponse(status_code=status_code, headers=headers, content=content)
+        self.metrics.encode.observe(time.perf_counter() - started)
+        return response
+    
+    async def _dispatch(self, body: Any) -> Dict[str, Any]:
+        """Run a single JSON-RPC request, recording its latency and error code."""
+        method = body.get("method") if isinstance(body, dict) else None
+        started = time.perf_counter()
+        error_code = None
+        try:
+            with span(f"rpc {method}"):
+                response = await self._call_method(body)
+            error_code = response.get("error", {}).get("code")
+            return response
+        except ExecutorBusy:
+            error_code = -32000
+            raise
+        except Exception:
+            error_code = -32603
+            raise
+        finally:
+            self.metrics.observe_request(method, time.perf_counter() - started, error_code)
+    
+    async def _call_method(self, body: Any) -> Dict[str, Any]:
+        """Route a single JSON-RPC request to its handler and return the response payload."""
+        # Parse JSON-RPC request
+        if not isinstance(body, dict) or "method" not in body:
+            return {"jsonrpc": "2.0", "error": {"code": -32600, "message": "Invalid Request"}, "id": None}
+        
+        method = body["method"]
+        
+        if method == "tasks/get":
+            return await self._handle_get_task(body)
+        elif method == "tasks/send":
+            return await self._handle_send_task(body)
+        elif method == "tasks/sendBatch":
+            return await self._handle_send_task_batch(body)
+        elif method == "tasks/cancel":
+            return await self._handle_cancel_task(body)
+        elif method == "tasks/pushNotification/set":
+            return await self._handle_set_push_notification(body)
+        elif method == "tasks/pushNotification/get":
+            return await self._handle_get_push_notification(body)
+        elif method == "tasks/sendSubscribe":
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32600, "message": "tasks/sendSubscribe cannot be used in a batch"},
+                "id": body.get("id")
+            }
+        else:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32601, "message": f"Method '{method}' not found"},
+                "id": body.get("id")
+            }
+    
+    async def _handle_batch(self, body: List[Any]) -> Response:
+        if not body or len(body) > MAX_BATCH_SIZE:
+            self.metrics.count_error(None, -32600)
+            message = f"Invalid Request: a batch holds at most {MAX_BATCH_SIZE} requests" if body else "Invalid Request"
+            return self._json_response(
+                status_code=400,
+                content={"jsonrpc": "2.0", "error": {"code": -32600, "message": message}, "id": None}
+            )
+        
+        async def run(item: Any) -> Dict[str, Any]:
+            try:
+                return await self._dispatch(item)
+            except ExecutorBusy as e:
+                return self._busy_error(e.retry_after, item.get("id"))
+            except Exception as e:
+                return {
                     "jsonrpc": "2.0",
                     "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-                    "id": request_data.get("id")
+                    "id": item.get("id") if isinstance(item, dict) else None
                 }
-            )
+        
+        responses = await asyncio.gather(*(run(item) for item in body))
+        # Notifications (requests without an id) are run but never answered
+        responses = [
+            response for item, response in zip(body, responses)
+            if not (isinstance(item, dict) and "method" in item and "id" not in item)
+        ]
+        if not responses:
+            return Response(status_code=204)
+        return self._json_response(content=responses)
     
-    async def _handle_send_task(self, request_data: Dict[str, Any]) -> JSONResponse:
+    async def _handle_get_task(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            request = SendTaskRequest.model_validate(request_data)
-            task_id = request.params.get("taskId", str(uuid.uuid4()))
+            with span("validate"):
+                request = GetTaskRequest.model_validate(request_data)
+            task_id = request.params.get("taskId")
+            task = await self.task_store.get(task_id) if task_id else None
             
-            # Check if this is a new task or an update to an existing task
-            if task_id in self.tasks:
-                # Update existing task with new message
-                task = self.tasks[task_id]
-                
-                # Add the new message
-                if "message" in request.params:
-                    message_data = request.params["message"]
-                    parts = [TextPart(text=part["text"]) if part["type"] == "text" else part 
-                             for part in message_data.get("parts", [])]
-                    
-                    message = Message(
-                        role=message_data.get("role", "user"),
-                        parts=parts
-                    )
-                    task.messages.append(message)
-                
-                # Update task state to working
-                task.state = TaskState.WORKING
-            else:
-                # Create a new task
-                initial_message = None
-                if "message" in request.params:
-                    message_data = request.params["message"]
-                    parts = [TextPart(text=part["text"]) if part["type"] == "text" else part 
-                             for part in message_data.get("parts", [])]
-                    
-                    initial_message = Message(
-                        role=message_data.get("role", "user"),
-                        parts=parts
-                    )
-                
-                task = Task(
-                    id=task_id,
-                    state=TaskState.SUBMITTED,
-                    messages=[initial_message] if initial_message else [],
-                    artifacts=[]
-                )
-                self.tasks[task_id] = task
+            if task is None:
+                return {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32001, "message": "Task not found"},
+                    "id": request.id
+                }
+            
+            return {
+                "jsonrpc": "2.0",
+                "result": self._task_result(task, request.params),
+                "id": request.id
+            }
+        except HistoryParamsError as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32602, "message": f"Invalid params: {str(e)}"},
+                "id": request_data.get("id")
+            }
+        except Exception as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+    
+    async def _save_task(self, task: Task) -> None:
+        task.version += 1
+        await self.task_store.save(task)
+        if self._push_subscriptions and task.id in self._push_subscriptions:
+            self._push_state(task)
+        followers = self._followers.get(task.id)
+        if followers:
+            # Record what the task looked like at this save; the stream reads it later
+            snapshot = (task, task.version, task.state, len(task.messages), len(task.artifacts))
+            for queue in followers:
+                queue.put_nowait(snapshot)
+    
+    async def update_task(self, task: Task) -> None:
+        """Store a task changed outside of a request, e.g. by a background job.
+        
+        Use this instead of the task store directly so the version is bumped,
+        push notification subscribers hear about the change and open
+        tasks/sendSubscribe streams relay it.
+        """
+        await self._save_task(task)
+    
+    def _push_state(self, task: Task) -> None:
+        """Notify the task's subscriber if its state changed since the last notification."""
+        subscription = self._push_subscriptions[task.id]
+        config, last_state = subscription
+        if task.state == last_state:
+            return
+        subscription[1] = task.state
+        agent_messages = [m for m in task.messages if m.role != "user"]
+        final = task.state in TERMINAL_STATES or task.state == TaskState.INPUT_REQUIRED
+        event = TaskStatusUpdateEvent(
+            id=task.id,
+            state=task.state,
+            message=agent_messages[-1] if agent_messages else None,
+            final=final,
+            version=task.version
+        )
+        self.push_notifier.notify(config, to_plain(event))
+        if task.state in TERMINAL_STATES:
+            del self._push_subscriptions[task.id]
+    
+    def _subscribe(self, task_id: str, config: PushNotificationConfig) -> None:
+        self._push_subscriptions[task_id] = [config, None]
+        self._push_subscriptions.move_to_end(task_id)
+        while len(self._push_subscriptions) > MAX_PUSH_SUBSCRIPTIONS:
+            self._push_subscriptions.popitem(last=False)
+    
+    def _push_config(self, params: Dict[str, Any]) -> Optional[PushNotificationConfig]:
+        """Validate the ``pushNotification`` config in tasks/send params, if present."""
+        data = params.get("pushNotification")
+        if data is None:
+            return None
+        if self.push_notifier is None:
+            raise PushNotSupported()
+        try:
+            config = PushNotificationConfig.model_validate(data)
+        except ValueError:
+            raise PushConfigError("pushNotification must be an object with a 'url' and an optional 'token'")
+        if not config.url.startswith(("http://", "https://")):
+            raise PushConfigError("pushNotification url must be an http(s) URL")
+        return config
+    
+    def _task_result(self, task: Task, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a result holding the whole task, or only what the caller is missing.
+        
+        ``historyFrom`` / ``artifactsFrom`` give how many messages / artifacts the
+        caller already holds, and only later ones are returned. With
+        ``sinceVersion``, nothing is returned unless the task has changed. Either
+        way the result carries a ``delta`` describing the slice.
+        """
+        history_from = params.get("historyFrom")
+        artifacts_from = params.get("artifactsFrom")
+        since_version = params.get("sinceVersion")
+        if history_from is None and artifacts_from is None and since_version is None:
+            return {"task": task}
+        
+        try:
+            history_from = int(history_from or 0)
+            artifacts_from = int(artifacts_from or 0)
+            since_version = int(since_version) if since_version is not None else None
+        except (TypeError, ValueError):
+            raise HistoryParamsError("historyFrom, artifactsFrom and sinceVersion must be integers")
+        if history_from < 0 or artifacts_from < 0:
+            raise HistoryParamsError("historyFrom and artifactsFrom must not be negative")
+        
+        if since_version is not None and task.version <= since_version:
+            history_from = len(task.messages)
+            artifacts_from = len(task.artifacts)
+        history_from = min(history_from, len(task.messages))
+        artifacts_from = min(artifacts_from, len(task.artifacts))
+        
+        view = Task.model_construct(
+            id=task.id,
+            state=task.state,
+            messages=task.messages[history_from:],
+            artifacts=task.artifacts[artifacts_from:],
+            error=task.error,
+            version=task.version
+        )
+        return {
+            "task": view,
+            "delta": {
+                "messagesFrom": history_from,
+                "artifactsFrom": artifacts_from,
+                "messageCount": len(task.messages),
+                "artifactCount": len(task.artifacts)
+            }
+        }
+    
+    async def _prepare_task(self, params: Dict[str, Any]) -> Task:
+        """Create a new task or append the incoming message to an existing one."""
+        task_id = params.get("taskId", str(uuid.uuid4()))
+        
+        message = None
+        if "message" in params:
+            message_data = params["message"]
+            parts = [TextPart(text=part["text"]) if part["type"] == "text" else part 
+                     for part in message_data.get("parts", [])]
+            
+            message = Message(
+                role=message_data.get("role", "user"),
+                parts=parts
+            )
+        
+        # Check if this is a new task or an update to an existing task
+        task = await self.task_store.get(task_id)
+        if task is not None:
+            # Update existing task with new message
+            if message:
+                task.messages.append(message)
+            
+            # Update task state to working
+            task.state = TaskState.WORKING
+        else:
+            # Create a new task
+            task = Task(
+                id=task_id,
+                state=TaskState.SUBMITTED,
+                messages=[message] if message else [],
+                artifacts=[]
+            )
+            await self._save_task(task)
+        
+        return task
+    
+    async def _handle_send_task(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with span("validate"):
+                request = SendTaskRequest.model_validate(request_data)
+            push_config = self._push_config(request.params)
+            task = await self._prepare_task(request.params)
+            if push_config is not None:
+                # Subscribe before running, so every later transition is delivered
+                self._subscribe(task.id, push_config)
             
             # Process the task
-            result_task = await self.task_handler(task)
-            self.tasks[task_id] = result_task
+            skill = self._skill(task)
+            result_task = await self._call_handler(task, skill)
+            await self._save_task(result_task)
             
-            return JSONResponse(
-                content={
+            result = self._task_result(result_task, request.params)
+            if skill in self.cache_ttls and result_task.state == TaskState.COMPLETED:
+                # Like Cache-Control: the caller may reuse this answer for the same input
+                result["cacheTtl"] = self.cache_ttls[skill]
+            return {
+                "jsonrpc": "2.0",
+                "result": result,
+                "id": request.id
+            }
+        except DeadlineExceeded as e:
+            await self._save_task(task)
+            return self._deadline_error(str(e), request_data.get("id"))
+        except PushNotSupported:
+            return self._push_not_supported(request_data.get("id"))
+        except (HistoryParamsError, PushConfigError) as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32602, "message": f"Invalid params: {str(e)}"},
+                "id": request_data.get("id")
+            }
+        except ExecutorBusy:
+            # Let the caller turn this into a 503 / busy error
+            raise
+        except Exception as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+    
+    async def _handle_send_task_batch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with span("validate"):
+                request = SendTaskBatchRequest.model_validate(request_data)
+            items = request.params.get("tasks", [])
+            
+            if not isinstance(items, list) or len(items) > MAX_BATCH_SIZE:
+                return {
                     "jsonrpc": "2.0",
-                    "result": {"task": result_task.model_dump(exclude_none=True)},
+                    "error": {
+                        "code": -32602,
+                        "message": f"Invalid params: 'tasks' must be a list of at most {MAX_BATCH_SIZE} items"
+                    },
                     "id": request.id
                 }
-            )
+            
+            tasks = await asyncio.gather(*(self._prepare_task(params) for params in items))
+            
+            # Process the tasks in one call when the agent supports it
+            if self.batch_handler is not None:
+                started = time.perf_counter()
+                with span("handler", skill="batch", tasks=len(tasks)):
+                    if self.executor is not None:
+                        # A worker may outlive the deadline, so it must not touch the stored tasks
+                        call = self.executor.run(self.batch_handler, [task.model_copy(deep=True) for task in tasks])
+                    else:
+                        call = self.batch_handler(list(tasks))
+                    result_tasks = await self._within_deadline(call)
+                self.metrics.handler_duration("batch").observe(time.perf_counter() - started)
+            else:
+                result_tasks = await asyncio.gather(*(self._call_handler(task) for task in tasks))
+            await asyncio.gather(*(self._save_task(task) for task in result_tasks))
+            
+            return {
+                "jsonrpc": "2.0",
+                "result": {"tasks": list(result_tasks)},
+                "id": request.id
+            }
+        except DeadlineExceeded as e:
+            return self._deadline_error(str(e), request_data.get("id"))
+        except ExecutorBusy:
+            raise
         except Exception as e:
-            return JSONResponse(
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+    
+    async def _handle_send_task_subscribe(self, request_data: Dict[str, Any]):
+        started = time.perf_counter()
+        if self.stream_handler is None and self.executor is not None and self.executor.full:
+            self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started, -32000)
+            return self._busy_response(self.executor.retry_after(), request_data.get("id"))
+        
+        try:
+            with span("validate"):
+                request = SendTaskStreamingRequest.model_validate(request_data)
+            task = await self._prepare_task(request.params)
+        except Exception as e:
+            self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started, -32603)
+            return self._json_response(
                 content={
                     "jsonrpc": "2.0",
                     "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
                     "id": request_data.get("id")
                 }
             )
+        
+        self.metrics.observe_request("tasks/sendSubscribe", time.perf_counter() - started)
+        return EventSourceResponse(self._stream_task(task, request.id, current_context(), remaining()))
     
-    async def _handle_cancel_task(self, request_data: Dict[str, Any]) -> JSONResponse:
+    async def _stream_task(
+        self,
+        task: Task,
+        request_id: Optional[Union[str, int]],
+        trace_context: Any = None,
+        budget: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Run a task and yield its status and artifact updates as SSE events.
+        
+        The stream runs after the request itself has returned, so the caller's
+        trace context and remaining deadline are passed in and re-applied.
+        """
+        with attach(trace_context), deadline(budget), span("stream", agent=self.agent_card.name):
+            async for payload in self._stream_events(task):
+                started = time.perf_counter()
+                data = dumps({"jsonrpc": "2.0", "result": payload, "id": request_id}).decode()
+                self.metrics.encode.observe(time.perf_counter() - started)
+                yield {"data": data}
+    
+    async def _stream_events(self, task: Task) -> AsyncIterator[BaseModel]:
+        """Run a task and yield its status and artifact update events."""
+        def status(task: Task, new_messages: List[Message], state: Optional[TaskState] = None) -> TaskStatusUpdateEvent:
+            state = state if state is not None else task.state
+            agent_messages = [m for m in new_messages if m.role != "user"]
+            return TaskStatusUpdateEvent(
+                id=task.id,
+                state=state,
+                message=agent_messages[-1] if agent_messages else None,
+                final=state in TERMINAL_STATES or state == TaskState.INPUT_REQUIRED
+            )
+        
+        yield status(task, [])
+        if task.state != TaskState.WORKING:
+            task.state = TaskState.WORKING
+            yield status(task, [])
+        
+        seen_messages = len(task.messages)
+        seen_artifacts = len(task.artifacts)
+        # Listen from the start, so background updates made while the handler runs are not missed
+        followers = self._followers.setdefault(task.id, [])
+        queue: asyncio.Queue = asyncio.Queue()
+        followers.append(queue)
+        seen_version = task.version
         try:
-            request = CancelTaskRequest.model_validate(request_data)
-            task_id = request.params.get("taskId")
-            
-            if not task_id or task_id not in self.tasks:
-                return JSONResponse(
-                    content={
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32001, "message": "Task not found"},
-                        "id": request.id
-                    }
-                )
+            try:
+                if self.stream_handler is not None:
+                    updates = self.stream_handler(task)
+                else:
+                    updates = self._run_task_handler(task)
+                
+                # Relay every snapshot the handler yields until it reaches a final state
+                async for task in updates:
+                    for artifact in task.artifacts[seen_artifacts:]:
+                        yield TaskArtifactUpdateEvent(id=task.id, artifact=artifact)
+                    update = status(task, task.messages[seen_messages:])
+                    seen_messages = len(task.messages)
+                    seen_artifacts = len(task.artifacts)
+                    # Our own save is in the queue too; later versions are background updates
+                    seen_version = task.version + 1
+                    await self._save_task(task)
+                    yield update
+                    if update.final:
+                        return
+                
+                # A task left working is finished in the background, so follow its update_task() saves
+                if task.state == TaskState.WORKING:
+                    while True:
+                        snapshot = await self._next_update(queue)
+                        if snapshot is None:
+                            break
+                        current, version, state, message_count, artifact_count = snapshot
+                        if version <= seen_version:
+                            continue
+                        seen_version = version
+                        for artifact in current.artifacts[seen_artifacts:artifact_count]:
+                            yield TaskArtifactUpdateEvent(id=task.id, artifact=artifact)
+                        update = status(current, current.messages[seen_messages:message_count], state)
+                        update.version = version
+                        seen_messages = message_count
+                        seen_artifacts = artifact_count
+                        yield update
+                        if update.final:
+                            return
+            except Exception as e:
+                task.state = TaskState.FAILED
+                task.error = str(e)
+                await self._save_task(task)
             
-            # Cancel the task
-            task = self.tasks[task_id]
-            task.state = TaskState.CANCELED
+            # The handler stopped without reporting a final state
+            final = status(task, [])
+            final.final = True
+            yield final
+        finally:
+            followers.remove(queue)
+            if not followers:
+                self._followers.pop(task.id, None)
+    
+    async def _next_update(self, queue: asyncio.Queue) -> Optional[tuple]:
+        """Wait for the next saved snapshot of a followed task, or None once the deadline passes."""
+        budget = remaining()
+        if budget is None:
+            return await queue.get()
+        try:
+            return await asyncio.wait_for(queue.get(), max(budget, 0))
+        except asyncio.TimeoutError:
+            return None
+    
+    async def _run_task_handler(self, task: Task) -> AsyncIterator[Task]:
+        yield await self._call_handler(task)
+    
+    def _skill(self, task: Task) -> str:
+        return self.skill_of(task) if self.skill_of is not None else "default"
+    
+    async def _call_handler(self, task: Task, skill: Optional[str] = None) -> Task:
+        if skill is None:
+            skill = self._skill(task)
+        histogram = self.metrics.handler_duration(skill)
+        started = time.perf_counter()
+        try:
+            with span("handler", skill=skill):
+                if self.executor is not None:
+                    # A worker may outlive the deadline, so it works on a copy and a late result is dropped
+                    call = self.executor.run(self.task_handler, task.model_copy(deep=True))
+                else:
+                    call = self.task_handler(task)
+                return await self._within_deadline(call)
+        except DeadlineExceeded as e:
+            task.state = TaskState.FAILED
+            task.error = str(e)
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - started)
+    
+    async def _within_deadline(self, call: Awaitable[Any]) -> Any:
+        """Await ``call``, giving up with DeadlineExceeded once the request's budget runs out."""
+        budget = remaining()
+        if budget is None:
+            return await call
+        if budget <= 0:
+            call.close()
+            raise DeadlineExceeded("Deadline passed before the handler started")
+        try:
+            return await asyncio.wait_for(call, budget)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Handler did not finish within the {budget * 1000:.0f} ms deadline")
+    
+    def _deadline_error(self, message: str, request_id: Optional[Union[str, int]]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "error": {"code": DEADLINE_EXCEEDED_CODE, "message": f"Deadline exceeded: {message}"},
+            "id": request_id
+        }
+    
+    def _busy_error(self, retry_after: int, request_id: Optional[Union[str, int]]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "error": {"code": -32000, "message": "Server busy", "data": {"retryAfter": retry_after}},
+            "id": request_id
+        }
+    
+    def _busy_response(self, retry_after: int, request_id: Optional[Union[str, int]]) -> FastJSONResponse:
+        return self._json_response(
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+            content=self._busy_error(retry_after, request_id)
+        )
+    
+    def _push_not_supported(self, request_id: Optional[Union[str, int]]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "error": {"code": PUSH_NOT_SUPPORTED_CODE, "message": "Push notifications are not supported"},
+            "id": request_id
+        }
+    
+    async def _handle_set_push_notification(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with span("validate"):
+                request = SetTaskPushNotificationRequest.model_validate(request_data)
+            if self.push_notifier is None:
+                return self._push_not_supported(request.id)
+            task_id = request.params.get("taskId")
+            try:
+                config = self._push_config({"pushNotification": request.params.get("pushNotificationConfig")})
+                if config is None:
+                    raise PushConfigError("pushNotificationConfig is required")
+            except PushConfigError as e:
+                return {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32602, "message": f"Invalid params: {str(e)}"},
+                    "id": request.id
+                }
+            task = await self.task_store.get(task_id) if task_id else None
+            if task is None:
+                return {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32001, "message": "Task not found"},
+                    "id": request.id
+                }
             
-            return JSONResponse(
-                content={
+            self._subscribe(task.id, config)
+            if task.state in TERMINAL_STATES:
+                # Finished before the subscription arrived: deliver the outcome now
+                self._push_state(task)
+            return {
+                "jsonrpc": "2.0",
+                "result": {"taskId": task.id, "pushNotificationConfig": config},
+                "id": request.id
+            }
+        except Exception as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+    
+    async def _handle_get_push_notification(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with span("validate"):
+                request = GetTaskPushNotificationRequest.model_validate(request_data)
+            if self.push_notifier is None:
+                return self._push_not_supported(request.id)
+            task_id = request.params.get("taskId")
+            subscription = self._push_subscriptions.get(task_id) if task_id else None
+            if subscription is None:
+                return {
                     "jsonrpc": "2.0",
-                    "result": {"task": task.model_dump(exclude_none=True)},
+                    "error": {"code": -32001, "message": "No push notification config for this task"},
                     "id": request.id
                 }
-            )
+            return {
+                "jsonrpc": "2.0",
+                "result": {"taskId": task_id, "pushNotificationConfig": subscription[0]},
+                "id": request.id
+            }
         except Exception as e:
-            return JSONResponse(
-                content={
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+    
+    async def _handle_cancel_task(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with span("validate"):
+                request = CancelTaskRequest.model_validate(request_data)
+            task_id = request.params.get("taskId")
+            task = await self.task_store.get(task_id) if task_id else None
+            
+            if task is None:
+                return {
                     "jsonrpc": "2.0",
-                    "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-                    "id": request_data.get("id")
+                    "error": {"code": -32001, "message": "Task not found"},
+                    "id": request.id
                 }
-            )
+            
+            # Cancel the task
+            if self.cancel_handler is not None and task.state not in TERMINAL_STATES:
+                await self.cancel_handler(task)
+            task.state = TaskState.CANCELED
+            await self._save_task(task)
+            
+            return {
+                "jsonrpc": "2.0",
+                "result": {"task": task},
+                "id": request.id
+            }
+        except Exception as e:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
+                "id": request_data.get("id")
+            }
+
+
+def run_agent(server: A2AServer, app_path: str, port: int, host: str = "0.0.0.0") -> None:
+    """Serve an agent with uvicorn, using several worker processes if configured.
+    
+    ``app_path`` is the import string of the agent's ASGI app (e.g.
+    ``"agents.calculator.agent:app"``), which uvicorn needs to start workers.
+    The ``A2A_WORKERS`` and ``A2A_PORT`` environment variables override the
+    worker count (default 1) and port. Workers share task state only through
+    a shared task store such as ``A2A_TASK_STORE=sqlite``.
+    """
+    workers = int(os.environ.get("A2A_WORKERS", "1"))
+    port = int(os.environ.get("A2A_PORT", port))
+    
+    if workers <= 1:
+        uvicorn.run(server.app, host=host, port=port)
+        return
+    
+    if isinstance(server.task_store, InMemoryTaskStore):
+        warnings.warn(
+            f"{server.agent_card.name} is running {workers} workers with an in-memory task store; "
+            "tasks/get will miss tasks created by other workers. Set A2A_TASK_STORE=sqlite."
+        )
+    uvicorn.run(app_path, host=host, port=port, workers=workers)
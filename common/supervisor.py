@@ -0,0 +1,245 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional
+
+import httpx
+
+
+# Longest line read from an agent in one piece; longer lines are split
+MAX_LINE_BYTES = 64 * 1024
+
+
+def log_file_name(name: str) -> str:
+    """File name of an agent's log, e.g. ``calculator-agent.log``."""
+    return "-".join(name.lower().split()) + ".log"
+
+
+class RotatingLog:
+    """An append-only log file rotated by size, keeping ``backup_count`` old files.
+
+    ``agent.log`` rolls over to ``agent.log.1`` (and ``.1`` to ``.2`` and so
+    on) once it would grow past ``max_bytes``, so an agent's logs never take
+    more than about ``max_bytes * (backup_count + 1)`` of disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def write(self, data: bytes) -> None:
+        if self._size and self._size + len(data) > self.max_bytes:
+            self.rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "wb")
+        self._size = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class PrefixedStream:
+    """Multiplexes several agents' output onto one stream, one prefixed line at a time."""
+
+    def __init__(self, name: str, stream: Any, lock: threading.Lock):
+        self.prefix = f"[{name}] "
+        self.stream = stream
+        self.lock = lock
+
+    def write(self, data: bytes) -> None:
+        line = data.decode("utf-8", "replace")
+        with self.lock:
+            self.stream.write(self.prefix + line if line.endswith("\n") else self.prefix + line + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class LogDrain(threading.Thread):
+    """Reads an agent's output pipe until EOF and hands each line to ``sink``.
+
+    Reading continuously is what keeps the agent running: an unread pipe fills
+    its ~64 KiB kernel buffer, and the next log write blocks the agent's event
+    loop. Lines are read at most MAX_LINE_BYTES at a time, so memory use stays
+    bounded whatever the agent prints.
+    """
+
+    def __init__(self, name: str, pipe: BinaryIO, sink: Any):
+        super().__init__(name=f"log-drain {name}", daemon=True)
+        self.pipe = pipe
+        self.sink = sink
+        self.lines = 0
+
+    def run(self) -> None:
+        try:
+            for line in iter(lambda: self.pipe.readline(MAX_LINE_BYTES), b""):
+                self.lines += 1
+                try:
+                    self.sink.write(line)
+                except (OSError, ValueError):
+                    # Keep draining even if the sink fails (e.g. disk full)
+                    pass
+        finally:
+            self.pipe.close()
+            self.sink.close()
+
+
+class AgentProcess:
+    """One agent subprocess and how long it took to become ready."""
+
+    def __init__(self, name: str, module: str, port: int, ports: Optional[List[int]] = None):
+        self.name = name
+        self.module = module
+        self.port = port
+        self.url = f"http://localhost:{port}"
+        # A process hosting several agents is ready once every one of its ports is
+        self.ports = ports if ports is not None else [port]
+        self.process: Optional[subprocess.Popen] = None
+        self.drain: Optional[LogDrain] = None
+        self.started = 0.0
+        self.ready_after: Optional[float] = None
+
+
+class Supervisor:
+    """Starts agents in parallel and waits until each reports ready on /healthz.
+
+    ``agents`` are dicts with ``name``, ``module`` and ``port`` keys, as in
+    run.py and web_app.py, and optionally ``ports``: every port the process
+    serves, each of which must answer /healthz. Readiness is polled with exponential backoff, so a
+    fast agent is seen as ready within milliseconds while a slow one is not
+    hammered; an agent that exits during startup fails the wait straight away.
+
+    Each agent's stdout and stderr are merged and drained by a background
+    thread: into ``log_dir/<agent-name>.log`` (rotated at ``max_bytes``) when
+    ``log_dir`` is set, otherwise onto ``stream`` with every line prefixed by
+    the agent's name. With neither, output is discarded.
+    """
+
+    def __init__(
+        self,
+        agents: List[Dict[str, Any]],
+        env: Optional[Dict[str, str]] = None,
+        log_dir: Optional[str] = None,
+        stream: Any = sys.stdout,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+    ):
+        self.agents = [
+            AgentProcess(agent["name"], agent["module"], agent["port"], agent.get("ports")) for agent in agents
+        ]
+        self.env = env
+        self.log_dir = log_dir
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._stream_lock = threading.Lock()
+
+    def _sink(self, agent: AgentProcess):
+        if self.log_dir is not None:
+            return RotatingLog(
+                os.path.join(self.log_dir, log_file_name(agent.name)), self.max_bytes, self.backup_count
+            )
+        return PrefixedStream(agent.name, self.stream, self._stream_lock)
+
+    def start(self) -> None:
+        """Launch every agent at once, without waiting for any of them."""
+        capture = self.log_dir is not None or self.stream is not None
+        for agent in self.agents:
+            print(f"Starting {agent.name} on port {agent.port}...")
+            agent.started = time.monotonic()
+            agent.ready_after = None
+            agent.process = subprocess.Popen(
+                [sys.executable, "-m", agent.module],
+                env=self.env,
+                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                stderr=subprocess.STDOUT if capture else subprocess.DEVNULL
+            )
+            if capture:
+                agent.drain = LogDrain(agent.name, agent.process.stdout, self._sink(agent))
+                agent.drain.start()
+
+    async def wait_ready(
+        self, timeout: float = 30.0, initial_delay: float = 0.02, max_delay: float = 0.5
+    ) -> Dict[str, float]:
+        """Poll all agents concurrently; return seconds from launch to ready per agent."""
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            await asyncio.gather(*(
+                self._wait_one(client, agent, timeout, initial_delay, max_delay) for agent in self.agents
+            ))
+        return {agent.name: agent.ready_after for agent in self.agents}
+
+    async def _wait_one(
+        self, client: httpx.AsyncClient, agent: AgentProcess, timeout: float, delay: float, max_delay: float
+    ) -> None:
+        deadline = agent.started + timeout
+        waiting = list(agent.ports)
+        while True:
+            if agent.process is not None and agent.process.poll() is not None:
+                raise RuntimeError(f"{agent.name} exited with code {agent.process.returncode} during startup")
+            for port in list(waiting):
+                try:
+                    response = await client.get(f"http://localhost:{port}/healthz")
+                    if response.status_code == 200:
+                        waiting.remove(port)
+                except httpx.HTTPError:
+                    pass
+            if not waiting:
+                agent.ready_after = time.monotonic() - agent.started
+                return
+            if time.monotonic() + delay > deadline:
+                ports = ", ".join(map(str, waiting))
+                raise TimeoutError(f"{agent.name} was not ready after {timeout:g} seconds (port {ports})")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    def report(self) -> str:
+        """Time to ready of each agent, one line per agent."""
+        lines = []
+        for agent in self.agents:
+            if agent.ready_after is None:
+                lines.append(f"  {agent.name:<18} not ready")
+            else:
+                lines.append(f"  {agent.name:<18} ready in {agent.ready_after * 1000:.0f} ms")
+        return "\n".join(lines)
+
+    def exited(self) -> List[AgentProcess]:
+        """Agents whose process has stopped."""
+        return [agent for agent in self.agents if agent.process is not None and agent.process.poll() is not None]
+
+    def stop(self) -> None:
+        for agent in self.agents:
+            if agent.process is not None and agent.process.poll() is None:
+                agent.process.terminate()
+        for agent in self.agents:
+            if agent.process is not None:
+                agent.process.wait()
+            if agent.drain is not None:
+                # The pipe reaches EOF once the agent (and any workers it forked) has exited
+                agent.drain.join(timeout=5)
+
+    def log_paths(self) -> Dict[str, str]:
+        """Current log file of each agent, when logging to ``log_dir``."""
+        if self.log_dir is None:
+            return {}
+        return {agent.name: os.path.join(self.log_dir, log_file_name(agent.name)) for agent in self.agents}
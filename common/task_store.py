@@ -0,0 +1,337 @@
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from common.types import Task, TaskState
+
+# Tasks in these states will not change again and may be evicted
+TERMINAL_STATES = frozenset({TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED})
+
+
+class TaskStore(ABC):
+    """Storage backend for the tasks an A2AServer is tracking."""
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[Task]:
+        """Return the task with this id, or None if it is unknown or evicted."""
+
+    @abstractmethod
+    async def save(self, task: Task) -> None:
+        """Insert or replace a task."""
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        """Remove a task if present."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Current usage and eviction counters."""
+
+    async def close(self) -> None:
+        """Flush and release any resources held by the store."""
+
+
+def estimate_task_size(task: Task) -> int:
+    """Cheap approximation of a task's memory footprint in bytes.
+
+    Counts message text plus a fixed overhead per object instead of
+    serializing the task, so it can run on every save.
+    """
+    size = 256 + len(task.id) + len(task.error or "")
+    for message in task.messages:
+        size += 128
+        for part in message.parts:
+            size += 64 + len(getattr(part, "text", "") or "")
+    for artifact in task.artifacts:
+        size += 128 + 64 * len(artifact.parts)
+    return size
+
+
+class InMemoryTaskStore(TaskStore):
+    """Dict-backed store that evicts terminal tasks by idle age and size budget.
+
+    Tasks that are still active (submitted, working, input-required) are never
+    evicted. Terminal tasks are kept in least-recently-used order and dropped
+    once they have been idle for ``ttl`` seconds, or oldest-first while the
+    store is over ``max_entries`` or ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = 3600.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._tasks: Dict[str, Task] = {}
+        self._sizes: Dict[str, int] = {}
+        # task id -> last touched time, least recently used first
+        self._terminal: "OrderedDict[str, float]" = OrderedDict()
+        self._bytes = 0
+        self.evicted_ttl = 0
+        self.evicted_size = 0
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        task = self._tasks.get(task_id)
+        if task is not None and task_id in self._terminal:
+            self._terminal[task_id] = time.monotonic()
+            self._terminal.move_to_end(task_id)
+        return task
+
+    async def save(self, task: Task) -> None:
+        size = estimate_task_size(task)
+        self._bytes += size - self._sizes.get(task.id, 0)
+        self._tasks[task.id] = task
+        self._sizes[task.id] = size
+        if task.state in TERMINAL_STATES:
+            self._terminal[task.id] = time.monotonic()
+            self._terminal.move_to_end(task.id)
+        else:
+            self._terminal.pop(task.id, None)
+        self._evict()
+
+    async def delete(self, task_id: str) -> None:
+        if task_id in self._tasks:
+            self._remove(task_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._tasks),
+            "terminal_entries": len(self._terminal),
+            "bytes": self._bytes,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_size": self.evicted_size,
+        }
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _remove(self, task_id: str) -> None:
+        del self._tasks[task_id]
+        self._bytes -= self._sizes.pop(task_id)
+        self._terminal.pop(task_id, None)
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._tasks) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        if self.ttl is not None:
+            cutoff = time.monotonic() - self.ttl
+            while self._terminal:
+                task_id, touched = next(iter(self._terminal.items()))
+                if touched > cutoff:
+                    break
+                self._remove(task_id)
+                self.evicted_ttl += 1
+        while self._terminal and self._over_budget():
+            self._remove(next(iter(self._terminal)))
+            self.evicted_size += 1
+
+
+class SQLiteTaskStore(TaskStore):
+    """Durable task store on a local SQLite database in WAL mode.
+
+    Saves are group-committed: every save made within ``flush_interval``
+    seconds (or until ``batch_size`` saves are pending) is written in a single
+    transaction, and each caller resumes once its batch is committed. Reads go
+    by primary key on a separate connection, which WAL lets run alongside the
+    writer. All SQLite calls run on dedicated threads, never on the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 512,
+        flush_interval: float = 0.002,
+        synchronous: str = "NORMAL",
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store-writer")
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store-reader")
+        self._local = threading.local()
+        # task id -> (task, serialized task) saved but not yet committed
+        self._pending: Dict[str, Tuple[Task, str]] = {}
+        # the batch currently being written, still visible to get()
+        self._inflight: Dict[str, Tuple[Task, str]] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+        self.batches_committed = 0
+        self.rows_written = 0
+        self._entries = self._writer.submit(self._open).result()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Several worker processes may share the database file
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.conn = conn
+        return conn
+
+    def _open(self) -> int:
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " updated REAL NOT NULL,"
+            " body TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS tasks_state_updated ON tasks (state, updated)")
+        return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def _write_batch(self, rows: List[Tuple[str, str, float, str]]) -> int:
+        conn = self._connection()
+        ids = [row[0] for row in rows]
+        conn.execute("BEGIN")
+        try:
+            existing = 0
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                existing += conn.execute(
+                    f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders})", chunk
+                ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO tasks (id, state, updated, body) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET state=excluded.state, "
+                "updated=excluded.updated, body=excluded.body",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows) - existing
+
+    def _read(self, task_id: str) -> Optional[str]:
+        row = self._connection().execute("SELECT body FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, task_id: str) -> int:
+        return self._connection().execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+
+    def _prune(self, cutoff: float) -> int:
+        states = [state.value for state in TERMINAL_STATES]
+        return self._connection().execute(
+            f"DELETE FROM tasks WHERE state IN ({','.join('?' * len(states))}) AND updated < ?",
+            (*states, cutoff),
+        ).rowcount
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        pending = self._pending.get(task_id) or self._inflight.get(task_id)
+        if pending is not None:
+            return pending[0]
+        loop = asyncio.get_running_loop()
+        body = await loop.run_in_executor(self._reader, self._read, task_id)
+        return Task.model_validate_json(body) if body is not None else None
+
+    async def save(self, task: Task) -> None:
+        loop = asyncio.get_running_loop()
+        self._pending[task.id] = (task, task.model_dump_json(exclude_none=True))
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._flush_task is None or self._flush_task.done():
+            self._full.clear()
+            self._flush_task = loop.create_task(self._flush_after_interval())
+        elif len(self._pending) >= self.batch_size:
+            self._full.set()
+        await waiter
+
+    async def delete(self, task_id: str) -> None:
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        self._entries -= await loop.run_in_executor(self._writer, self._delete, task_id)
+
+    async def prune(self, older_than: float) -> int:
+        """Delete terminal tasks last updated more than ``older_than`` seconds ago."""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        removed = await loop.run_in_executor(self._writer, self._prune, time.time() - older_than)
+        self._entries -= removed
+        return removed
+
+    async def flush(self) -> None:
+        """Commit everything saved so far."""
+        while self._flush_task is not None and not self._flush_task.done():
+            self._full.set()
+            await asyncio.shield(self._flush_task)
+
+    async def _flush_after_interval(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            self._inflight = pending
+            waiters, self._waiters = self._waiters, []
+            now = time.time()
+            rows = [(task_id, task.state.value, now, body) for task_id, (task, body) in pending.items()]
+            try:
+                loop = asyncio.get_running_loop()
+                self._entries += await loop.run_in_executor(self._writer, self._write_batch, rows)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+            finally:
+                self._inflight = {}
+            self.batches_committed += 1
+            self.rows_written += len(rows)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        db_bytes = sum(
+            os.path.getsize(path) for path in (self.path, self.path + "-wal") if os.path.exists(path)
+        )
+        return {
+            "entries": self._entries,
+            "pending": len(self._pending),
+            "bytes": db_bytes,
+            "batches_committed": self.batches_committed,
+            "rows_written": self.rows_written,
+        }
+
+    async def close(self) -> None:
+        await self.flush()
+        self._reader.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+
+def task_store_from_env(name: str) -> TaskStore:
+    """Build the task store selected by the A2A_TASK_STORE environment variable.
+
+    ``memory`` (the default) gives an InMemoryTaskStore. ``sqlite`` gives a
+    SQLiteTaskStore at ``$A2A_TASK_STORE_DIR/<agent name>.db`` (default
+    directory ``data``) so tasks survive agent restarts.
+    """
+    backend = os.environ.get("A2A_TASK_STORE", "memory").lower()
+    if backend == "memory":
+        return InMemoryTaskStore()
+    if backend == "sqlite":
+        directory = os.environ.get("A2A_TASK_STORE_DIR", "data")
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+        return SQLiteTaskStore(os.path.join(directory, f"{slug}.db"))
+    raise ValueError(f"Unknown task store backend: {backend}")
@@ -0,0 +1,316 @@
+import atexit
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Union
+
+
+class SpanContext(NamedTuple):
+    """Identifies a span, e.g. the remote parent taken from a traceparent header."""
+    trace_id: str
+    span_id: str
+
+
+class Span:
+    """A timed operation within a trace. Times are nanoseconds since the epoch."""
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.start = time.time_ns()
+        self.end = 0
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "durationMs": (self.end - self.start) / 1e6,
+            "attributes": self.attributes,
+        }
+
+
+class InMemoryCollector:
+    """Keeps the most recent ``max_spans`` finished spans in process memory."""
+
+    def __init__(self, max_spans: int = 10_000):
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def get_trace(self, trace_id: str) -> List[Span]:
+        return [span for span in self.spans if span.trace_id == trace_id]
+
+    def close(self) -> None:
+        pass
+
+
+class FileExporter:
+    """Appends finished spans to a JSON-lines file.
+
+    Lines are buffered and written with one ``os.write`` on an ``O_APPEND``
+    descriptor, so several agent processes can share one file without
+    interleaving partial lines.
+    """
+
+    def __init__(self, path: str, buffer_spans: int = 64, flush_interval: float = 1.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.buffer_spans = buffer_spans
+        self.flush_interval = flush_interval
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(json.dumps(span.to_dict(), separators=(",", ":")))
+        if len(self._buffer) >= self.buffer_spans or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer and self._fd is not None:
+            os.write(self._fd, ("\n".join(self._buffer) + "\n").encode())
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+
+Exporter = Union[InMemoryCollector, FileExporter]
+
+# The span (or remote parent) that new spans and outbound requests descend from
+_current: ContextVar[Optional[Union[Span, SpanContext]]] = ContextVar("a2a_current_span", default=None)
+_exporter: Optional[Exporter] = None
+_random = random.Random()
+
+
+def _new_id(bits: int) -> str:
+    return f"{_random.getrandbits(bits):0{bits // 4}x}"
+
+
+def configure_tracing(exporter: Optional[Exporter]) -> None:
+    """Set where finished spans go; None disables recording but keeps propagating context."""
+    global _exporter
+    if _exporter is not None and _exporter is not exporter:
+        _exporter.close()
+    _exporter = exporter
+
+
+def get_exporter() -> Optional[Exporter]:
+    return _exporter
+
+
+def exporter_from_env() -> Optional[Exporter]:
+    """Build the exporter selected by the A2A_TRACE environment variable.
+
+    ``A2A_TRACE=memory`` keeps spans in an in-process collector (served at
+    ``/traces``); ``A2A_TRACE=file`` appends them to ``A2A_TRACE_FILE``
+    (default ``data/traces.jsonl``). Unset or ``off`` disables recording.
+    """
+    mode = os.environ.get("A2A_TRACE", "off").lower()
+    if mode == "memory":
+        return InMemoryCollector()
+    if mode == "file":
+        return FileExporter(os.environ.get("A2A_TRACE_FILE", os.path.join("data", "traces.jsonl")))
+    if mode in ("", "off"):
+        return None
+    raise ValueError(f"Unknown A2A_TRACE mode: {mode}")
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header; malformed headers are ignored."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff" or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id)
+
+
+def current_traceparent() -> Optional[str]:
+    """The ``traceparent`` header value for an outbound request, if there is a trace."""
+    parent = _current.get()
+    if parent is None:
+        return None
+    return f"00-{parent.trace_id}-{parent.span_id}-01"
+
+
+def _reset(token) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Exited from another context, e.g. an async generator closed by the loop
+        pass
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        span = self.span
+        span.end = time.time_ns()
+        if exc is not None:
+            span.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        _reset(self._token)
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(span)
+        return False
+
+
+class _RemoteScope:
+    """Makes an existing span or remote parent current without recording a new span."""
+    __slots__ = ("context", "_token")
+
+    def __init__(self, context: Union[Span, SpanContext]):
+        self.context = context
+        self._token = None
+
+    def __enter__(self) -> None:
+        self._token = _current.set(self.context)
+        return None
+
+    def __exit__(self, *exc_info) -> bool:
+        _reset(self._token)
+        return False
+
+
+def current_context() -> Optional[Union[Span, SpanContext]]:
+    """The current span or remote parent, to re-attach later with attach()."""
+    return _current.get()
+
+
+def attach(context: Optional[Union[Span, SpanContext]]):
+    """Make ``context`` current again, e.g. for work that outlives its request span."""
+    if context is None:
+        return _NOOP
+    return _RemoteScope(context)
+
+
+def span(name: str, **attributes: Any):
+    """Context manager timing ``name`` as a child of the current span.
+
+    Yields the Span, or None when tracing is disabled, in which case it costs
+    next to nothing.
+    """
+    if _exporter is None:
+        return _NOOP
+    parent = _current.get()
+    if parent is None:
+        return _SpanScope(Span(name, _new_id(128), None, attributes))
+    return _SpanScope(Span(name, parent.trace_id, parent.span_id, attributes))
+
+
+def server_span(name: str, traceparent: Optional[str], **attributes: Any):
+    """Like span(), but continues the trace of an incoming ``traceparent`` header.
+
+    With tracing disabled the incoming context is still made current, so
+    outbound calls made while handling the request carry it onwards.
+    """
+    remote = parse_traceparent(traceparent)
+    if _exporter is None:
+        return _RemoteScope(remote) if remote is not None else _NOOP
+    if remote is None:
+        return _SpanScope(Span(name, _new_id(128), None, attributes))
+    return _SpanScope(Span(name, remote.trace_id, remote.span_id, attributes))
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """Render one trace's spans as an indented tree with start offsets and durations."""
+    if not spans:
+        return ""
+    origin = min(span["start"] for span in spans)
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    ids = {span["spanId"] for span in spans}
+    for span in sorted(spans, key=lambda s: s["start"]):
+        # Spans whose parent was not recorded (e.g. an untraced caller) become roots
+        parent = span["parentId"] if span["parentId"] in ids else None
+        children.setdefault(parent, []).append(span)
+
+    lines = []
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for span in children.get(parent, []):
+            offset = (span["start"] - origin) / 1e6
+            attributes = " ".join(f"{key}={value}" for key, value in span["attributes"].items())
+            lines.append(
+                f"{offset:9.3f}ms {span['durationMs']:9.3f}ms  {'  ' * depth}{span['name']}"
+                + (f"  [{attributes}]" if attributes else "")
+            )
+            walk(span["spanId"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main(argv: List[str]) -> None:
+    """Print the traces in a span file: python -m common.tracing data/traces.jsonl [trace_id]"""
+    if not argv:
+        print(main.__doc__)
+        return
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(argv[0]) as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["traceId"], []).append(span)
+    selected = [argv[1]] if len(argv) > 1 else list(traces)
+    for trace_id in selected:
+        print(f"trace {trace_id}")
+        print(format_trace(traces.get(trace_id, [])))
+        print()
+
+
+configure_tracing(exporter_from_env())
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,100 @@
+import asyncio
+import httpx
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Settings for the shared outbound HTTP connection pool."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: float = 30.0
+
+
+_config = TransportConfig()
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# A2AServers hosted in this process, by base URL; calls to them skip HTTP
+_local_agents: Dict[str, Any] = {}
+
+
+def configure_transport(**settings) -> TransportConfig:
+    """Update the pool settings used for the next client that gets created.
+
+    Call this before the first request, or after close_http_client(), since a
+    running pool keeps the limits it was created with.
+    """
+    global _config
+    config = replace(_config, **settings)
+    if config.http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("http2=True requires the 'h2' package (pip install httpx[http2])")
+    _config = config
+    return _config
+
+
+def get_transport_config() -> TransportConfig:
+    return _config
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use.
+
+    Pooled connections belong to the event loop that opened them, so a new
+    client is created if the running loop has changed (e.g. repeated
+    asyncio.run() calls in the CLI client).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_config.max_connections,
+                max_keepalive_connections=_config.max_keepalive_connections,
+                keepalive_expiry=_config.keepalive_expiry,
+            ),
+            http2=_config.http2,
+            timeout=_config.timeout,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client, _client_loop
+    client, loop = _client, _client_loop
+    _client = None
+    _client_loop = None
+    if client is not None and not client.is_closed and loop is asyncio.get_running_loop():
+        await client.aclose()
+
+
+def _agent_key(url: str) -> str:
+    return url.rstrip("/")
+
+
+def register_local_agent(server: Any, url: Optional[str] = None) -> None:
+    """Route calls for ``url`` (default: the server's card URL) straight to ``server``.
+
+    A2AClient and agent card lookups for a registered URL call the A2AServer
+    in this process instead of going through JSON and a loopback socket.
+    """
+    _local_agents[_agent_key(url or server.agent_card.url)] = server
+
+
+def unregister_local_agent(url: str) -> None:
+    _local_agents.pop(_agent_key(url), None)
+
+
+def get_local_agent(url: str) -> Optional[Any]:
+    """The A2AServer hosted in this process for ``url``, if there is one."""
+    if not _local_agents:
+        return None
+    return _local_agents.get(_agent_key(url))
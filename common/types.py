@@ -27,6 +27,11 @@ class AgentSkill(BaseModel):
     id: str
     name: str
     description: Optional[str] = None
+    # Safe to run twice (no side effects), so callers may hedge or retry it
+    idempotent: bool = False
+    # Answers depend only on the input, so callers may reuse them for cacheTtl seconds
+    cacheable: bool = False
+    cacheTtl: Optional[float] = None
 
 
 class AgentAuthentication(BaseModel):
@@ -70,6 +75,8 @@ class Task(BaseModel):
     messages: List[Message] = []
     artifacts: List[Artifact] = []
     error: Optional[str] = None
+    # Incremented by the server every time the task is stored
+    version: int = 0
 
 
 class JSONRPCRequest(BaseModel):
@@ -108,3 +115,56 @@ class CancelTaskRequest(JSONRPCRequest):
 
 class CancelTaskResponse(JSONRPCResponse):
     result: Optional[Dict[str, Any]] = None
+
+
+class SendTaskBatchRequest(JSONRPCRequest):
+    method: str = "tasks/sendBatch"
+
+
+class SendTaskBatchResponse(JSONRPCResponse):
+    result: Optional[Dict[str, Any]] = None
+
+
+class PushNotificationConfig(BaseModel):
+    url: str
+    # Echoed in the X-A2A-Notification-Token header so the receiver can check the sender
+    token: Optional[str] = None
+
+
+class SetTaskPushNotificationRequest(JSONRPCRequest):
+    method: str = "tasks/pushNotification/set"
+
+
+class SetTaskPushNotificationResponse(JSONRPCResponse):
+    result: Optional[Dict[str, Any]] = None
+
+
+class GetTaskPushNotificationRequest(JSONRPCRequest):
+    method: str = "tasks/pushNotification/get"
+
+
+class GetTaskPushNotificationResponse(JSONRPCResponse):
+    result: Optional[Dict[str, Any]] = None
+
+
+class SendTaskStreamingRequest(JSONRPCRequest):
+    method: str = "tasks/sendSubscribe"
+
+
+class SendTaskStreamingResponse(JSONRPCResponse):
+    result: Optional[Dict[str, Any]] = None
+
+
+class TaskStatusUpdateEvent(BaseModel):
+    id: str
+    state: TaskState
+    message: Optional[Message] = None
+    final: bool = False
+    # Task version the event describes; set on push notifications so receivers can order them
+    version: Optional[int] = None
+
+
+class TaskArtifactUpdateEvent(BaseModel):
+    id: str
+    artifact: Artifact
+    final: bool = False
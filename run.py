@@ -4,6 +4,9 @@ import subprocess
 import time
 import signal
 import argparse
+import asyncio
+
+from common.supervisor import Supervisor
 
 # Define the agent processes to run
 AGENTS = [
@@ -34,44 +37,78 @@ AGENTS = [
     }
 ]
 
-def run_agents():
-    """Start all agent processes."""
-    print("Starting A2A Demo agents...")
+def agent_env(workers=1):
+    """Environment for the agent processes."""
+    env = dict(os.environ)
+    if workers > 1:
+        env["A2A_WORKERS"] = str(workers)
+        # Workers of one agent must share task state to answer each other's tasks/get
+        env.setdefault("A2A_TASK_STORE", "sqlite")
+        print(f"Using {workers} workers per agent with the {env['A2A_TASK_STORE']} task store")
+    return env
+
+# All agents in one process, calling each other without HTTP (common/host.py).
+# Each hosted agent mounts its own server, so readiness waits for all of their ports.
+IN_PROCESS_AGENTS = [
+    {
+        "name": "In-Process Agents",
+        "module": "common.host",
+        "port": 8000,
+        "ports": [agent["port"] for agent in AGENTS]
+    }
+]
+
+def start_agents(workers=1, log_dir="logs", in_process=False):
+    """Start all agents in parallel and wait until each one reports ready.
     
-    # Keep track of all processes
-    processes = []
+    Agent output is written to rotating files in ``log_dir``, or shown in
+    this terminal with each line prefixed by the agent name if it is "-".
+    With ``in_process`` all agents share one process and event loop.
+    """
+    print("Starting A2A Demo agents...")
+    agents = IN_PROCESS_AGENTS if in_process else AGENTS
+    if log_dir == "-":
+        supervisor = Supervisor(agents, env=agent_env(workers))
+    else:
+        supervisor = Supervisor(agents, env=agent_env(workers), log_dir=log_dir)
+        print(f"Agent logs are written to {log_dir}/")
+    started = time.monotonic()
+    supervisor.start()
+    try:
+        asyncio.run(supervisor.wait_ready())
+    except (RuntimeError, TimeoutError) as e:
+        print(f"\n{e}")
+        print(supervisor.report())
+        supervisor.stop()
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nStopping all agents...")
+        supervisor.stop()
+        sys.exit(1)
+    print(f"\nAll agents ready in {(time.monotonic() - started) * 1000:.0f} ms:")
+    print(supervisor.report())
+    return supervisor
+
+def run_agents(workers=1, log_dir="logs", in_process=False):
+    """Start all agent processes and keep them running until Ctrl+C."""
+    supervisor = start_agents(workers, log_dir, in_process)
     
     try:
-        # Start each agent in a separate process
-        for agent in AGENTS:
-            print(f"Starting {agent['name']} on port {agent['port']}...")
-            process = subprocess.Popen(
-                [sys.executable, "-m", agent["module"]],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            processes.append(process)
-            # Give it a moment to start up
-            time.sleep(1)
-        
-        print("\nAll agents started successfully!")
         print("\nPress Ctrl+C to stop all agents and exit\n")
         
-        # Wait for user to press Ctrl+C
+        # Wait for user to press Ctrl+C, reporting agents that stop on their own
+        reported = set()
         while True:
             time.sleep(1)
+            for agent in supervisor.exited():
+                if agent.name not in reported:
+                    reported.add(agent.name)
+                    print(f"{agent.name} exited with code {agent.process.returncode}")
     
     except KeyboardInterrupt:
         print("\nStopping all agents...")
     finally:
-        # Stop all processes
-        for process in processes:
-            process.terminate()
-        
-        # Wait for processes to terminate
-        for process in processes:
-            process.wait()
-        
+        supervisor.stop()
         print("All agents stopped. Exiting.")
 
 def run_client():
@@ -82,31 +119,26 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="A2A Demo Runner")
     parser.add_argument("--client-only", action="store_true", help="Run only the client")
     parser.add_argument("--agents-only", action="store_true", help="Run only the agents")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes per agent")
+    parser.add_argument("--log-dir", default="logs", help='Directory for agent logs, or "-" for this terminal')
+    parser.add_argument("--in-process", action="store_true", help="Host all agents in one process and event loop")
     
     args = parser.parse_args()
+    if args.in_process and args.workers > 1:
+        parser.error("--in-process runs a single process; it cannot be combined with --workers")
     
     if args.client_only:
         run_client()
     elif args.agents_only:
-        run_agents()
+        run_agents(args.workers, args.log_dir, args.in_process)
     else:
-        # Default: run both in separate processes
+        # Default: start the agents, then run the client once they are ready
         print("Starting both agents and client...")
-        
-        # Start agents in a separate process
-        agents_process = subprocess.Popen(
-            [sys.executable, __file__, "--agents-only"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Give agents time to start up
-        time.sleep(5)
+        supervisor = start_agents(args.workers, args.log_dir, args.in_process)
         
         try:
             # Run client in main process
             run_client()
         finally:
-            # Stop agents process when client exits
-            agents_process.terminate()
-            agents_process.wait()
+            # Stop agents when client exits
+            supervisor.stop()
@@ -0,0 +1,41 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from agents.calculator.agent import server
+from common.server import MAX_BATCH_SIZE
+
+
+def send(request_id=None):
+    request = {
+        "jsonrpc": "2.0",
+        "method": "tasks/send",
+        "params": {"message": {"role": "user", "parts": [{"type": "text", "text": "2+2"}]}},
+    }
+    if request_id is not None:
+        request["id"] = request_id
+    return request
+
+
+class BatchArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(server.app)
+
+    def test_notifications_get_no_response(self):
+        response = self.client.post("/", json=[send(1), send(), send(2)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.json()], [1, 2])
+
+    def test_batch_of_notifications_gets_204(self):
+        response = self.client.post("/", json=[send(), send()])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+
+    def test_oversized_batch_is_rejected(self):
+        response = self.client.post("/", json=[send(i) for i in range(MAX_BATCH_SIZE + 1)])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from agents.coordinator import agent
+from agents.coordinator.agent import split_query
+from common.types import Message, Task, TaskState, TextPart
+
+
+async def answer(query: str) -> str:
+    task = Task(id="t", state=TaskState.WORKING, messages=[Message(role="user", parts=[TextPart(text=query)])])
+    task = await agent.handle_task(task)
+    return task.messages[-1].parts[0].text
+
+
+class SplitQueryTest(unittest.TestCase):
+    def test_splits_before_each_command(self):
+        self.assertEqual(
+            split_query("weather tokyo; calculate: 2+2; translate en-es: hello"),
+            ["weather tokyo", "calculate: 2+2", "translate en-es: hello"],
+        )
+
+    def test_keeps_separators_inside_a_payload(self):
+        self.assertEqual(
+            split_query("translate en-es: hello; goodbye; timer 5m"),
+            ["translate en-es: hello; goodbye", "timer 5m"],
+        )
+
+    def test_drops_stray_separators(self):
+        self.assertEqual(split_query(";weather tokyo;; calc 2+2;"), ["weather tokyo", "calc 2+2"])
+
+
+class HandleTaskTest(unittest.TestCase):
+    def test_single_query_loses_trailing_separator(self):
+        # No agents run here, so the forwarded text is echoed back instead
+        async def forward(agent_name, query):
+            return f"{agent_name}: {query}"
+
+        with mock.patch.object(agent, "forward_request", forward):
+            self.assertEqual(asyncio.run(answer("Weather Tokyo;")), "weather: weather tokyo")
+
+    def test_help_with_trailing_separator(self):
+        async def help_text():
+            return "help text"
+
+        with mock.patch.object(agent, "get_help", help_text):
+            self.assertEqual(asyncio.run(answer("help;")), "help text")
+
+    def test_only_separators_get_the_unknown_query_reply(self):
+        self.assertTrue(asyncio.run(answer(" ; ;")).startswith("I'm not sure which agent"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import math
+import unittest
+
+from agents.timer import agent as timer_agent
+from common.types import JSONRPCRequest, TaskState
+from tests.virtual_clock import run
+
+server = timer_agent.server
+
+
+async def send(text: str) -> str:
+    request = JSONRPCRequest(id=1, method="tasks/send", params={
+        "message": {"role": "user", "parts": [{"type": "text", "text": text}]}
+    })
+    return (await server.call_local(request))["result"]["task"]["id"]
+
+
+async def completed_at(task_id: str, limit: float) -> float:
+    """Loop time at which the task completes, polled every 10 ms for up to ``limit`` seconds."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + limit
+    while loop.time() < deadline:
+        task = await server.task_store.get(task_id)
+        if task.state == TaskState.COMPLETED:
+            return loop.time()
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"task {task_id} still {task.state.value} after {limit} s")
+
+
+class CountdownWithTimerTest(unittest.TestCase):
+    def test_timer_fires_on_time_while_a_countdown_ticks(self):
+        # Countdown ticks re-arm from their own callback; at a 0.45 s start one lands on tick 255
+        for start in [offset / 20 for offset in range(20)]:
+            with self.subTest(start=start):
+                run(self.countdown_and_timer(start), start)
+
+    async def countdown_and_timer(self, start: float):
+        countdown = await send("countdown 5")
+        timer = await send("timer 4s")
+        timer_done = await completed_at(timer, 60)
+        self.assertAlmostEqual(timer_done, start + 4, delta=0.03)
+        countdown_done = await completed_at(countdown, 60)
+        # Ticks fall on whole seconds, the first one at least a second after the start
+        self.assertAlmostEqual(countdown_done, math.ceil(start) + 5, delta=0.03)
+        task = await server.task_store.get(countdown)
+        ticks = [message.parts[0].text for message in task.messages[2:]]
+        self.assertEqual(ticks, ["4", "3", "2", "1", "0!"])
+        self.assertEqual(len(timer_agent.COUNTDOWNS), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
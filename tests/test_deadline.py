@@ -0,0 +1,46 @@
+import asyncio
+import time
+import unittest
+
+from common.executor import HandlerExecutor
+from common.resilience import deadline
+from common.server import A2AServer
+from common.task_store import InMemoryTaskStore
+from common.types import AgentCapabilities, AgentCard, JSONRPCRequest, Message, Task, TaskState, TextPart
+
+card = AgentCard(name="Slow Agent", url="http://localhost:0", version="1.0.0", capabilities=AgentCapabilities(), skills=[])
+
+
+async def slow_handler(task: Task) -> Task:
+    # Blocks its worker thread well past the caller's deadline
+    time.sleep(0.3)
+    task.messages.append(Message(role="agent", parts=[TextPart(text="done")]))
+    task.state = TaskState.COMPLETED
+    return task
+
+
+class ExecutorDeadlineTest(unittest.TestCase):
+    def test_late_result_does_not_change_the_failed_task(self):
+        asyncio.run(self.late_result())
+
+    async def late_result(self):
+        executor = HandlerExecutor("thread", max_workers=1)
+        server = A2AServer(card, slow_handler, task_store=InMemoryTaskStore(), executor=executor)
+        request = JSONRPCRequest(id=1, method="tasks/send", params={
+            "taskId": "slow", "message": {"role": "user", "parts": [{"type": "text", "text": "hi"}]}
+        })
+        with deadline(0.05):
+            response = await server.call_local(request)
+        self.assertIn("error", response)
+        failed = await server.task_store.get("slow")
+        self.assertEqual(failed.state, TaskState.FAILED)
+        # Let the abandoned worker finish
+        await asyncio.sleep(0.4)
+        task = await server.task_store.get("slow")
+        self.assertEqual(task.state, TaskState.FAILED)
+        self.assertEqual(len(task.messages), len(failed.messages))
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+
+from common import discovery
+from common.discovery import AgentCardCache
+
+URL = "http://agent.test"
+CARD = {"name": "Test Agent", "url": URL, "version": "1.0.0", "capabilities": {}, "skills": []}
+
+
+class RevalidationFailureTest(unittest.TestCase):
+    def test_failed_revalidation_keeps_the_card(self):
+        asyncio.run(self.failed_revalidation())
+
+    async def failed_revalidation(self):
+        up = True
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if not up:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json=CARD)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache = AgentCardCache(ttl=0.0, error_ttl=60.0)
+        with mock.patch.object(discovery, "get_http_client", lambda: client):
+            card = await cache.get(URL)
+            # The agent restarts; the expired card triggers a revalidation that fails
+            up = False
+            self.assertIs(await cache.get(URL), card)
+            with self.assertRaises(Exception):
+                await cache._fetch(URL)
+            self.assertIs(cache.peek(URL), card)
+            self.assertIs(await cache.get(URL), card)
+            # The failure pushed the next revalidation back by error_ttl
+            self.assertNotIn(URL, cache._inflight)
+        await client.aclose()
+
+    def test_failed_first_lookup_is_remembered(self):
+        asyncio.run(self.failed_first_lookup())
+
+    async def failed_first_lookup(self):
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache = AgentCardCache(error_ttl=60.0)
+        with mock.patch.object(discovery, "get_http_client", lambda: client):
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    await cache.get(URL)
+        self.assertEqual(calls, 1)
+        self.assertIsNone(cache.peek(URL))
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
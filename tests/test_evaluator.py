@@ -0,0 +1,88 @@
+import unittest
+
+from agents.calculator.evaluator import MAX_EXPRESSION_LENGTH, MAX_INT_BITS, EvaluationError, evaluate
+
+
+class EvaluateTest(unittest.TestCase):
+    def test_arithmetic(self):
+        self.assertEqual(evaluate("2 + 3 * (4 - 1)"), 11)
+        self.assertEqual(evaluate("7 // 2"), 3)
+        self.assertEqual(evaluate("7 / 2"), 3.5)
+        self.assertEqual(evaluate("-2 ** 10"), -1024)
+        self.assertEqual(evaluate("2 ** -1"), 0.5)
+
+
+class BudgetTest(unittest.TestCase):
+    def assertRejected(self, expression: str, message: str):
+        with self.assertRaises(EvaluationError) as caught:
+            evaluate(expression)
+        self.assertIn(message, str(caught.exception))
+
+    def test_power_tower(self):
+        self.assertRejected("9**9**9", "exceeds the limit")
+
+    def test_exponent_limit(self):
+        self.assertEqual(evaluate("1 ** 1000"), 1)
+        self.assertRejected("1 ** 1001", "exceeds the limit")
+        self.assertRejected("2 ** -1001", "exceeds the limit")
+
+    def test_operation_limit(self):
+        # 100 numbers and 99 additions, plus the expression node, is exactly the budget
+        self.assertEqual(evaluate("+".join(["1"] * 100)), 100)
+        self.assertRejected("+".join(["1"] * 101), "operations")
+        self.assertRejected("-" * 300 + "1", "operations")
+
+    def test_expression_length(self):
+        self.assertRejected("1" * (MAX_EXPRESSION_LENGTH + 1), "longer than")
+
+    def test_integer_bits(self):
+        self.assertEqual(evaluate("3 ** 1000").bit_length(), 1585)
+        # Refused before computing, from the operand sizes
+        self.assertRejected("(2 ** 1000) ** 5", f"{MAX_INT_BITS} bits")
+        # Refused after computing, from the result size
+        self.assertRejected("*".join(["2 ** 1000"] * 5), f"{MAX_INT_BITS} bits")
+
+    def test_float_magnitude(self):
+        self.assertRejected("1e300 * 10", "too large")
+        self.assertRejected("1e308", "too large")
+        self.assertRejected("10.0 ** 400", "too large")
+
+    def test_deep_nesting(self):
+        self.assertEqual(evaluate("(" * 50 + "1" + ")" * 50), 1)
+        self.assertRejected("(" * 300 + "1" + ")" * 300, "invalid syntax")
+
+    def test_division_by_zero(self):
+        for expression in ["1 / 0", "1 // 0", "0 ** -1"]:
+            with self.subTest(expression=expression), self.assertRaises(ZeroDivisionError):
+                evaluate(expression)
+
+
+class SyntaxTest(unittest.TestCase):
+    def test_rejects_everything_but_arithmetic(self):
+        for expression, node in [
+            ("(1).real", "Attribute"),
+            ("abs(1)", "Call"),
+            ("__import__('os').system('true')", "Call"),
+            ("x", "Name"),
+            ("[1]", "List"),
+            ("1 if 1 else 2", "IfExp"),
+            ("1 < 2", "Compare"),
+            ("'a' * 3", "Constant"),
+            ("True + 1", "Constant"),
+            ("1 % 2", "BinOp"),
+            ("~1", "UnaryOp"),
+            ("lambda: 1", "Lambda"),
+        ]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(EvaluationError) as caught:
+                    evaluate(expression)
+                self.assertEqual(str(caught.exception), f"unsupported syntax: {node}")
+
+    def test_rejects_malformed_input(self):
+        for expression in ["", "1 +", "2 ** ** 2", "1; 2"]:
+            with self.subTest(expression=expression), self.assertRaises(EvaluationError):
+                evaluate(expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from agents.translator.phrase_table import PhraseTable
+
+
+class PhraseTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = PhraseTable()
+        self.table.add({"en": "how are you", "fr": "comment allez-vous"})
+        self.table.add({"en": "the y2 model", "fr": "le modèle Y2"})
+
+    def test_hyphenated_words_stay_joined(self):
+        self.assertEqual(self.table.translate("How are you?", "en", "fr"), ("Comment allez-vous?", 1))
+
+    def test_only_the_source_side_is_case_folded(self):
+        self.assertEqual(self.table.translate("the Y2 MODEL", "en", "fr"), ("le modèle Y2", 1))
+        self.assertEqual(self.table.translate("Le modèle y2", "fr", "en"), ("The y2 model", 1))
+
+    def test_translate_many_keeps_texts_apart(self):
+        # "how are" ends one text and "you" starts the next; they must not match as one phrase
+        self.assertEqual(
+            self.table.translate_many(["how are", "you", "", "The y2 model\0 how are you"], "en", "fr"),
+            [("how are", 0), ("you", 0), ("", 0), ("Le modèle Y2 comment allez-vous", 2)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import random
+import unittest
+
+from common.scheduler import TimingWheel
+from tests.virtual_clock import run
+
+
+class CascadeBoundaryTest(unittest.TestCase):
+    def test_timer_added_on_last_tick_of_rotation_keeps_cascade(self):
+        # A fires on tick 767 (255 mod 256) and adds B, so the level-1 cascade of C is due next
+        fired = {}
+        wakes = 0
+
+        async def main():
+            nonlocal wakes
+            loop = asyncio.get_running_loop()
+            wheel = TimingWheel()
+            on_wake = wheel._on_wake
+
+            def counting_wake():
+                nonlocal wakes
+                wakes += 1
+                on_wake()
+
+            wheel._on_wake = counting_wake
+
+            def a():
+                fired["a"] = loop.time()
+                wheel.call_later(0.05, lambda: fired.setdefault("b", loop.time()))
+
+            wheel.call_at(loop.time() + 7.67, a)
+            wheel.call_at(loop.time() + 10.0, lambda: fired.setdefault("c", loop.time()))
+            await asyncio.sleep(700)
+
+        run(main())
+        self.assertAlmostEqual(fired["a"], 7.67, places=6)
+        self.assertAlmostEqual(fired["b"], 7.72, places=6)
+        self.assertAlmostEqual(fired["c"], 10.0, places=6)
+        # Cascades at ticks 512 and 768, then A, B and C; not a wakeup on every tick
+        self.assertEqual(wakes, 5)
+
+
+class FuzzTest(unittest.TestCase):
+    """Random inserts, cancels and clock jumps, checked against a heap of due ticks."""
+
+    CONFIGS = [(256, 4), (4, 3), (2, 4), (8, 2)]
+
+    def test_fires_every_timer_on_its_tick(self):
+        for slots, levels in self.CONFIGS:
+            for seed in range(20):
+                with self.subTest(slots=slots, levels=levels, seed=seed):
+                    run(self.fuzz(slots, levels, random.Random(seed)))
+
+    async def fuzz(self, slots: int, levels: int, rng: random.Random):
+        loop = asyncio.get_running_loop()
+        resolution = 0.01
+        wheel = TimingWheel(resolution, slots, levels)
+        wheel.call_later(0, lambda: None)
+        origin = wheel.time_of(0)
+        # Up to twice the wheel's range, which parks timers at the top level
+        longest = min(slots ** levels * 2, 256 ** 3 * 3)
+        live = {}
+        keys = iter(range(10 ** 9))
+        cancelled = set()
+        expected = []
+        fired = []
+        errors = []
+        # The wheel hands callback exceptions to the loop's handler; keep them for the test
+        loop.set_exception_handler(lambda loop, context: errors.append(context["exception"]))
+
+        def delay() -> int:
+            return rng.choice((rng.randrange(4), rng.randrange(slots * 2), rng.randrange(longest)))
+
+        def add() -> None:
+            # Deadlines fall mid-tick, so the tick they fire on is never in doubt
+            tick = int((loop.time() - origin) / resolution) + 1 + delay()
+            key = next(keys)
+            live[key] = (wheel.call_at(origin + (tick + 0.5) * resolution, fire, key, tick + 1), tick + 1)
+            heapq.heappush(expected, (tick + 1, key))
+
+        def cancel() -> None:
+            if live:
+                key = rng.choice(list(live))
+                timer, _ = live.pop(key)
+                self.assertTrue(timer.cancel())
+                cancelled.add(key)
+
+        def fire(key: int, tick: int) -> None:
+            # The virtual loop runs handles up to a microsecond early
+            self.assertAlmostEqual(loop.time(), wheel.time_of(tick), delta=resolution / 100)
+            self.assertIn(key, live)
+            del live[key]
+            fired.append(tick)
+            # Callbacks schedule and cancel timers too
+            pick = rng.random()
+            if pick < 0.3:
+                add()
+            elif pick < 0.4:
+                cancel()
+
+        for _ in range(3000):
+            pick = rng.random()
+            if pick < 0.5:
+                add()
+            elif pick < 0.65:
+                cancel()
+            else:
+                await asyncio.sleep(delay() * resolution * rng.random())
+        # Callbacks keep adding timers for a while, each chain a little less likely to go on
+        for _ in range(100):
+            if not live:
+                break
+            await asyncio.sleep(max(tick for _, tick in live.values()) * resolution - (loop.time() - origin) + 1)
+        if errors:
+            raise errors[0]
+        order = [heapq.heappop(expected) for _ in range(len(expected))]
+        self.assertEqual(fired, [tick for tick, key in order if key not in cancelled])
+        self.assertEqual(len(wheel), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
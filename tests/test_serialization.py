@@ -0,0 +1,21 @@
+import json
+import unittest
+
+from common import serialization
+from common.types import Task, TaskState
+
+
+class DumpsTest(unittest.TestCase):
+    def test_strings_shaped_like_placeholders_are_left_alone(self):
+        task = Task(id="t1", state=TaskState.COMPLETED)
+        for request_id in ["\x000\x00", "\x007\x00"]:
+            content = {"jsonrpc": "2.0", "id": request_id, "result": {"task": task, "text": "\x000\x00"}}
+            with self.subTest(request_id=request_id):
+                decoded = json.loads(serialization.dumps(content))
+                self.assertEqual(decoded["id"], request_id)
+                self.assertEqual(decoded["result"]["text"], "\x000\x00")
+                self.assertEqual(decoded["result"]["task"], task.model_dump(mode="json", exclude_none=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
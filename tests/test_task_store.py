@@ -0,0 +1,204 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from common import task_store
+from common.task_store import InMemoryTaskStore, SQLiteTaskStore, estimate_task_size
+from common.types import Message, Task, TaskState, TextPart
+
+
+class FakeTime:
+    """Stands in for the time module so task ages can be set exactly."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+def make_task(task_id: str, state: TaskState = TaskState.COMPLETED, text: str = "hi") -> Task:
+    return Task(id=task_id, state=state, messages=[Message(role="user", parts=[TextPart(text=text)])])
+
+
+class InMemoryTaskStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeTime()
+        patcher = mock.patch.object(task_store, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ttl_evicts_idle_terminal_tasks_only(self):
+        async def main():
+            store = InMemoryTaskStore(ttl=10.0)
+            await store.save(make_task("done"))
+            await store.save(make_task("active", TaskState.WORKING))
+            self.clock.now += 5
+            # Reading a terminal task counts as use
+            self.assertIsNotNone(await store.get("done"))
+            self.clock.now += 6
+            await store.save(make_task("other"))
+            self.assertIsNotNone(await store.get("done"))
+            self.clock.now += 11
+            await store.save(make_task("trigger"))
+            self.assertIsNone(await store.get("done"))
+            self.assertIsNone(await store.get("other"))
+            self.assertIsNotNone(await store.get("active"))
+            self.assertEqual(store.stats()["evicted_ttl"], 2)
+            self.assertEqual(store.stats()["evicted_size"], 0)
+
+        asyncio.run(main())
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        async def main():
+            store = InMemoryTaskStore(max_entries=3, max_bytes=None, ttl=None)
+            for task_id in "abc":
+                await store.save(make_task(task_id))
+                self.clock.now += 1
+            await store.get("a")
+            await store.save(make_task("d"))
+            self.assertIsNone(await store.get("b"))
+            self.assertEqual(sorted(store._tasks), ["a", "c", "d"])
+            self.assertEqual(store.stats()["evicted_size"], 1)
+
+        asyncio.run(main())
+
+    def test_active_tasks_are_never_evicted(self):
+        async def main():
+            store = InMemoryTaskStore(max_entries=1, max_bytes=None, ttl=None)
+            await store.save(make_task("a", TaskState.WORKING))
+            await store.save(make_task("b", TaskState.INPUT_REQUIRED))
+            self.assertEqual(len(store), 2)
+            # Finishing makes a task evictable
+            await store.save(make_task("a"))
+            self.assertEqual(sorted(store._tasks), ["b"])
+            self.assertEqual(store.stats()["evicted_size"], 1)
+
+        asyncio.run(main())
+
+    def test_byte_budget_and_size_accounting(self):
+        async def main():
+            small, large = make_task("small"), make_task("large", text="x" * 1000)
+            budget = estimate_task_size(small) + estimate_task_size(large)
+            store = InMemoryTaskStore(max_entries=None, max_bytes=budget, ttl=None)
+            await store.save(small)
+            await store.save(large)
+            self.assertEqual(store.stats()["bytes"], budget)
+            # Growing a task re-counts its size and pushes the store over budget
+            small.messages.append(Message(role="agent", parts=[TextPart(text="y" * 100)]))
+            await store.save(small)
+            self.assertIsNone(await store.get("large"))
+            self.assertEqual(store.stats()["bytes"], estimate_task_size(small))
+            await store.delete("small")
+            self.assertEqual(store.stats(), {
+                "entries": 0, "terminal_entries": 0, "bytes": 0, "evicted_ttl": 0, "evicted_size": 1,
+            })
+
+        asyncio.run(main())
+
+
+class SQLiteTaskStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.db")
+
+    def test_concurrent_saves_share_one_commit(self):
+        async def main():
+            store = SQLiteTaskStore(self.path, flush_interval=0.05)
+            await asyncio.gather(*(store.save(make_task(f"t{i}")) for i in range(100)))
+            self.assertEqual(store.batches_committed, 1)
+            self.assertEqual(store.rows_written, 100)
+            self.assertEqual(store.stats()["entries"], 100)
+            await store.close()
+
+        asyncio.run(main())
+
+    def test_full_batch_flushes_before_the_interval(self):
+        async def main():
+            store = SQLiteTaskStore(self.path, batch_size=10, flush_interval=60.0)
+            await asyncio.wait_for(asyncio.gather(*(store.save(make_task(f"t{i}")) for i in range(10))), 5)
+            self.assertEqual(store.batches_committed, 1)
+            await store.close()
+
+        asyncio.run(main())
+
+    def test_reads_see_pending_and_committing_saves(self):
+        async def main():
+            store = SQLiteTaskStore(self.path, flush_interval=0.01)
+            task = make_task("a", TaskState.WORKING)
+            save = asyncio.ensure_future(store.save(task))
+            await asyncio.sleep(0)
+            # Saved but not yet committed
+            self.assertEqual(store.stats()["pending"], 1)
+            self.assertIs(await store.get("a"), task)
+            # Hold the writer thread so the batch stays mid-commit
+            release = threading.Event()
+            store._writer.submit(release.wait)
+            await asyncio.sleep(0.05)
+            self.assertFalse(save.done())
+            self.assertEqual(store.stats()["pending"], 0)
+            self.assertIs(await store.get("a"), task)
+            release.set()
+            await save
+            self.assertIsNot(await store.get("a"), task)
+            self.assertEqual(await store.get("a"), task)
+            await store.close()
+
+        asyncio.run(main())
+
+    def test_later_save_in_a_batch_wins(self):
+        async def main():
+            store = SQLiteTaskStore(self.path)
+            await asyncio.gather(store.save(make_task("a", TaskState.WORKING)), store.save(make_task("a")))
+            await store.close()
+            store = SQLiteTaskStore(self.path)
+            self.assertEqual((await store.get("a")).state, TaskState.COMPLETED)
+            self.assertEqual(store.stats()["entries"], 1)
+            await store.close()
+
+        asyncio.run(main())
+
+    def test_tasks_survive_reopening(self):
+        async def main():
+            store = SQLiteTaskStore(self.path)
+            await store.save(make_task("a", text="persisted"))
+            await store.close()
+            store = SQLiteTaskStore(self.path)
+            self.assertEqual((await store.get("a")).messages[0].parts[0].text, "persisted")
+            self.assertIsNone(await store.get("missing"))
+            await store.close()
+
+        asyncio.run(main())
+
+    def test_delete_and_prune_update_the_entry_count(self):
+        clock = FakeTime()
+
+        async def main():
+            store = SQLiteTaskStore(self.path)
+            await store.save(make_task("old"))
+            await store.save(make_task("old-active", TaskState.WORKING))
+            clock.now += 100
+            await store.save(make_task("new"))
+            await store.save(make_task("gone"))
+            await store.delete("gone")
+            self.assertIsNone(await store.get("gone"))
+            self.assertEqual(store.stats()["entries"], 3)
+            self.assertEqual(await store.prune(50), 1)
+            self.assertIsNone(await store.get("old"))
+            self.assertIsNotNone(await store.get("old-active"))
+            self.assertEqual(store.stats()["entries"], 2)
+            await store.close()
+
+        with mock.patch.object(task_store, "time", clock):
+            asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import asyncio
+import unittest
+
+from agents.translator.agent import handle_batch, handle_task
+from common.types import Message, Task, TaskState, TextPart
+
+QUERIES = [
+    "translate en-es: hello",
+    "translate en-fr: Good night",
+    "translate en-es: hello",
+    "translate EN-ES: thank you",
+    "translate en-es: xyzzy",
+    "translate en-xx: hello",
+    "translate en-es-fr: hello",
+    "hello",
+]
+
+
+def make_task(index: int, query: str) -> Task:
+    return Task(id=str(index), state=TaskState.WORKING, messages=[Message(role="user", parts=[TextPart(text=query)])])
+
+
+class HandleBatchTest(unittest.TestCase):
+    def test_answers_like_handle_task(self):
+        async def main():
+            single = [await handle_task(make_task(i, query)) for i, query in enumerate(QUERIES)]
+            tasks = [make_task(i, query) for i, query in enumerate(QUERIES)]
+            tasks.append(Task(id="empty", state=TaskState.WORKING))
+            batch = await handle_batch(tasks)
+            self.assertEqual(batch[:-1], single)
+            self.assertEqual(batch[-1].state, TaskState.FAILED)
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,6 @@
 import asyncio
 import os
-import subprocess
 import signal
-import time
 import uvicorn
 import json
 import uuid
@@ -10,9 +8,12 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from common.client import A2AClient
+from common.supervisor import Supervisor
+from common.tracing import span
+from common.transport import close_http_client
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -20,8 +21,11 @@ app = FastAPI()
 # Initialize templates
 templates = Jinja2Templates(directory="templates")
 
-# Store running agent processes
-agent_processes = []
+# Directory of the per-agent log files
+LOG_DIR = os.environ.get("A2A_LOG_DIR", "logs")
+
+# Supervisor of the running agent processes
+supervisor: Optional[Supervisor] = None
 
 # Store WebSocket connections
 class ConnectionManager:
@@ -79,48 +83,41 @@ AGENTS = [
 ]
 
 # Function to start all agents
-def start_agents():
-    global agent_processes
+async def start_agents():
+    """Launch all agents in parallel and wait, without blocking the loop, until they are ready."""
+    global supervisor
     
     print("Starting A2A Demo agents...")
-    
-    for agent in AGENTS:
-        print(f"Starting {agent['name']} on port {agent['port']}...")
-        process = subprocess.Popen(
-            ["python3", "-m", agent["module"]],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        agent_processes.append(process)
-        # Give it a moment to start up
-        time.sleep(1)
-    
-    print("All agents started successfully!")
+    # Agent output goes to rotating files under logs/ rather than an unread pipe
+    supervisor = Supervisor(AGENTS, log_dir=LOG_DIR)
+    supervisor.start()
+    try:
+        await supervisor.wait_ready()
+        print("All agents ready:")
+    except (RuntimeError, TimeoutError) as e:
+        print(f"Agents failed to start: {e}")
+    print(supervisor.report())
 
 # Function to stop all agents
 def stop_agents():
-    global agent_processes
+    global supervisor
     
+    if supervisor is None:
+        return
     print("Stopping all agents...")
-    
-    for process in agent_processes:
-        process.terminate()
-    
-    # Wait for processes to terminate
-    for process in agent_processes:
-        process.wait()
-    
-    agent_processes = []
+    supervisor.stop()
+    supervisor = None
     print("All agents stopped.")
 
 # Start agents when the application starts
 @app.on_event("startup")
 async def startup_event():
-    start_agents()
+    await start_agents()
 
 # Stop agents when the application shuts down
 @app.on_event("shutdown")
 async def shutdown_event():
+    await close_http_client()
     stop_agents()
 
 # Serve HTML
@@ -140,52 +137,47 @@ async def websocket_endpoint(websocket: WebSocket):
             request_data = json.loads(data)
             message = request_data.get("message", "")
             
-            # Process the message through the coordinator agent
-            response = await process_message(message)
-            
-            # Send the response back to the client
-            await manager.send_personal_message(json.dumps({
-                "sender": "agent",
-                "message": response
-            }), websocket)
+            # Stream progress and the final answer from the coordinator agent
+            async for update in stream_message(message):
+                await manager.send_personal_message(json.dumps(update), websocket)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
-# Process message through coordinator agent
-async def process_message(message: str) -> str:
+# Stream a message through the coordinator agent
+async def stream_message(message: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield status updates as the coordinator reports them, then the final answer."""
     try:
-        # Create a client for the coordinator agent
         client = A2AClient(url=AGENTS[0]["url"])
         
-        # Generate a unique task ID
-        task_id = str(uuid.uuid4())
-        
-        # Create and send the task
-        response = await client.send_task({
-            "taskId": task_id,
-            "message": {
-                "role": "user",
-                "parts": [{"type": "text", "text": message}]
-            }
-        })
-        
-        # Extract and return the response
-        if response.result and "task" in response.result:
-            task = response.result["task"]
-            
-            # Find the agent's response message
-            agent_messages = [m for m in task.get("messages", []) if m.get("role") == "agent"]
-            if agent_messages:
-                last_message = agent_messages[-1]
-                for part in last_message.get("parts", []):
+        # The span roots the trace across all agent hops
+        with span("web.message", streaming=True):
+            async for response in client.send_task_subscribe({
+                "taskId": str(uuid.uuid4()),
+                "message": {
+                    "role": "user",
+                    "parts": [{"type": "text", "text": message}]
+                }
+            }):
+                if response.error:
+                    yield {"sender": "agent", "message": f"Error: {response.error.get('message')}"}
+                    return
+                
+                event = response.result or {}
+                text = ""
+                for part in (event.get("message") or {}).get("parts", []):
                     if part.get("type") == "text":
-                        return part["text"]
+                        text += part["text"]
+                
+                if event.get("final"):
+                    yield {"sender": "agent", "message": text or "No response received from agent."}
+                    return
+                yield {"sender": "status", "state": event.get("state"), "message": text}
         
-        return "No response received from agent."
+        yield {"sender": "agent", "message": "No response received from agent."}
     
     except Exception as e:
-        return f"Error: {str(e)}"
+        yield {"sender": "agent", "message": f"Error: {str(e)}"}
 
 # Create directories for templates and static files
 os.makedirs("templates", exist_ok=True)